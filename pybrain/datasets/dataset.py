@@ -2,13 +2,14 @@
 
 __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 
+import os
 import random
 import pickle
 from itertools import chain
-from scipy import zeros, resize, ravel, asarray
+from scipy import zeros, ravel, asarray, memmap
 import scipy
 
-from pybrain.utilities import Serializable
+from pybrain.utilities import Serializable, prefetch
 
 
 class OutOfSyncError(Exception): pass
@@ -22,6 +23,14 @@ class DataSet(Serializable):
     fields. A field is a NumPy array with a label (a string) attached to it.
     Fields can be linked together which means they must have the same length."""
 
+    # Attributes that are not stored in the header by .flush().
+    _unsavedAttributes = ('data', 'endmarker', 'link', '_convert', '_mode')
+
+    # The directory the fields are kept in, see .mapToDirectory(), and the
+    # mode it was opened with, see .loadFromDirectory().
+    _directory = None
+    _mode = 'r+'
+
     def __init__(self):
         self.data = {}
         self.endmarker = {}
@@ -169,7 +178,7 @@ class DataSet(Serializable):
             l = self.link[0]
             return self.endmarker[l]
 
-    def _resize(self, label=None):
+    def _resize(self, label=None, minimum=0):
         if label:
             label = [label]
         elif self.link:
@@ -178,14 +187,42 @@ class DataSet(Serializable):
             label = self.data
 
         for l in label:
-            self.data[l] = self._resizeArray(self.data[l])
+            self.data[l] = self._resizeArray(self.data[l], minimum,
+                                             self.endmarker[l])
 
-    def _resizeArray(self, a):
-        """Increase the buffer size. It should always be one longer than the
-        current sequence length and double on every growth step."""
+    def _resizeArray(self, a, minimum=0, used=None):
+        """Increase the buffer size to at least `minimum` rows. It should
+        always be one longer than the current sequence length and double on
+        every growth step. Only the first `used` rows are copied."""
         shape = list(a.shape)
-        shape[0] = (shape[0] + 1) * 2
-        return resize(a, shape)
+        shape[0] = max((shape[0] + 1) * 2, minimum)
+        # Memory maps opened with 'r' or 'c' are copied to memory instead,
+        # which leaves their files as they are.
+        if isinstance(a, memmap) and a.mode in ('r+', 'w+'):
+            # Grow the file instead, which does not copy anything.
+            a.flush()
+            with open(a.filename, 'r+b') as f:
+                f.truncate(int(scipy.prod(shape)) * a.dtype.itemsize)
+            return memmap(a.filename, dtype=a.dtype, mode='r+', shape=tuple(shape))
+        if used is None:
+            used = a.shape[0]
+        result = zeros(shape, a.dtype)
+        result[:used] = a[:used]
+        return result
+
+    def reserve(self, capacity, label=None):
+        """Make room for at least `capacity` rows in the field `label`, or in
+        the linked fields (or all fields, if none are linked) if no label is
+        given, so that appending up to that length does not reallocate."""
+        if label:
+            labels = [label]
+        elif self.link:
+            labels = self.link
+        else:
+            labels = self.data
+        for l in labels:
+            if self.data[l].shape[0] < capacity:
+                self._resize(l, capacity)
 
     def _appendUnlinked(self, label, row):
         """Append `row` to the field array with the given `label`.
@@ -215,6 +252,51 @@ class DataSet(Serializable):
         for i, l in enumerate(self.link):
             self._appendUnlinked(l, args[i])
 
+    def _extendUnlinked(self, label, rows):
+        """Append the rows of the array `rows` to the field array with the
+        given `label`.
+
+        Do not call this function from outside, use .extend() instead."""
+        rows = asarray(rows)
+        if rows.ndim < 2:
+            rows = rows.reshape(len(rows), -1)
+        end = self.endmarker[label] + rows.shape[0]
+        if self.data[label].shape[0] < end:
+            self._resize(label, end)
+        self.data[label][self.endmarker[label]:end] = rows
+        self.endmarker[label] = end
+
+    def extend(self, label, rows):
+        """Append all rows of the array `rows` to the field `label`.
+
+        Like .append(), this raises an `OutOfSyncError` if the field is
+        linked."""
+        if label in self.link:
+            raise OutOfSyncError
+        self._extendUnlinked(label, rows)
+
+    def extendLinked(self, *args):
+        """Add many rows to all linked fields at once: each argument is an
+        array with the rows of the corresponding linked field."""
+        assert len(args) == len(self.link)
+        args = [asarray(a) for a in args]
+        if len(set(len(a) for a in args)) > 1:
+            raise OutOfSyncError
+        for l, rows in zip(self.link, args):
+            self._extendUnlinked(l, rows)
+
+    def extendLinkedChunks(self, chunks, capacity=None):
+        """Add the rows of every element of the iterable `chunks` to the
+        linked fields. An element is a tuple with an array of rows for every
+        linked field, as for .extendLinked().
+
+        If the total number of rows is known in advance, it can be given as
+        `capacity` to allocate the fields only once."""
+        if capacity is not None:
+            self.reserve(capacity)
+        for chunk in chunks:
+            self.extendLinked(*chunk)
+
     def getLinked(self, index=None):
         """Access the dataset randomly or sequential.
 
@@ -292,6 +374,28 @@ class DataSet(Serializable):
             self.data[k] = zeros(shape)
             self.endmarker[k] = 0
 
+    def compact(self):
+        """Free the unused space at the end of the fields.
+
+        Where possible, the arrays are shrunk in place, which avoids a copy;
+        fields with other references to them (e.g. views returned by
+        .getField()) are copied instead."""
+        for field in self.getFieldNames():
+            a = self.data[field]
+            shape = (self.endmarker[field],) + a.shape[1:]
+            if a.shape == shape:
+                continue
+            if isinstance(a, memmap) and shape[0] > 0:
+                # Just map less of the file.
+                self.data[field] = memmap(a.filename, dtype=a.dtype,
+                                          mode=a.mode, shape=shape)
+                continue
+            del a
+            try:
+                self.data[field].resize(shape)
+            except ValueError:
+                self.data[field] = self.data[field][:shape[0]].copy()
+
     @classmethod
     def reconstruct(cls, filename):
         """Read an incomplete data set (option arraysonly) into the given one. """
@@ -304,12 +408,84 @@ class DataSet(Serializable):
     def save_pickle(self, flo, protocol=0, compact=False):
         """Save data set as pickle, removing empty space if desired."""
         if compact:
-            # remove padding of zeros for each field
-            for field in self.getFieldNames():
-                temp = self[field][0:self.endmarker[field] + 1, :]
-                self.setField(field, temp)
+            self.compact()
         Serializable.save_pickle(self, flo, protocol)
 
+    def mapToDirectory(self, directory):
+        """Keep the fields of the dataset in memory mapped files in the given
+        directory, which is created if necessary, so that it can grow beyond
+        the available memory. The dataset can be opened again with
+        .loadFromDirectory().
+
+        The files are brought up to date with every call to .flush()."""
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._directory = directory
+        self._mode = 'r+'
+        self.flush()
+
+    def flush(self):
+        """Write all changes of a dataset kept in a directory to disk.
+
+        Fields that are not kept in the directory yet (e.g. because they have
+        been replaced by .setField()) are moved there. Datasets that are not
+        kept in a directory, or that have been opened with the mode 'r' or
+        'c', are left as they are."""
+        directory = self._directory
+        if directory is None or self._mode not in ('r+', 'w+'):
+            return
+        fields = {}
+        for label, a in list(self.data.items()):
+            filename = os.path.abspath(os.path.join(directory, label + '.dat'))
+            if not isinstance(a, memmap) or a.filename != filename:
+                if a.size > 0:
+                    m = memmap(filename, dtype=a.dtype, mode='w+', shape=a.shape)
+                    m[:] = a
+                    self.data[label] = a = m
+                elif os.path.exists(filename):
+                    os.remove(filename)
+            if isinstance(a, memmap):
+                a.flush()
+            fields[label] = a.dtype.str, a.shape
+        attributes = dict((k, v) for k, v in self.__dict__.items()
+                          if k not in self._unsavedAttributes)
+        header = {
+            'class': self.__class__,
+            'fields': fields,
+            'endmarker': self.endmarker,
+            'link': self.link,
+            'attributes': attributes,
+        }
+        with open(os.path.join(directory, 'header.pickle'), 'wb') as f:
+            pickle.dump(header, f, 2)
+
+    @classmethod
+    def loadFromDirectory(cls, directory, mode='r+'):
+        """Open the dataset kept in `directory` by .mapToDirectory().
+
+        Only a small header is read; the data is loaded from the files when
+        it is accessed. With the `mode` 'r', the dataset is read-only, with
+        'c', changes are not written back to the files; for both, .flush()
+        does nothing."""
+        with open(os.path.join(directory, 'header.pickle'), 'rb') as f:
+            header = pickle.load(f)
+        obj = header['class'].__new__(header['class'])
+        obj.__dict__.update(header['attributes'])
+        obj.data = {}
+        for label, (dtype, shape) in header['fields'].items():
+            if scipy.prod(shape) > 0:
+                filename = os.path.join(directory, label + '.dat')
+                obj.data[label] = memmap(filename, dtype=dtype, mode=mode,
+                                         shape=tuple(shape))
+            else:
+                obj.data[label] = zeros(shape, dtype)
+        obj.endmarker = header['endmarker']
+        obj.link = header['link']
+        obj.vectorformat = obj.vectorformat
+        obj._directory = directory
+        obj._mode = mode
+        return obj
+
     def __reduce__(self):
         def creator():
             obj = self.__class__()
@@ -357,6 +533,48 @@ class DataSet(Serializable):
         for start, stop in indexes:
             yield self.data[label][start:stop]
 
+    def linkedBatches(self, n, permutation=None, shuffled=False, last='keep',
+                      prefetched=0):
+        """Yield batches of at most `n` rows of all linked fields. A single
+        batch is a list holding a contiguous array per linked field, in the
+        order of the link (e.g. input, target[, importance]).
+
+        The samples are taken in the order of `permutation`, a sequence of
+        sample indices, if given, or in random order if `shuffled` is set.
+
+        `last` tells what happens to a last batch with less than `n` rows: it
+        can be kept ('keep'), dropped ('drop') or filled up with samples from
+        the beginning ('pad').
+
+        If `prefetched` is positive, the batches are assembled in a background
+        thread that stays this many batches ahead, which is worth it for
+        datasets that are kept on disk."""
+        if last not in ('keep', 'drop', 'pad'):
+            raise ValueError("last must be one of 'keep', 'drop' or 'pad'.")
+        batches = self._linkedBatches(n, permutation, shuffled, last)
+        if prefetched > 0:
+            batches = prefetch(batches, prefetched)
+        return batches
+
+    def _linkedBatches(self, n, permutation, shuffled, last):
+        length = len(self)
+        fields = [self.data[l] for l in self.link]
+        if shuffled and permutation is None:
+            permutation = scipy.random.permutation(length)
+        if last == 'drop':
+            length -= length % n
+        for start in range(0, length, n):
+            stop = start + n
+            if permutation is not None:
+                chunk = asarray(permutation[start:stop])
+            else:
+                chunk = slice(start, min(stop, length))
+            if stop > length and last == 'pad':
+                chunk = scipy.arange(start, stop) % length
+                if permutation is not None:
+                    chunk = asarray(permutation)[chunk]
+            yield [scipy.ascontiguousarray(f[chunk]) for f in fields]
+
     def randomBatches(self, label, n):
         """Like .batches(), but the order is random."""
         permutation = random.shuffle(list(range(len(self))))
@@ -0,0 +1,171 @@
+from scipy import zeros, ones, arange, array, asarray, where, unique, minimum, random
+
+
+class SumTree(object):
+    """ A binary tree whose leaves hold nonnegative priorities, and whose inner
+    nodes hold the sums of their children, so that leaves can be drawn
+    proportionally to their priorities in O(log n).
+
+    The tree is stored in one array: node i has the children 2i and 2i+1, the
+    root is node 1, and the leaves come last (their number is the capacity,
+    rounded up to a power of two). """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._numLeaves = 1
+        while self._numLeaves < capacity:
+            self._numLeaves *= 2
+        self._tree = zeros(2 * self._numLeaves)
+
+    def total(self):
+        """ The sum of all priorities. """
+        return self._tree[1]
+
+    def __getitem__(self, indices):
+        return self._tree[self._numLeaves + asarray(indices)]
+
+    def update(self, indices, priorities):
+        """ Set the priorities of the leaves with the given indices, and the
+        sums above them, one level at a time. """
+        nodes = asarray(indices, dtype=int) + self._numLeaves
+        self._tree[nodes] = priorities
+        nodes = unique(nodes // 2)
+        while nodes[0] > 0:
+            self._tree[nodes] = self._tree[2 * nodes] + self._tree[2 * nodes + 1]
+            nodes = unique(nodes // 2)
+
+    def find(self, values):
+        """ For every value in [0, total), the index of the leaf at which the
+        cumulative sum of the priorities passes it. """
+        values = array(values, dtype=float)
+        nodes = ones(len(values), dtype=int)
+        while nodes[0] < self._numLeaves:
+            left = 2 * nodes
+            right = values >= self._tree[left]
+            values -= where(right, self._tree[left], 0.)
+            nodes = left + right
+        return minimum(nodes - self._numLeaves, self.capacity - 1)
+
+
+class ReplayMemory(object):
+    """ A memory of fixed capacity for the transitions (state, action, reward,
+    next state, next action, terminal) of a reinforcement learning agent. The
+    fields are preallocated arrays, used as a ring: once the memory is full,
+    each new transition replaces the oldest one.
+
+    It can take the place of the ReinforcementDataSet as the history of a
+    LoggingAgent, which then needs constant memory however long it runs:
+
+        agent = LearningAgent(table, Q(), history=ReplayMemory(1, 1, 10000))
+
+    The samples given to addSample() become transitions when the next one
+    arrives, or, as terminal transitions, when a new sequence is started.
+
+    With `prioritized`, the transitions can also be drawn proportionally to
+    their priorities to the power `alpha`, see samplePrioritized(). New
+    transitions get the largest priority seen so far. """
+
+    def __init__(self, statedim, actiondim, capacity, prioritized=False, alpha=0.6):
+        self.statedim = statedim
+        self.actiondim = actiondim
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+
+        self.state = zeros((capacity, statedim))
+        self.action = zeros((capacity, actiondim))
+        self.reward = zeros(capacity)
+        self.nextstate = zeros((capacity, statedim))
+        self.nextaction = zeros((capacity, actiondim))
+        self.terminal = zeros(capacity, dtype=bool)
+        self.clear()
+
+    def clear(self):
+        """ Forget all transitions. """
+        # the position of the next insertion
+        self._next = 0
+        self._length = 0
+        # the last sample given to addSample, waiting for its successor
+        self._pending = None
+        if self.prioritized:
+            self._tree = SumTree(self.capacity)
+            self._maxPriority = 1.
+
+    def __len__(self):
+        return self._length
+
+    def addTransition(self, state, action, reward, nextstate, nextaction, terminal=False):
+        """ Store a transition, in place of the oldest one if the memory is full. """
+        i = self._next
+        self.state[i] = state
+        self.action[i] = action
+        self.reward[i] = reward
+        self.nextstate[i] = nextstate
+        self.nextaction[i] = nextaction
+        self.terminal[i] = terminal
+        if self.prioritized:
+            self._tree.update([i], [self._maxPriority ** self.alpha])
+        self._next = (i + 1) % self.capacity
+        self._length = min(self._length + 1, self.capacity)
+
+    def addSample(self, state, action, reward):
+        """ As ReinforcementDataSet.addSample(): the previous sample of the
+        sequence becomes a transition to this one. """
+        if self._pending is not None:
+            self.addTransition(*(self._pending + (state, action, False)))
+        self._pending = (state, action, reward)
+
+    def newSequence(self):
+        """ The last sample ends its sequence: store it as a terminal transition. """
+        if self._pending is not None:
+            state, action, _ = self._pending
+            self.addTransition(*(self._pending + (state, action, True)))
+            self._pending = None
+
+    def extendLinked(self, states, actions, rewards):
+        for sample in zip(states, actions, rewards):
+            self.addSample(*sample)
+
+    def _transitions(self, indices):
+        return (self.state[indices], self.action[indices], self.reward[indices],
+                self.nextstate[indices], self.nextaction[indices], self.terminal[indices])
+
+    def transitions(self):
+        """ All stored transitions, as arrays of states, actions, rewards, next
+        states, next actions and terminal flags (oldest first). """
+        return self._transitions(self._chronological(self._length))
+
+    def recent(self, number):
+        """ The last `number` transitions (or fewer, if there are not as many),
+        newest first, as in transitions(). """
+        return self._transitions(self._chronological(min(number, self._length))[::-1])
+
+    def _chronological(self, number):
+        return (self._next - number + arange(number)) % self.capacity
+
+    def sample(self, number):
+        """ Draw `number` transitions uniformly (with replacement), and return
+        them as in transitions(). """
+        assert self._length > 0, 'The memory is empty.'
+        return self._transitions(random.randint(0, self._length, number))
+
+    def samplePrioritized(self, number, beta=0.4):
+        """ Draw `number` transitions proportionally to their priorities (one from
+        each of `number` equal parts of the total), and return them as in
+        transitions(), their indices (for updatePriorities) and their
+        importance-sampling weights with exponent `beta`, scaled so that the
+        largest one is 1. """
+        assert self.prioritized, 'The memory is not prioritized.'
+        assert self._length > 0, 'The memory is empty.'
+        total = self._tree.total()
+        values = (arange(number) + random.uniform(0, 1, number)) * total / number
+        indices = minimum(self._tree.find(values), self._length - 1)
+        weights = (self._length * self._tree[indices] / total) ** -beta
+        return self._transitions(indices), indices, weights / weights.max()
+
+    def updatePriorities(self, indices, priorities):
+        """ Set the priorities of the transitions with the given indices, e.g. to
+        the absolute values of their last TD errors. """
+        priorities = asarray(priorities, dtype=float)
+        self._maxPriority = max(self._maxPriority, priorities.max())
+        self._tree.update(indices, priorities ** self.alpha)
@@ -2,7 +2,7 @@ __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 # $Id$
 
 
-from scipy import ravel, r_
+from scipy import searchsorted, memmap
 from random import sample
 
 from pybrain.datasets.supervised import SupervisedDataSet
@@ -18,6 +18,10 @@ class SequentialDataSet(SupervisedDataSet):
     a normal sequence even though it does not have a following "new sequence"
     marker."""
 
+    # Cached start indices of the sequences, see ._sequenceStarts().
+    _sequenceCache = None
+    _unsavedAttributes = SupervisedDataSet._unsavedAttributes + ('_sequenceCache',)
+
     def __init__(self, indim, targetdim):
         SupervisedDataSet.__init__(self, indim, targetdim)
         # add field that stores the beginning of a new episode
@@ -32,21 +36,41 @@ class SequentialDataSet(SupervisedDataSet):
         exception will be raised."""
         length = self.getLength()
         if length != 0:
-            if ravel(self.getField('sequence_index'))[-1] == length:
+            if self._sequenceStarts()[-1] == length:
                 raise EmptySequenceError
             self._appendUnlinked('sequence_index', length)
 
+    def _sequenceStarts(self):
+        """Return the start indices of all sequences as an array of ints.
+
+        The array is cached until the sequence index changes."""
+        field = self.data['sequence_index']
+        n = self.endmarker['sequence_index']
+        cache = self._sequenceCache
+        if cache is None or cache[0] is not field or cache[1] != n:
+            cache = field, n, field[:n, 0].astype(int)
+            self._sequenceCache = cache
+        return cache[2]
+
+    def _sequenceBounds(self, index):
+        """Return the start and stop index of sequence `index`. The last
+        sequence is considered to go until the end of the dataset."""
+        starts = self._sequenceStarts()
+        if index < 0:
+            index += len(starts)
+        if not 0 <= index < len(starts):
+            # sequence index beyond number of sequences. raise exception
+            raise IndexError('sequence does not exist.')
+        if index == len(starts) - 1:
+            # user wants to access the last sequence, return until end of data
+            return starts[index], self.getLength()
+        return starts[index], starts[index + 1]
+
     def _getSequenceField(self, index, field):
         """Return a sequence of one single field given by `field` and indexed by
         `index`."""
-        seq = ravel(self.getField('sequence_index'))
-        if len(seq) == index + 1:
-            # user wants to access the last sequence, return until end of data
-            return self.getField(field)[int(seq[index]):]
-        if len(seq) < index + 1:
-            # sequence index beyond number of sequences. raise exception
-            raise IndexError('sequence does not exist.')
-        return self.getField(field)[seq[index]:seq[index + 1]]
+        start, stop = self._sequenceBounds(index)
+        return self.getField(field)[start:stop]
 
     def getSequence(self, index):
         """Returns the sequence given by `index`.
@@ -67,78 +91,66 @@ class SequentialDataSet(SupervisedDataSet):
         sequence `index`, False otherwise.
 
         Mostly used like .endOfData() with while loops."""
-        seq = ravel(self.getField('sequence_index'))
-        if len(seq) == index + 1:
+        starts = self._sequenceStarts()
+        if len(starts) == index + 1:
             # user wants to access the last sequence, return until end of data
             return self.endOfData()
-        if len(seq) < index + 1:
-            # sequence index beyond number of sequences. raise exception
-            raise IndexError('sequence does not exist.')
-        else:
-            return self.index >= seq[index + 1]
+        return self.index >= self._sequenceBounds(index)[1]
 
     def gotoSequence(self, index):
         """Move the internal marker to the beginning of sequence `index`."""
         try:
-            self.index = ravel(self.getField('sequence_index'))[index]
+            self.index = self._sequenceStarts()[index]
         except IndexError:
             raise IndexError('sequence does not exist')
 
     def getCurrentSequence(self):
         """Return the current sequence, according to the marker position."""
-        seq = ravel(self.getField('sequence_index'))
-        return len(seq) - sum(seq > self.index) - 1
+        return int(searchsorted(self._sequenceStarts(), self.index, 'right')) - 1
 
     def getNumSequences(self):
         """Return the number of sequences. The last (open) sequence is also
         counted in, even though there is no additional 'newSequence' marker."""
-        return self.getField('sequence_index').shape[0]
+        return self.endmarker['sequence_index']
 
     def getSequenceLength(self, index):
         """Return the length of the given sequence. If `index` is pointing
         to the last sequence, the sequence is considered to go until the end
         of the dataset."""
-        seq = ravel(self.getField('sequence_index'))
-        if len(seq) == index + 1:
-            # user wants to access the last sequence, return until end of data
-            return int(self.getLength() - seq[index])
-        if len(seq) < index + 1:
-            # sequence index beyond number of sequences. raise exception
-            raise IndexError('sequence does not exist.')
-        return int(seq[index + 1] - seq[index])
+        start, stop = self._sequenceBounds(index)
+        return int(stop - start)
 
     def removeSequence(self, index):
         """Remove the `index`'th sequence from the dataset and places the
-        marker to the sample following the removed sequence."""
+        marker to the sample following the removed sequence.
+
+        Removing the first sequence is cheap: the fields just start later in
+        their arrays, and the space is freed when they grow the next time."""
         if index >= self.getNumSequences():
             # sequence doesn't exist, raise exception
             raise IndexError('sequence does not exist.')
-        sequences = ravel(self.getField('sequence_index'))
-        seqstart = sequences[index]
-        if index == self.getNumSequences() - 1:
-            # last sequence is going to be removed
-            lastSeqDeleted = True
-            seqend = self.getLength()
-        else:
-            lastSeqDeleted = False
-            # sequence to remove is not last one (sequence_index exists)
-            seqend = sequences[index + 1]
+        seqstart, seqend = self._sequenceBounds(index)
+        lastSeqDeleted = index == self.getNumSequences() - 1
+        removed = seqend - seqstart
 
         # cut out data from all fields
         for label in self.link:
-            # concatenate rows from start to seqstart and from seqend to end
-            self.data[label] = r_[self.data[label][:seqstart, :], self.data[label][seqend:, :]]
+            field = self.data[label]
+            end = self.endmarker[label]
+            if seqstart == 0 and not isinstance(field, memmap):
+                self.data[label] = field[removed:]
+            else:
+                field[seqstart:end - removed] = field[seqend:end]
             # update endmarkers of linked fields
-            self.endmarker[label] -= seqend - seqstart
-
-        # update sequence indices
-        for i, val in enumerate(sequences):
-            if val > seqstart:
-                self.data['sequence_index'][i, :] -= seqend - seqstart
+            self.endmarker[label] -= removed
 
-        # remove sequence index of deleted sequence and reduce its endmarker
-        self.data['sequence_index'] = r_[self.data['sequence_index'][:index, :], self.data['sequence_index'][index + 1:, :]]
+        # remove sequence index of deleted sequence and update the others
+        indices = self.data['sequence_index']
+        n = self.endmarker['sequence_index']
+        indices[index:n - 1] = indices[index + 1:n]
+        indices[index:n - 1] -= removed
         self.endmarker['sequence_index'] -= 1
+        self._sequenceCache = None
 
         if lastSeqDeleted:
             # last sequence was removed
@@ -154,7 +166,7 @@ class SequentialDataSet(SupervisedDataSet):
             # move sequence marker to the new sequence at position 'index'
             self.currentSeq = index
             # move sample marker to beginning of sequence at position 'index'
-            self.index = ravel(self.getField('sequence_index'))[index]
+            self.index = self._sequenceStarts()[index]
 
 
     def clear(self):
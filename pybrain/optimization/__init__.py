@@ -4,4 +4,5 @@ from pybrain.optimization.neldermead import NelderMead
 from pybrain.optimization.populationbased.__init__ import *
 from pybrain.optimization.finitedifference.__init__ import *
 from pybrain.optimization.distributionbased.__init__ import *
-from pybrain.optimization.memetic.__init__ import *
\ No newline at end of file
+from pybrain.optimization.memetic.__init__ import *
+from pybrain.optimization.islands import IslandModel
\ No newline at end of file
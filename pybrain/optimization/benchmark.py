@@ -0,0 +1,212 @@
+""" Benchmarking optimization algorithms on the BBOB functions, e.g.
+
+    records = runBenchmark([CMAES, XNES], dimensions=[2, 10], seeds=range(5))
+    writeRecords(records, 'results.json')
+    print(summarize(records))
+
+Every run (one algorithm on one function, in one dimension, with one seed)
+gives a record with:
+
+  - the number of evaluations needed to reach each of the targets (None if
+    it was not reached),
+  - the CPU time spent inside the function, and the CPU time of the
+    algorithm itself per learning step, which is what catches regressions
+    in optimizer overhead,
+  - the peak memory of the process (in kB, if it can be measured), which
+    is per run when the runs are done in parallel.
+"""
+
+from __future__ import print_function
+
+import json
+import random
+import time
+from multiprocessing import Pool
+from numpy import random as nprandom, minimum
+from scipy import array, isinf
+
+from pybrain.utilities import avgFoundAfter
+from pybrain.rl.environments.functions.bbob2010 import bbob_collection
+
+try:
+    from time import process_time as cpuTime
+except ImportError:
+    from time import clock as cpuTime
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+#: The default targets, in terms of f - f_opt (f_opt is 0 for all BBOB functions).
+defaultTargets = [10. ** i for i in range(2, -9, -1)]
+
+
+class _Timer(object):
+    """ Sums up the CPU time spent in the functions it wraps. """
+
+    seconds = 0.
+
+    def wrap(self, function):
+        def timed(*args):
+            start = cpuTime()
+            try:
+                return function(*args)
+            finally:
+                self.seconds += cpuTime() - start
+        return timed
+
+
+def _name(x):
+    return getattr(x, '__name__', None) or x.__class__.__name__
+
+
+def _peakMemory():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def benchmarkRun(algorithm, function, dim, seed, budget=100, targets=defaultTargets,
+                 algorithmArgs={}):
+    """ Run the algorithm on the BBOB function (given by the function that
+    constructs it), with at most `budget` * dim evaluations, and return the
+    record of the run. """
+    record = {'algorithm': _name(algorithm), 'function': _name(function),
+              'dim': dim, 'seed': seed, 'targets': list(targets)}
+    random.seed(seed)
+    nprandom.seed(seed)
+    f = function(dim)
+    timer = _Timer()
+    f.f = timer.wrap(f.f)
+    f.f_batch = timer.wrap(f.f_batch)
+    x0 = nprandom.uniform(-4, 4, dim)
+    start, startCPU = time.time(), cpuTime()
+    try:
+        optimizer = algorithm(f, x0, maxEvaluations=budget * dim,
+                              storeAllEvaluations=True, **algorithmArgs)
+        optimizer.learn()
+    except Exception as e:
+        record['error'] = repr(e)
+        return record
+    optimizerTime = cpuTime() - startCPU - timer.seconds
+    # the best so far, after each evaluation
+    trace = minimum.accumulate(array(optimizer._allEvaluations, dtype=float))
+    found = avgFoundAfter(targets, [trace])
+    record.update({
+        'numEvaluations': optimizer.numEvaluations,
+        'numLearningSteps': optimizer.numLearningSteps,
+        'best': float(trace[-1]),
+        'evaluationsToTarget': [int(n) + 1 if trace[-1] <= t else None
+                                for n, t in zip(found, targets)],
+        'wallTime': time.time() - start,
+        'evaluatorTime': timer.seconds,
+        'optimizerTime': optimizerTime,
+        'optimizerTimePerStep': optimizerTime / max(1, optimizer.numLearningSteps),
+        'peakMemory': _peakMemory(),
+        })
+    return record
+
+
+def _benchmarkRun(args):
+    return benchmarkRun(*args[:4], **args[4])
+
+
+def runBenchmark(algorithms, functions=bbob_collection, dimensions=(2, 5, 10),
+                 seeds=range(3), processes=None, filename=None, verbose=False, **kwargs):
+    """ Run all algorithms (classes, or pairs of a class and a dictionary of
+    its arguments) on all functions, in all dimensions, with all seeds.
+    The runs are done in `processes` parallel processes (a fresh one for each
+    run), or, if processes is 1, here one after the other.
+    The other arguments are given to benchmarkRun().
+
+    Return the list of records, which are also written to `filename`, if given. """
+    runs = []
+    for algorithm in algorithms:
+        if isinstance(algorithm, tuple):
+            algorithm, algorithmArgs = algorithm
+        else:
+            algorithmArgs = {}
+        for function in functions:
+            for dim in dimensions:
+                for seed in seeds:
+                    runs.append((algorithm, function, dim, seed,
+                                 dict(kwargs, algorithmArgs=algorithmArgs)))
+    if processes == 1:
+        records = []
+        for run in runs:
+            records.append(_benchmarkRun(run))
+            if verbose:
+                print(_format(records[-1]))
+    else:
+        pool = Pool(processes, maxtasksperchild=1)
+        try:
+            records = []
+            for record in pool.imap(_benchmarkRun, runs, chunksize=1):
+                records.append(record)
+                if verbose:
+                    print(_format(record))
+        finally:
+            pool.close()
+            pool.join()
+    if filename is not None:
+        writeRecords(records, filename)
+    return records
+
+
+def writeRecords(records, filename):
+    """ Write the records to a file, as one JSON object per line. """
+    with open(filename, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def readRecords(filename):
+    with open(filename) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """ Aggregate the runs with different seeds: for each algorithm, function
+    and dimension, the expected running time to reach each target (the
+    evaluations of all runs divided by the number of runs that reached it,
+    or inf), and the mean CPU time of the algorithm per learning step. """
+    groups = {}
+    for record in records:
+        if 'error' in record:
+            continue
+        key = (record['algorithm'], record['function'], record['dim'])
+        groups.setdefault(key, []).append(record)
+    summary = []
+    for key in sorted(groups):
+        runs = groups[key]
+        ert = []
+        for i in range(len(runs[0]['targets'])):
+            successes = [r['evaluationsToTarget'][i] for r in runs
+                         if r['evaluationsToTarget'][i] is not None]
+            failures = [r['numEvaluations'] for r in runs
+                        if r['evaluationsToTarget'][i] is None]
+            if successes:
+                ert.append(float(sum(successes) + sum(failures)) / len(successes))
+            else:
+                ert.append(float('inf'))
+        summary.append({'algorithm': key[0], 'function': key[1], 'dim': key[2],
+                        'runs': len(runs), 'targets': runs[0]['targets'], 'ert': ert,
+                        'optimizerTimePerStep': sum(r['optimizerTimePerStep'] for r in runs) / len(runs)})
+    return summary
+
+
+def _format(record):
+    if 'error' in record:
+        return '%(algorithm)s on %(function)s, %(dim)dD, seed %(seed)d: %(error)s' % record
+    return ('%(algorithm)s on %(function)s, %(dim)dD, seed %(seed)d: best %(best).3g after '
+            '%(numEvaluations)d evaluations, %(optimizerTimePerStep).2gs per step' % record)
+
+
+if __name__ == '__main__':
+    from pybrain.optimization import CMAES, SNES
+    from pybrain.rl.environments.functions.bbob2010 import bbob_f1, bbob_f8, bbob_f10
+    records = runBenchmark([CMAES, SNES], [bbob_f1, bbob_f8, bbob_f10], dimensions=[5],
+                           seeds=range(2), verbose=True)
+    for s in summarize(records):
+        print(s['algorithm'], s['function'], s['dim'], ['%.0f' % e for e in s['ert'] if not isinf(e)])
@@ -1,4 +1,5 @@
-from .cmaes import CMAES
+from .cmaes import CMAES, SepCMAES
+from .lmmaes import LMMAES
 from .fem import FEM
 from .nes import ExactNES, OriginalNES
 from .ves import VanillaGradientEvolutionStrategies
@@ -2,9 +2,9 @@ from __future__ import print_function
 
 __author__ = 'Tom Schaul, tom@idsia.ch; Sun Yi, yi@idsia.ch'
 
-from numpy import floor, log, eye, zeros, array, sqrt, sum, dot, tile, outer, real
+from numpy import floor, log, eye, zeros, ones, array, sqrt, sum, dot, outer
 from numpy import exp, diag, power, ravel
-from numpy.linalg import eig, norm
+from numpy.linalg import eigh, norm
 from numpy.random import randn
 
 from pybrain.optimization.optimizer import ContinuousOptimizer
@@ -14,6 +14,12 @@ class CMAES(ContinuousOptimizer):
     """ CMA-ES: Evolution Strategy with Covariance Matrix Adaptation for
     nonlinear function minimization.
     This code is a close transcription of the provided matlab code.
+
+    In high dimensions, the O(n^3) eigendecomposition of the covariance matrix
+    dominates the running time. With `lazyDecomposition` set to some alpha
+    (typically between 0.1 and 10), it is only done every
+    alpha/covLearningRate/n generations, during which the covariance matrix
+    changes little.
     """
 
     mustMinimize = True
@@ -22,6 +28,9 @@ class CMAES(ContinuousOptimizer):
     storeAllCenters = False
     initStepSize = 0.5
 
+    #: Postpone the eigendecomposition (see above)? None means every generation.
+    lazyDecomposition = None
+
     def _additionalInit(self):
         self.center = self._initEvaluable
         self.stepSize = self.initStepSize  # coordinate wise standard deviation (sigma)
@@ -47,20 +56,35 @@ class CMAES(ContinuousOptimizer):
         # Initialize dynamic (internal) strategy parameters and constants
         self.covPath = zeros(self.numParameters)
         self.stepPath = zeros(self.numParameters)                   # evolution paths for C and stepSize
-        self.B = eye(self.numParameters, self.numParameters)         # B defines the coordinate system
-        self.D = eye(self.numParameters, self.numParameters)         # diagonal matrix D defines the scaling
-        self.C = dot(dot(self.B, self.D), dot(self.B, self.D).T)       # covariance matrix
+        self._initCovariance()
         self.chiN = self.numParameters ** 0.5 * (1 - 1. / (4. * self.numParameters) + 1 / (21. * self.numParameters ** 2))
         # expectation of ||numParameters(0,I)|| == norm(randn(numParameters,1))
 
+    def _initCovariance(self):
+        self.B = eye(self.numParameters, self.numParameters)         # B defines the coordinate system
+        self._d = ones(self.numParameters)          # the diagonal of D, which defines the scaling
+        self.C = eye(self.numParameters, self.numParameters)         # covariance matrix
+        self._eigenvalues = ones(self.numParameters)
+        self._BD = self.B
+        self._lastDecomposition = 0
+
+    @property
+    def D(self):
+        return diag(self._d)
+
+    def _transform(self, z):
+        """ Return B*D*z, for a vector or the columns of a matrix. """
+        return dot(self._BD, z)
+
+    def _rotate(self, z):
+        """ Return B*z. """
+        return dot(self.B, z)
+
     def _learnStep(self):
         # Generate and evaluate lambda offspring
         arz = randn(self.numParameters, self.batchSize)
-        arx = tile(self.center.reshape(self.numParameters, 1), (1, self.batchSize))\
-                        + self.stepSize * dot(dot(self.B, self.D), arz)
-        arfitness = zeros(self.batchSize)
-        for k in range(self.batchSize):
-            arfitness[k] = self._oneEvaluation(arx[:, k])
+        arx = self.center[:, None] + self.stepSize * self._transform(arz)
+        arfitness = array(self._batchEvaluation([arx[:, k].copy() for k in range(self.batchSize)]))
 
         # Sort by fitness and compute weighted mean into center
         arfitness, arindex = sorti(arfitness)  # minimization
@@ -68,7 +92,7 @@ class CMAES(ContinuousOptimizer):
         arx = arx[:, arindex]
         arzsel = arz[:, range(self.mu)]
         arxsel = arx[:, range(self.mu)]
-        arxmut = arxsel - tile(self.center.reshape(self.numParameters, 1), (1, self.mu))
+        arxmut = arxsel - self.center[:, None]
 
         zmean = dot(arzsel, self.weights)
         self.center = dot(arxsel, self.weights)
@@ -78,32 +102,18 @@ class CMAES(ContinuousOptimizer):
 
         # Cumulation: Update evolution paths
         self.stepPath = (1 - self.cumStep) * self.stepPath \
-                + sqrt(self.cumStep * (2 - self.cumStep) * self.muEff) * dot(self.B, zmean)         # Eq. (4)
+                + sqrt(self.cumStep * (2 - self.cumStep) * self.muEff) * self._rotate(zmean)         # Eq. (4)
         hsig = norm(self.stepPath) / sqrt(1 - (1 - self.cumStep) ** (2 * self.numEvaluations / float(self.batchSize))) / self.chiN \
                     < 1.4 + 2. / (self.numParameters + 1)
         self.covPath = (1 - self.cumCov) * self.covPath + hsig * \
-                sqrt(self.cumCov * (2 - self.cumCov) * self.muEff) * dot(dot(self.B, self.D), zmean) # Eq. (2)
+                sqrt(self.cumCov * (2 - self.cumCov) * self.muEff) * self._transform(zmean) # Eq. (2)
 
-        # Adapt covariance matrix C
-        self.C = ((1 - self.covLearningRate) * self.C                    # regard old matrix   % Eq. (3)
-             + self.covLearningRate * (1 / self.muCov) * (outer(self.covPath, self.covPath) # plus rank one update
-                                   + (1 - hsig) * self.cumCov * (2 - self.cumCov) * self.C)
-             + self.covLearningRate * (1 - 1 / self.muCov)                 # plus rank mu update
-             * dot(dot(arxmut, diag(self.weights)), arxmut.T)
-            )
+        self._adaptCovariance(hsig, arxmut)
 
         # Adapt step size self.stepSize
         self.stepSize *= exp((self.cumStep / self.dampings) * (norm(self.stepPath) / self.chiN - 1)) # Eq. (5)
 
-        # Update B and D from C
-        # This is O(n^3). When strategy internal CPU-time is critical, the
-        # next three lines should be executed only every (alpha/covLearningRate/N)-th
-        # iteration, where alpha is e.g. between 0.1 and 10
-        self.C = (self.C + self.C.T) / 2 # enforce symmetry
-        Ev, self.B = eig(self.C)          # eigen decomposition, B==normalized eigenvectors
-        Ev = real(Ev)       # enforce real value
-        self.D = diag(sqrt(Ev))      #diag(ravel(sqrt(Ev))) # D contains standard deviations now
-        self.B = real(self.B)
+        self._updateDecomposition()
 
         # convergence is reached
         if arfitness[0] == arfitness[-1] or (abs(arfitness[0] - arfitness[-1]) /
@@ -113,16 +123,70 @@ class CMAES(ContinuousOptimizer):
             self.maxLearningSteps = self.numLearningSteps
 
         # or diverged, unfortunately
-        if min(Ev) > 1e5:
+        if min(self._eigenvalues) > 1e5:
             if self.verbose:
                 print("Diverged.")
             self.maxLearningSteps = self.numLearningSteps
 
+    def _adaptCovariance(self, hsig, arxmut):
+        """ Adapt the covariance matrix C, given the selected mutations. """
+        # Eq. (3): regard old matrix, plus rank one update, plus rank mu update
+        self.C *= (1 - self.covLearningRate
+                   + self.covLearningRate * (1 / self.muCov) * (1 - hsig) * self.cumCov * (2 - self.cumCov))
+        self.C += self.covLearningRate * (1 / self.muCov) * outer(self.covPath, self.covPath)
+        self.C += self.covLearningRate * (1 - 1 / self.muCov) * dot(arxmut * self.weights, arxmut.T)
+
+    def _updateDecomposition(self):
+        """ Update B and D from C. """
+        # This is O(n^3), so it can be postponed as long as C changes little.
+        self._lastDecomposition += 1
+        if (self.lazyDecomposition is not None and self._lastDecomposition
+            < self.lazyDecomposition / self.covLearningRate / self.numParameters):
+            return
+        self._lastDecomposition = 0
+        # C is symmetric, and only its lower triangle is used
+        self._eigenvalues, self.B = eigh(self.C)   # B==normalized eigenvectors
+        self._d = sqrt(self._eigenvalues)          # D contains standard deviations now
+        self._BD = self.B * self._d
+
     @property
     def batchSize(self):
         return int(4 + floor(3 * log(self.numParameters)))
 
 
+class SepCMAES(CMAES):
+    """ Separable CMA-ES, which only adapts a diagonal covariance matrix: it
+    needs time and memory linear in the dimension, and learns the scaling
+    faster, but cannot handle correlations between the parameters.
+    [As described in Ros and Hansen (PPSN 2008)]
+    """
+
+    def _additionalInit(self):
+        CMAES._additionalInit(self)
+        self.covLearningRate = min(1, self.covLearningRate * (self.numParameters + 2) / 3.)
+
+    def _initCovariance(self):
+        self._d = ones(self.numParameters)
+        self.C = ones(self.numParameters)       # the diagonal of the covariance matrix
+        self._eigenvalues = self.C
+
+    def _transform(self, z):
+        return (self._d * z.T).T
+
+    def _rotate(self, z):
+        return z
+
+    def _adaptCovariance(self, hsig, arxmut):
+        self.C = ((1 - self.covLearningRate
+                   + self.covLearningRate * (1 / self.muCov) * (1 - hsig) * self.cumCov * (2 - self.cumCov)) * self.C
+                  + self.covLearningRate * (1 / self.muCov) * self.covPath ** 2
+                  + self.covLearningRate * (1 - 1 / self.muCov) * dot(arxmut ** 2, self.weights))
+
+    def _updateDecomposition(self):
+        self._eigenvalues = self.C
+        self._d = sqrt(self.C)
+
+
 def sorti(vect):
     """ sort, but also return the indices-changes """
     tmp = sorted([(x_y[1], x_y[0]) for x_y in enumerate(ravel(vect))])
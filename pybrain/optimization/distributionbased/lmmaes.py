@@ -0,0 +1,86 @@
+from __future__ import print_function
+
+from numpy import floor, log, zeros, array, sqrt, sum, dot, exp, outer
+from numpy.random import randn
+
+from pybrain.optimization.optimizer import ContinuousOptimizer
+from pybrain.optimization.distributionbased.cmaes import sorti
+
+
+class LMMAES(ContinuousOptimizer):
+    """ Limited-memory Matrix Adaptation Evolution Strategy: instead of a full
+    covariance matrix, it keeps `numDirections` search directions, which
+    makes time and memory linear in the dimension. Meant for problems with
+    thousands of parameters or more, e.g. the weights of a network.
+    [As described in Loshchilov, Glasmachers and Beyer (IEEE TEVC 2019)]
+    """
+
+    mustMinimize = True
+    stopPrecision = 1e-6
+
+    initStepSize = 0.5
+
+    #: Number of search directions (by default, as many as the batch size).
+    numDirections = None
+
+    def _additionalInit(self):
+        n = self.numParameters
+        self.center = self._initEvaluable
+        self.stepSize = self.initStepSize
+        if self.numDirections is None:
+            self.numDirections = self.batchSize
+
+        # selection
+        self.mu = self.batchSize // 2
+        self.weights = log(self.mu + 0.5) - log(array(range(1, self.mu + 1)))
+        self.weights /= sum(self.weights)
+        self.muEff = 1 / sum(self.weights ** 2)
+
+        # learning rates (capped, as they are designed for large n)
+        self.cumStep = min(1., 2. * self.batchSize / n)
+        self._directionRates = array([1 / (1.5 ** i * n) for i in range(self.numDirections)])
+        self._directionCums = array([min(1., self.batchSize / (4. ** i * n))
+                                     for i in range(self.numDirections)])
+
+        self.stepPath = zeros(n)
+        self.directions = zeros((self.numDirections, n))
+
+    def _transform(self, z):
+        """ Apply the transformations of the directions learned so far to the
+        columns of z. """
+        d = z
+        for i in range(min(self.numLearningSteps, self.numDirections)):
+            m = self.directions[i]
+            d = (1 - self._directionRates[i]) * d + self._directionRates[i] * outer(m, dot(m, d))
+        return d
+
+    def _learnStep(self):
+        n = self.numParameters
+        arz = randn(n, self.batchSize)
+        ard = self._transform(arz)
+        arx = self.center[:, None] + self.stepSize * ard
+        arfitness = array(self._batchEvaluation([arx[:, k].copy() for k in range(self.batchSize)]))
+
+        arfitness, arindex = sorti(arfitness)  # minimization
+        selected = arindex[:self.mu]
+        zmean = dot(arz[:, selected], self.weights)
+        dmean = dot(ard[:, selected], self.weights)
+
+        self.stepPath = ((1 - self.cumStep) * self.stepPath
+                         + sqrt(self.muEff * self.cumStep * (2 - self.cumStep)) * zmean)
+        cums = self._directionCums[:, None]
+        self.directions = ((1 - cums) * self.directions
+                           + sqrt(self.muEff * cums * (2 - cums)) * zmean)
+        self.center = self.center + self.stepSize * dmean
+        self.stepSize *= exp(self.cumStep / 2 * (dot(self.stepPath, self.stepPath) / n - 1))
+
+        # convergence is reached
+        if arfitness[0] == arfitness[-1] or (abs(arfitness[0] - arfitness[-1]) /
+                                             (abs(arfitness[0]) + abs(arfitness[-1]))) <= self.stopPrecision:
+            if self.verbose:
+                print("Converged.")
+            self.maxLearningSteps = self.numLearningSteps
+
+    @property
+    def batchSize(self):
+        return int(4 + floor(3 * log(self.numParameters)))
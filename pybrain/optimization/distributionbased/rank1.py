@@ -88,7 +88,7 @@ class Rank1NES(DistributionBasedOptimizer):
     def _produceSamples(self):
         """ Append batch size new samples and evaluate them. """
         tmp = [self._sample2base(self._produceSample()) for _ in range(self.batchSize)]
-        list(map(self._oneEvaluation, tmp))            
+        self._batchEvaluation(tmp)
         self._pointers = list(range(len(self._allEvaluated) - self.batchSize, len(self._allEvaluated)))                    
         
     def _notify(self):
@@ -113,7 +113,7 @@ class Rank1NES(DistributionBasedOptimizer):
         W = [s[:-1] + u * s[-1] for s in samples]   
         points = [self._center+exp(a) *w for w in W]
     
-        list(map(self._oneEvaluation, points))  
+        self._batchEvaluation(points)
                   
         self._pointers = list(range(len(self._allEvaluated) - self.batchSize, len(self._allEvaluated)))                            
         
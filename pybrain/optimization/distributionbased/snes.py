@@ -58,7 +58,7 @@ class SNES(DistributionBasedOptimizer):
     
     @property
     def _population(self):
-        if self._wasUnwrapped:
+        if self._wasUnwrapped and self.historyStore is None:
             return [self._allEvaluated[i].params for i in self._pointers]
         else:
             return [self._allEvaluated[i] for i in self._pointers]
@@ -84,11 +84,11 @@ class SNES(DistributionBasedOptimizer):
     def _produceSamples(self):
         """ Append batch size new samples and evaluate them. """
         if self.clearStorage:
-            self._allEvaluated = []
-            self._allEvaluations = []
+            self._allEvaluated = self._newHistory('evaluated')
+            self._allEvaluations = self._newHistory('evaluations')
             
         tmp = [self._sample2base(self._produceSample()) for _ in range(self.batchSize)]
-        list(map(self._oneEvaluation, tmp))            
+        self._batchEvaluation(tmp)
         self._pointers = list(range(len(self._allEvaluated) - self.batchSize, len(self._allEvaluated)))                    
             
     def _learnStep(self):
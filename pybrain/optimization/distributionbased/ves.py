@@ -71,13 +71,16 @@ class VanillaGradientEvolutionStrategies(DistributionBasedOptimizer):
         self.factorSigma = cholesky(self.sigma)
 
         # keeping track of history
-        self.allSamples = []
-        self.allFitnesses = []
+        self.allSamples = self._newHistory('samples')
+        self.allFitnesses = self._newHistory('fitnesses')
 
-        self.allGenerated = [0]
+        self.allGenerated = self._newHistory('generated')
+        self.allGenerated.append(0)
 
-        self.allCenters = [self.x.copy()]
-        self.allFactorSigmas = [self.factorSigma.copy()]
+        self.allCenters = self._newHistory('centers')
+        self.allCenters.append(self.x.copy())
+        self.allFactorSigmas = self._newHistory('factorSigmas')
+        self.allFactorSigmas.append(self.factorSigma.copy())
 
         # for baseline computation
         self.phiSquareWindow = zeros((self.batchSize, self.numDistrParams))
@@ -275,6 +278,6 @@ class VanillaGradientEvolutionStrategies(DistributionBasedOptimizer):
         """ When encountering a bad matrix, this is how we revert to a safe one. """
         self.factorSigma = eye(self.numParameters)
         self.x = self.bestEvaluable
-        self.allFactorSigmas[-1][:] = self.factorSigma
+        self.allFactorSigmas[-1] = self.factorSigma.copy()
         self.sigma = dot(self.factorSigma.T, self.factorSigma)
 
@@ -46,8 +46,9 @@ class XNES(DistributionBasedOptimizer):
         self._A = eye(self.numParameters) # square root of covariance matrix
         self._invA = eye(self.numParameters)
         self._logDetA = 0.
-        self._allPointers = []
-        self._allGenSteps = [0]
+        self._allPointers = self._newHistory('pointers')
+        self._allGenSteps = self._newHistory('genSteps')
+        self._allGenSteps.append(0)
         if self.storeAllDistributions:
             self._allDistributions = [(self._center.copy(), self._A.copy())]
 
@@ -70,6 +71,8 @@ class XNES(DistributionBasedOptimizer):
 
         self._lastLogDetA = self._logDetA
         self._lastInvA = self._invA
+        self._lastA = self._A
+        self._lastCenter = self._center.copy()
 
         self._center += self.centerLearningRate * dot(self._A, dCenter)
         self._A = dot(self._A, expm(dA))
@@ -78,13 +81,9 @@ class XNES(DistributionBasedOptimizer):
         if self.storeAllDistributions:
             self._allDistributions.append((self._center.copy(), self._A.copy()))
 
-    @property
-    def _lastA(self): return self._allDistributions[-2][1]
-    @property
-    def _lastCenter(self): return self._allDistributions[-2][0]
     @property
     def _population(self):
-        if self._wasUnwrapped:
+        if self._wasUnwrapped and self.historyStore is None:
             return [self._allEvaluated[i].params for i in self._pointers]
         else:
             return [self._allEvaluated[i] for i in self._pointers]
@@ -122,12 +121,12 @@ class XNES(DistributionBasedOptimizer):
         """ Append batch size new samples and evaluate them. """
         reuseindices = []
         if self.numLearningSteps == 0 or not self.importanceMixing:
-            [self._oneEvaluation(self._sample2base(self._produceSample())) for _ in range(self.batchSize)]
+            self._batchEvaluation([self._sample2base(self._produceSample()) for _ in range(self.batchSize)])
             self._pointers = list(range(len(self._allEvaluated)-self.batchSize, len(self._allEvaluated)))
         else:
-            reuseindices, newpoints = importanceMixing(list(map(self._base2sample, self._currentEvaluations)),
+            reuseindices, newpoints = importanceMixing(list(map(self._base2sample, self._population)),
                                                        self._oldpdf, self._newpdf, self._produceSample, self.forcedRefresh)
-            [self._oneEvaluation(self._sample2base(s)) for s in newpoints]
+            self._batchEvaluation([self._sample2base(s) for s in newpoints])
             self._pointers = ([self._pointers[i] for i in reuseindices]+
                               list(range(len(self._allEvaluated)-self.batchSize+len(reuseindices), len(self._allEvaluated))))
         self._allGenSteps.append(self._allGenSteps[-1]+self.batchSize-len(reuseindices))
@@ -0,0 +1,314 @@
+""" Backends that evaluate whole batches of candidate solutions, possibly in
+parallel. An optimizer uses one if it is given as its `evaluationBackend`, e.g.
+
+    CMAES(task, evaluationBackend=ProcessEvaluation())
+
+All backends return the results in the order of the candidates, and the
+optimizer does all the bookkeeping as if they had been evaluated one by one.
+
+Candidates can also be evaluated asynchronously, with .submit() and .next(),
+which is what steady-state evolution does.
+"""
+
+import os
+import threading
+from multiprocessing import Process, Pool, cpu_count
+from multiprocessing.pool import ThreadPool
+from multiprocessing.connection import Listener, Client
+try:
+    from queue import Queue, Empty
+except ImportError:
+    from Queue import Queue, Empty
+
+from pybrain.utilities import abstractMethod
+
+
+def _tryCall(function, candidate):
+    """ Return whether the call succeeded, and its result or exception. """
+    try:
+        return True, function(candidate)
+    except Exception as e:
+        return False, e
+
+
+class EvaluationBackend(object):
+    """ Evaluates candidates one after the other. """
+
+    processes = 1
+
+    _submitted = None
+
+    def map(self, function, candidates):
+        """ Return the list of the values of `function` on all `candidates`. """
+        return [function(c) for c in candidates]
+
+    def submit(self, function, candidate, tag):
+        """ Start evaluating `function` on the `candidate`, in the background. 
+        Its result is returned by .next(), together with the `tag`. 
+        Here, the evaluation only happens when .next() is called. """
+        if self._submitted is None:
+            self._submitted = []
+        self._submitted.append((tag, function, candidate))
+
+    def next(self, timeout=None):
+        """ Wait at most `timeout` seconds for one of the submitted evaluations 
+        to finish. Return its tag, whether it succeeded and its result (or the 
+        exception raised), or None if none finished in time. """
+        if not self._submitted:
+            return None
+        tag, function, candidate = self._submitted.pop(0)
+        return (tag,) + _tryCall(function, candidate)
+
+    def close(self):
+        """ Free all resources (processes, threads, connections). """
+        self._submitted = None
+
+
+class _AsynchronousEvaluation(EvaluationBackend):
+    """ Evaluates the submitted candidates in a pool, and collects their results 
+    in a queue as they finish. """
+
+    _finished = None
+
+    def submit(self, function, candidate, tag):
+        if self._finished is None:
+            self._finished = Queue()
+        finished = self._finished
+        self._applyAsync(function, candidate, lambda result: finished.put((tag,) + result))
+
+    def next(self, timeout=None):
+        if self._finished is None:
+            return None
+        try:
+            return self._finished.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def _applyAsync(self, function, candidate, callback):
+        """ Start the evaluation, and call the callback with the result of _tryCall. """
+        abstractMethod()
+
+    def close(self):
+        self._finished = None
+
+
+SerialEvaluation = EvaluationBackend
+
+
+class ThreadEvaluation(_AsynchronousEvaluation):
+    """ Evaluates candidates in a pool of threads, which is useful if the
+    fitness function releases the GIL (e.g. calls numpy or external code). """
+
+    def __init__(self, processes=None):
+        self.processes = processes or cpu_count()
+        self._pool = None
+
+    def map(self, function, candidates):
+        if self._pool is None:
+            self._pool = ThreadPool(self.processes)
+        return self._pool.map(function, candidates, chunksize=1)
+
+    def _applyAsync(self, function, candidate, callback):
+        if self._pool is None:
+            self._pool = ThreadPool(self.processes)
+        self._pool.apply_async(_tryCall, (function, candidate), callback=callback)
+
+    def close(self):
+        _AsynchronousEvaluation.close(self)
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+# The function evaluated by the processes of a ProcessEvaluation.
+_function = None
+
+
+def _setFunction(function):
+    global _function
+    _function = function
+
+
+def _callFunction(candidate):
+    return _function(candidate)
+
+
+def _tryCallFunction(candidate):
+    return _tryCall(_function, candidate)
+
+
+class ProcessEvaluation(_AsynchronousEvaluation):
+    """ Evaluates candidates in a pool of processes. The fitness function is
+    handed to the processes only once, when they are started, so only the
+    candidates and the results have to be pickled. """
+
+    def __init__(self, processes=None):
+        self.processes = processes or cpu_count()
+        self._pool = None
+        self._function = None
+
+    def _startPool(self, function):
+        if function is not self._function:
+            self.close()
+        if self._pool is None:
+            self._pool = Pool(self.processes, _setFunction, (function,))
+            self._function = function
+
+    def map(self, function, candidates):
+        self._startPool(function)
+        return self._pool.map(_callFunction, candidates, chunksize=1)
+
+    def _applyAsync(self, function, candidate, callback):
+        self._startPool(function)
+        self._pool.apply_async(_tryCallFunction, (candidate,), callback=callback)
+
+    def close(self):
+        _AsynchronousEvaluation.close(self)
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._function = None
+
+
+def evaluationWorker(address, authkey, function=None):
+    """ Connect to the SocketEvaluation listening on `address` and evaluate
+    the candidates it sends, until it sends None. If `function` is not given,
+    the fitness function is received from the master. """
+    conn = Client(address, authkey=authkey)
+    conn.send(function is None)
+    if function is None:
+        function = conn.recv()
+    while True:
+        try:
+            candidate = conn.recv()
+        except EOFError:
+            break
+        if candidate is None:
+            break
+        try:
+            conn.send((True, function(candidate)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class SocketEvaluation(_AsynchronousEvaluation):
+    """ Evaluates candidates in worker processes that are connected to the
+    master by sockets.
+
+    By default, the `processes` workers are started locally. Otherwise, the
+    backend waits for that many workers to connect to `address`, which call
+    evaluationWorker() with the same address and `authkey` -- possibly on
+    other machines, in which case the fitness function has to be picklable.
+
+    Master and workers unpickle what they receive, so anyone who can connect
+    with the authkey can run code on them: the authkey must stay secret, and
+    the address should only be reachable from trusted machines. Without an
+    authkey, a random one is made for the locally started workers; for
+    workers started elsewhere, it has to be given.
+    """
+
+    def __init__(self, processes=None, address=('localhost', 0),
+                 authkey=None, startWorkers=True):
+        if authkey is None:
+            if not startWorkers:
+                raise ValueError('The authkey has to be given, for workers started elsewhere.')
+            authkey = os.urandom(32)
+        self.processes = processes or cpu_count()
+        self.address = address
+        self.authkey = authkey
+        self.startWorkers = startWorkers
+        self._connections = None
+        self._function = None
+
+    def _connect(self, function):
+        listener = Listener(self.address, authkey=self.authkey)
+        self._workers = []
+        if self.startWorkers:
+            for _ in range(self.processes):
+                worker = Process(target=evaluationWorker,
+                                 args=(listener.address, self.authkey, function))
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+        self._connections = []
+        self._idle = Queue()
+        for _ in range(self.processes):
+            conn = listener.accept()
+            if conn.recv():
+                conn.send(function)
+            self._connections.append(conn)
+            self._idle.put(conn)
+        listener.close()
+        self._pool = ThreadPool(self.processes)
+        self._function = function
+
+    def _remoteCall(self, candidate):
+        conn = self._idle.get()
+        try:
+            conn.send(candidate)
+            success, result = conn.recv()
+        finally:
+            self._idle.put(conn)
+        if not success:
+            raise result
+        return result
+
+    def _ensureConnected(self, function):
+        if function is not self._function:
+            self.close()
+        if self._connections is None:
+            self._connect(function)
+
+    def map(self, function, candidates):
+        self._ensureConnected(function)
+        return self._pool.map(self._remoteCall, candidates, chunksize=1)
+
+    def _applyAsync(self, function, candidate, callback):
+        self._ensureConnected(function)
+        self._pool.apply_async(_tryCall, (self._remoteCall, candidate), callback=callback)
+
+    def close(self):
+        _AsynchronousEvaluation.close(self)
+        if self._connections is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        for conn in self._connections:
+            # Other processes forked in the meantime may hold copies of the
+            # connection, so the workers would not notice it being closed.
+            conn.send(None)
+            conn.close()
+        for worker in self._workers:
+            worker.join()
+        self._connections = None
+        self._function = None
+
+
+class _Evaluation(object):
+    """ The fitness function as seen by an evaluation backend: it takes the
+    parameters of a candidate and, if necessary, wraps them into a copy of
+    the `wrapping` evaluable (one per thread) before evaluating. """
+
+    def __init__(self, evaluator, wrapping=None):
+        self.evaluator = evaluator
+        self.wrapping = wrapping
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {'evaluator': self.evaluator, 'wrapping': self.wrapping}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def __call__(self, x):
+        if self.wrapping is None:
+            return self.evaluator(x)
+        wrapping = getattr(self._local, 'wrapping', None)
+        if wrapping is None:
+            wrapping = self._local.wrapping = self.wrapping.copy()
+        wrapping._setParameters(x)
+        return self.evaluator(wrapping)
@@ -48,10 +48,8 @@ class FiniteDifferences(ContinuousOptimizer):
 
         # calculate the gradient with pseudo inverse
         for i in range(self.batchSize):
-            deltas = self.perturbation()
-            x = self.current + deltas
-            D[i, :] = deltas
-            R[i, :] = self._oneEvaluation(x)
+            D[i, :] = self.perturbation()
+        R[:, 0] = self._batchEvaluation([self.current + deltas for deltas in D])
         beta = dot(pinv(D), R)
         gradient = ravel(beta)
 
@@ -0,0 +1,185 @@
+""" Stores for the evaluation history of an optimizer (the evaluated points
+and their fitnesses), which by default is kept in lists that grow forever.
+To bound the memory of long runs, give a store as `historyStore`, e.g.
+
+    XNES(task, historyStore=ArrayHistory(10000))
+
+The store given is a template: the optimizer creates one empty store for each
+of its histories with .new().
+
+All stores behave like the lists they replace, in particular an entry keeps
+its index: the i'th evaluation is always at index i, even when the older ones
+have been dropped (accessing those raises an IndexError). Iterating and
+slicing only give the entries that are still there. So the capacity has to
+cover what the optimizer looks back at, which is a few batches.
+"""
+
+import os
+import tempfile
+
+from scipy import asarray, zeros, memmap, prod
+
+
+class RingHistory(object):
+    """ Keeps only the last `capacity` entries, which can be any objects. """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._entries = []
+        self._count = 0
+
+    def new(self, name):
+        """ Return an empty store with the same settings, for the history
+        called `name`. """
+        return self.__class__(self.capacity)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def first(self):
+        """ The index of the oldest entry still in the store. """
+        return max(0, self._count - self.capacity)
+
+    def _position(self, index):
+        if index < 0:
+            index += self._count
+        if not self.first <= index < self._count:
+            raise IndexError('history entry %d is not stored.' % index)
+        return index % self.capacity
+
+    def _indices(self, index):
+        start, stop, step = index.indices(self._count)
+        return [i for i in range(start, stop, step) if i >= self.first]
+
+    def append(self, entry):
+        if len(self._entries) < self.capacity:
+            self._entries.append(entry)
+        else:
+            self._entries[self._count % self.capacity] = entry
+        self._count += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entries[i % self.capacity] for i in self._indices(index)]
+        return self._entries[self._position(index)]
+
+    def __setitem__(self, index, entry):
+        self._entries[self._position(index)] = entry
+
+    def __iter__(self):
+        for i in range(self.first, self._count):
+            yield self._entries[i % self.capacity]
+
+
+class ArrayHistory(RingHistory):
+    """ Keeps the last `capacity` entries, which have to be numbers or arrays
+    of the same shape, in a single preallocated array. """
+
+    def __init__(self, capacity):
+        RingHistory.__init__(self, capacity)
+        self._entries = None
+
+    def _allocate(self, entry):
+        return zeros((self.capacity,) + entry.shape, entry.dtype)
+
+    def append(self, entry):
+        entry = asarray(entry)
+        if self._entries is None:
+            self._entries = self._allocate(entry)
+        self._entries[self._count % self.capacity] = entry
+        self._count += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if self._entries is None:
+                return []
+            return self._entries[[i % self.capacity for i in self._indices(index)]]
+        entry = self._entries[self._position(index)]
+        if entry.ndim == 0:
+            return entry[()]
+        return entry.copy()
+
+    def __iter__(self):
+        for i in range(self.first, self._count):
+            yield self[i]
+
+
+class MemmapHistory(ArrayHistory):
+    """ Keeps all entries, which have to be numbers or arrays of the same
+    shape, in a memory mapped file in `directory`, which grows by `capacity`
+    entries at a time.
+
+    Every store creates a new file of its own, named after the history with a
+    unique suffix (e.g. fitnesses-k3x9q1.dat), when the first entry arrives.
+    So several optimizers can be given the same store and directory, and
+    existing files are never overwritten; the files are not deleted either. """
+
+    def __init__(self, directory, capacity=1024, name='history'):
+        ArrayHistory.__init__(self, capacity)
+        self.directory = directory
+        self.name = name
+        self.filename = None
+
+    def new(self, name):
+        return self.__class__(self.directory, self.capacity, name)
+
+    @property
+    def first(self):
+        return 0
+
+    def _allocate(self, entry):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        handle, self.filename = tempfile.mkstemp(suffix='.dat', prefix=self.name + '-',
+                                                 dir=self.directory)
+        os.close(handle)
+        return memmap(self.filename, dtype=entry.dtype, mode='w+',
+                      shape=(self.capacity,) + entry.shape)
+
+    def _position(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('history entry %d is not stored.' % index)
+        return index
+
+    def append(self, entry):
+        entry = asarray(entry)
+        if self._entries is None:
+            self._entries = self._allocate(entry)
+        elif self._count == len(self._entries):
+            # Grow the file, which does not copy anything.
+            self.flush()
+            shape = (len(self._entries) + self.capacity,) + self._entries.shape[1:]
+            with open(self.filename, 'r+b') as f:
+                f.truncate(int(prod(shape)) * self._entries.dtype.itemsize)
+            self._entries = memmap(self.filename, dtype=self._entries.dtype,
+                                   mode='r+', shape=shape)
+        self._entries[self._count] = entry
+        self._count += 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if self._entries is None:
+                return []
+            return asarray(self._entries[:self._count][index])
+        return ArrayHistory.__getitem__(self, index)
+
+    def flush(self):
+        """ Write all entries to the file. """
+        if self._entries is not None:
+            self._entries.flush()
+
+    def __getstate__(self):
+        self.flush()
+        state = self.__dict__.copy()
+        if self._entries is not None:
+            state['_entries'] = self._entries.dtype.str, self._entries.shape
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._entries is not None:
+            dtype, shape = self._entries
+            self._entries = memmap(self.filename, dtype=dtype, mode='r+', shape=shape)
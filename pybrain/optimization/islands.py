@@ -0,0 +1,143 @@
+""" The island model: several instances of an optimizer search independently,
+each in its own process, and regularly send their best individuals to their
+neighbors. E.g.
+
+    IslandModel(task, algorithm=GA, numIslands=8, migrationInterval=5)
+"""
+
+import random
+import traceback
+from copy import deepcopy
+from multiprocessing import Process, Pipe
+from numpy import random as nprandom
+
+from pybrain.optimization.optimizer import BlackBoxOptimizer
+from pybrain.optimization.populationbased.pso import ring
+
+
+def _migrate(optimizer, steps, immigrants, numMigrants):
+    """ One epoch on an island: take in the immigrants, learn, and return the
+    emigrants, the best found and the number of evaluations. """
+    optimizer._immigrate(immigrants)
+    optimizer.learn(steps)
+    return (optimizer._emigrants(numMigrants), optimizer._bestFound(),
+            optimizer.numEvaluations)
+
+
+def _runIsland(conn, optimizer, seed):
+    """ Run the epochs the master asks for, until it sends None. Errors are
+    sent back to the master (with their traceback), instead of the results. """
+    random.seed(seed)
+    nprandom.seed(seed)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        try:
+            conn.send((True, _migrate(optimizer, *message)))
+        except Exception:
+            conn.send((False, traceback.format_exc()))
+    conn.close()
+
+
+class IslandModel(BlackBoxOptimizer):
+    """ Island model: runs `numIslands` instances of `algorithm` (any
+    BlackBoxOptimizer subclass, created with the arguments in `islandArgs`)
+    in separate processes. Every `migrationInterval` learning steps, each
+    island sends its `numMigrants` best individuals to its neighbors in the
+    `topology`, a function that maps the list of islands to their neighbors
+    (like pso.ring or pso.fullyConnected).
+
+    One learning step of the island model is migrationInterval learning steps
+    of all islands, and the best found so far is gathered from all of them.
+    Candidates and migrants are sent through pipes, so they have to be
+    picklable. """
+
+    algorithm = None
+    islandArgs = {}
+
+    numIslands = 4
+    topology = staticmethod(ring)
+    migrationInterval = 10
+    numMigrants = 1
+
+    #: Run the islands in processes? Otherwise, they take turns in this one.
+    useProcesses = True
+
+    _connections = None
+
+    def _setInitEvaluable(self, evaluable):
+        # the islands take care of the evaluable
+        self._initEvaluable = evaluable
+
+    def _additionalInit(self):
+        assert self.algorithm is not None, 'The algorithm of the islands has to be given.'
+        self.close()
+        args = dict(self.islandArgs, minimize=self.minimize)
+        self.islands = [self.algorithm(self.evaluator, deepcopy(self._initEvaluable), **args)
+                        for _ in range(self.numIslands)]
+        self._immigrants = [[] for _ in self.islands]
+        self._islandEvaluations = [island.numEvaluations for island in self.islands]
+        self.numEvaluations = sum(self._islandEvaluations)
+        if self.useProcesses:
+            self._connections = []
+            self._processes = []
+            for island in self.islands:
+                conn, islandConn = Pipe()
+                process = Process(target=_runIsland,
+                                  args=(islandConn, island, nprandom.randint(2 ** 31)))
+                process.daemon = True
+                process.start()
+                self._connections.append(conn)
+                self._processes.append(process)
+
+    def _learnStep(self):
+        messages = [(self.migrationInterval, immigrants, self.numMigrants)
+                    for immigrants in self._immigrants]
+        if self._connections is None:
+            results = [_migrate(island, *m) for island, m in zip(self.islands, messages)]
+        else:
+            for conn, message in zip(self._connections, messages):
+                conn.send(message)
+            results = []
+            failures = []
+            for i, conn in enumerate(self._connections):
+                success, result = conn.recv()
+                if success:
+                    results.append(result)
+                else:
+                    failures.append('Island %d failed:\n%s' % (i, result))
+            if failures:
+                raise RuntimeError('\n'.join(failures))
+
+        emigrants = [r[0] for r in results]
+        neighbors = self.topology(list(range(len(self.islands))))
+        self._immigrants = [sum((emigrants[j] for j in neighbors[i] if j != i), [])
+                            for i in range(len(self.islands))]
+
+        for i, (_, (evaluable, fitness), numEvaluations) in enumerate(results):
+            self._islandEvaluations[i] = numEvaluations
+            if self._isBetter(fitness, self.bestEvaluation):
+                self.bestEvaluable, self.bestEvaluation = evaluable, fitness
+        self.numEvaluations = sum(self._islandEvaluations)
+
+    def _bestFound(self):
+        return self.bestEvaluable, self.bestEvaluation
+
+    def close(self):
+        """ Stop the processes of the islands (also those that died already). """
+        if self._connections is None:
+            return
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except (IOError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._connections = None
+
+    @property
+    def batchSize(self):
+        return self.numIslands * self.migrationInterval * self.islands[0].batchSize
@@ -3,9 +3,22 @@ from __future__ import print_function
 __author__ = 'Tom Schaul, tom@idsia.ch'
 
 from scipy import array, randn, ndarray, isinf, isnan, isscalar
+from numpy import random as nprandom, asarray, ascontiguousarray
+from collections import OrderedDict
+from io import BytesIO
+from time import time
 import logging
+import os
+import pickle
+import random
+try:
+    from os import replace as _replaceFile
+except ImportError:
+    # Python 2: rename replaces atomically on POSIX
+    from os import rename as _replaceFile
 
-from pybrain.utilities import setAllArgs, abstractMethod, DivergenceError
+from pybrain.utilities import setAllArgs, abstractMethod, DivergenceError, xhash
+from pybrain.optimization.evaluation import _Evaluation, EvaluationBackend
 from pybrain.rl.learners.directsearch.directsearch import DirectSearchLearner
 from pybrain.structure.parametercontainer import ParameterContainer
 from pybrain.rl.environments.functions.function import FunctionEnvironment
@@ -55,6 +68,10 @@ class BlackBoxOptimizer(DirectSearchLearner):
     storeAllEvaluations = False
     #: Store all evaluated instances (in the ._allEvaluated list)?
     storeAllEvaluated = False
+    #: Keep those in a bounded store instead of lists that grow forever (see 
+    #: pybrain.optimization.history). Evaluated modules are then stored as 
+    #: arrays of their parameters.
+    historyStore = None
     
     # an optimizer can take different forms of evaluables, and depending on its
     # needs, wrap them into a ParameterContainer (which is also an Evolvable)
@@ -71,6 +88,28 @@ class BlackBoxOptimizer(DirectSearchLearner):
     # some algorithms have a predetermined (minimal) number of 
     # evaluations they will perform during each learningStep:
     batchSize = 1
+
+    #: Backend for evaluating batches of candidates, e.g. in parallel 
+    #: (see pybrain.optimization.evaluation). By default, they are evaluated one by one.
+    evaluationBackend = None
+    _evaluation = None
+
+    #: Asynchronous evaluations (of steady-state algorithms) that take longer 
+    #: than this many seconds are counted as failed, and their results ignored.
+    evaluationTimeout = None
+    _pending = None
+    _serialBackend = None
+
+    #: Save the state of the run to this file every checkpointInterval learning 
+    #: steps (see .saveCheckpoint()).
+    checkpointFile = None
+    checkpointInterval = 1
+
+    #: Remember the fitness of that many candidates (the least recently used 
+    #: are forgotten), so that evaluating identical ones again costs nothing. 
+    #: Only for deterministic evaluators; None disables the cache.
+    fitnessCacheSize = None
+    _fitnessCache = None
     
     
     def __init__(self, evaluator = None, initEvaluable = None, **kwargs):
@@ -83,11 +122,14 @@ class BlackBoxOptimizer(DirectSearchLearner):
         # bookkeeping
         self.numEvaluations = 0      
         self.numLearningSteps = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.numFailedEvaluations = 0
         if self.storeAllEvaluated:
-            self._allEvaluated = []
-            self._allEvaluations = []
+            self._allEvaluated = self._newHistory('evaluated')
+            self._allEvaluations = self._newHistory('evaluations')
         elif self.storeAllEvaluations:
-            self._allEvaluations = []
+            self._allEvaluations = self._newHistory('evaluations')
         
         if evaluator is not None:
             self.setEvaluator(evaluator, initEvaluable)        
@@ -133,7 +175,6 @@ class BlackBoxOptimizer(DirectSearchLearner):
                     raise ValueError("Parameter dimension mismatch: evaluator expects "+str(evaluator.xdim)\
                                      +" but it was set to "+str(self.numParameters)+".")
                 '''added by JPQ to handle boundaries on the parameters'''
-                self.evaluator = evaluator
                 if self.xBound is None:            
                     self.xBound = evaluator.xbound
                 if self.feasible is None:
@@ -146,17 +187,26 @@ class BlackBoxOptimizer(DirectSearchLearner):
         # default: maximize
         if self.minimize is None:
             self.minimize = False
+        self.evaluator = evaluator
         self.__evaluator = evaluator
         if self._wasOpposed:
             self._flipDirection()
+        self._resetFitnessCache()
         #set the starting point for optimization (as provided, or randomly)
         self._setInitEvaluable(initEvaluable)        
         self.bestEvaluation = None
         self._additionalInit()
         self.bestEvaluable = self._initEvaluable
         
+    def _newHistory(self, name):
+        """ Return an empty history, called `name`, as given by the historyStore. """
+        if self.historyStore is None:
+            return []
+        return self.historyStore.new(name)
+
     def _flipDirection(self):
         self.__evaluator = oppositeFunction(self.__evaluator)
+        self._resetFitnessCache()
         if self.desiredEvaluation is not None:
             self.desiredEvaluation *= -1        
         
@@ -201,6 +251,9 @@ class BlackBoxOptimizer(DirectSearchLearner):
                 self._learnStep()
                 self._notify()
                 self.numLearningSteps += 1
+                if (self.checkpointFile is not None 
+                    and self.numLearningSteps % self.checkpointInterval == 0):
+                    self.saveCheckpoint(self.checkpointFile)
             except DivergenceError:
                 logging.warning("Algorithm diverged. Stopped after "+str(self.numLearningSteps)+" learning steps.")
                 break
@@ -212,6 +265,59 @@ class BlackBoxOptimizer(DirectSearchLearner):
     def _learnStep(self):
         """ The core method to be implemented by all subclasses. """
         abstractMethod()        
+
+    def saveCheckpoint(self, filename):
+        """ Save the whole state of the optimizer, and of the random number 
+        generators, to a file, from which .loadCheckpoint() resumes the run 
+        exactly where it was. 
+        
+        The evaluation backend and the listener are not saved, nor is the evaluator 
+        if it cannot be pickled: those have to be given again when loading. 
+        Asynchronous evaluations that are still running are dropped. """
+        state = self.__dict__.copy()
+        for name in ['_BlackBoxOptimizer__evaluator', '_evaluation', 'evaluationBackend', 'listener',
+                     '_pending', '_serialBackend']:
+            state.pop(name, None)
+        checkpoint = {'class': self.__class__,
+                      'state': state,
+                      'numpyRandomState': nprandom.get_state(),
+                      'randomState': random.getstate()}
+        flo = BytesIO()
+        try:
+            pickle.dump(checkpoint, flo, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            del state['evaluator']
+            flo = BytesIO()
+            pickle.dump(checkpoint, flo, pickle.HIGHEST_PROTOCOL)
+        # replace the old checkpoint atomically, once the new one is on disk
+        with open(filename + '.tmp', 'wb') as f:
+            f.write(flo.getvalue())
+            f.flush()
+            os.fsync(f.fileno())
+        _replaceFile(filename + '.tmp', filename)
+
+    @staticmethod
+    def loadCheckpoint(filename, evaluator=None, **kwargs):
+        """ Return the optimizer saved by .saveCheckpoint() in the file, and restore
+        the random number generators. If it could not be saved, the evaluator has 
+        to be given; other attributes (e.g. the evaluationBackend) can be set
+        as keyword arguments. """
+        with open(filename, 'rb') as f:
+            checkpoint = pickle.load(f)
+        optimizer = checkpoint['class'].__new__(checkpoint['class'])
+        optimizer.__dict__.update(checkpoint['state'])
+        if evaluator is None:
+            if 'evaluator' not in checkpoint['state']:
+                raise ValueError('The evaluator could not be saved, please provide it.')
+            evaluator = optimizer.evaluator
+        optimizer.evaluator = evaluator
+        if optimizer._wasOpposed:
+            evaluator = oppositeFunction(evaluator)
+        optimizer.__evaluator = evaluator
+        setAllArgs(optimizer, kwargs)
+        nprandom.set_state(checkpoint['numpyRandomState'])
+        random.setstate(checkpoint['randomState'])
+        return optimizer
         
     def _bestFound(self):
         """ return the best found evaluable and its associated fitness. """
@@ -222,8 +328,50 @@ class BlackBoxOptimizer(DirectSearchLearner):
             bestF = self.bestEvaluation
         return bestE, bestF
         
+    def _resetFitnessCache(self):
+        if self.fitnessCacheSize is None:
+            self._fitnessCache = None
+        else:
+            self._fitnessCache = OrderedDict()
+
+    def _cacheKey(self, evaluable):
+        """ The key of the evaluable in the fitness cache, or None if it cannot be cached. """
+        if self._fitnessCache is None or self.constrained:
+            return None
+        params = asarray(evaluable.params if self._wasWrapped else evaluable)
+        if params.dtype.kind not in 'biuf':
+            return None
+        return xhash(ascontiguousarray(params))
+
+    def _cachedFitness(self, key):
+        """ Return the cached fitness for the key (None if there is none), 
+        and count the hit or miss. """
+        if key is not None and key in self._fitnessCache:
+            self.cacheHits += 1
+            # most recently used go to the end
+            res = self._fitnessCache.pop(key)
+            self._fitnessCache[key] = res
+            return res
+        self.cacheMisses += 1
+
+    def _cacheFitness(self, key, res):
+        if key is None:
+            return
+        self._fitnessCache[key] = res
+        while len(self._fitnessCache) > self.fitnessCacheSize:
+            self._fitnessCache.popitem(last=False)
+
     def _oneEvaluation(self, evaluable):
         """ This method should be called by all optimizers for producing an evaluation. """
+        key = self._cacheKey(evaluable)
+        res = None if key is None else self._cachedFitness(key)
+        if res is None:
+            res = self._evaluate(evaluable)
+            self._cacheFitness(key, res)
+        return self._recordEvaluation(evaluable, res)
+
+    def _evaluate(self, evaluable):
+        """ Evaluate, without any bookkeeping. """
         if self._wasUnwrapped:
             self.wrappingEvaluable._setParameters(evaluable)
             res = self.__evaluator(self.wrappingEvaluable)
@@ -236,6 +384,118 @@ class BlackBoxOptimizer(DirectSearchLearner):
                 self.feasible = self.__evaluator.outfeasible
                 self.violation = self.__evaluator.outviolation
             # ---
+        return res
+
+    def _batchEvaluation(self, evaluables):
+        """ Evaluate a whole list of evaluables, using the evaluation backend, and
+        return the list of results. The bookkeeping is the same as for calling
+        ._oneEvaluation() on each of them in turn. 
+        
+        Without a backend, evaluators that can evaluate whole populations at once
+        (with an f_batch method, like FunctionEnvironment) are given the parameters
+        of all the evaluables in one matrix. 
+        
+        With the fitness cache, only the evaluables that are not in it are evaluated. """
+        if self.constrained or len(evaluables) < 2:
+            # constrained evaluators report on the last evaluation in attributes
+            return [self._oneEvaluation(e) for e in evaluables]
+        if self.evaluationBackend is None and not hasattr(self.__evaluator, 'f_batch'):
+            return [self._oneEvaluation(e) for e in evaluables]
+        if self._fitnessCache is None:
+            results = self._evaluateBatch(evaluables)
+            return [self._recordEvaluation(e, res) for e, res in zip(evaluables, results)]
+        # evaluate each missing candidate only once, even if it is in the batch repeatedly
+        results = [None] * len(evaluables)
+        missing = OrderedDict()
+        for i, e in enumerate(evaluables):
+            k = self._cacheKey(e)
+            if k is None:
+                missing[i] = [i]
+            elif k in missing:
+                self.cacheHits += 1
+                missing[k].append(i)
+            else:
+                results[i] = self._cachedFitness(k)
+                if results[i] is None:
+                    missing[k] = [i]
+        fresh = self._evaluateBatch([evaluables[indices[0]] for indices in missing.values()])
+        for (k, indices), res in zip(missing.items(), fresh):
+            self._cacheFitness(None if isinstance(k, int) else k, res)
+            for i in indices:
+                results[i] = res
+        return [self._recordEvaluation(e, res) for e, res in zip(evaluables, results)]
+
+    def _evaluateBatch(self, evaluables):
+        """ Evaluate a list of evaluables at once, without any bookkeeping. """
+        if len(evaluables) == 0:
+            return []
+        if self.evaluationBackend is None:
+            X = array([e.params if isinstance(e, ParameterContainer) else e 
+                       for e in evaluables])
+            return self.__evaluator.f_batch(X)
+        return self.evaluationBackend.map(self._backendFunction(), 
+                                          [self._candidate(e) for e in evaluables])
+
+    def _backendFunction(self):
+        """ The function that evaluation backends call on the candidates. """
+        if self._evaluation is None or self._evaluation.evaluator is not self.__evaluator:
+            wrapping = self.wrappingEvaluable if self._wasUnwrapped else None
+            self._evaluation = _Evaluation(self.__evaluator, wrapping)
+        return self._evaluation
+
+    def _candidate(self, evaluable):
+        """ What is handed to the evaluation backends for the evaluable. """
+        return evaluable.params if self._wasWrapped else evaluable
+
+    def _asynchronousEvaluations(self, produce, number):
+        """ Keep the workers of the evaluation backend busy with new evaluables 
+        from produce(), and yield `number` (evaluable, fitness) pairs, as soon as 
+        their evaluation finishes. Failed (timed out) evaluations have the fitness 
+        None. The evaluations that are still running go on in the background. """
+        backend = self.evaluationBackend
+        if backend is None:
+            if self._serialBackend is None:
+                self._serialBackend = EvaluationBackend()
+            backend = self._serialBackend
+        if self._pending is None:
+            self._pending = {}
+            self._numSubmitted = 0
+        for _ in range(number):
+            while len(self._pending) < backend.processes:
+                evaluable = produce()
+                backend.submit(self._backendFunction(), self._candidate(evaluable), self._numSubmitted)
+                self._pending[self._numSubmitted] = evaluable, time()
+                self._numSubmitted += 1
+            yield self._nextAsynchronousEvaluation(backend)
+
+    def _nextAsynchronousEvaluation(self, backend):
+        while True:
+            timeout = None
+            if self.evaluationTimeout is not None:
+                oldest = min(started for _, started in self._pending.values())
+                timeout = max(0, oldest + self.evaluationTimeout - time())
+            finished = backend.next(timeout)
+            if finished is None:
+                # the oldest one is a straggler
+                tag = min(self._pending, key=lambda t: self._pending[t][1])
+                evaluable, _ = self._pending.pop(tag)
+                self.numFailedEvaluations += 1
+                return evaluable, None
+            tag, success, res = finished
+            if tag not in self._pending:
+                # it was too late
+                continue
+            evaluable, started = self._pending.pop(tag)
+            if not success:
+                raise res
+            if self.evaluationTimeout is not None and time() - started > self.evaluationTimeout:
+                # the serial backend cannot interrupt evaluations
+                self.numFailedEvaluations += 1
+                return evaluable, None
+            return evaluable, self._recordEvaluation(evaluable, res)
+
+    def _recordEvaluation(self, evaluable, res):
+        """ Do the bookkeeping for the evaluation of `evaluable` with the result `res`. """
         if isscalar(res):
             # detect numerical instability
             if isnan(res) or isinf(res):
@@ -252,8 +512,11 @@ class BlackBoxOptimizer(DirectSearchLearner):
         
         # if desired, also keep track of all evaluables and/or their fitness.                        
         if self.storeAllEvaluated:
-            if self._wasUnwrapped:            
+            if self._wasUnwrapped and self.historyStore is None:
+                self.wrappingEvaluable._setParameters(evaluable)
                 self._allEvaluated.append(self.wrappingEvaluable.copy())
+            elif self._wasUnwrapped:
+                self._allEvaluated.append(evaluable.copy())
             elif self._wasWrapped:            
                 self._allEvaluated.append(evaluable.params.copy())
             else:            
@@ -280,6 +543,27 @@ class BlackBoxOptimizer(DirectSearchLearner):
         # ---
             return res
     
+    def _isBetter(self, fitness, other):
+        if other is None:
+            return True
+        if self.minimize:
+            return fitness < other
+        return fitness > other
+
+    def _emigrants(self, number):
+        """ Return up to `number` of the best (evaluable, fitness) pairs, as 
+        migrants for the other islands of an island model (see 
+        pybrain.optimization.islands). By default, only the best found so far. """
+        return [(self.bestEvaluable, self.bestEvaluation)]
+
+    def _immigrate(self, migrants):
+        """ Take in (evaluable, fitness) pairs from other islands. By default, 
+        one that is better replaces the best found so far (where e.g. hill-climbing
+        continues from). """
+        for evaluable, fitness in migrants:
+            if self._isBetter(fitness, self.bestEvaluation):
+                self.bestEvaluable, self.bestEvaluation = evaluable.copy(), fitness
+
     def _stoppingCriterion(self):
         if self.maxEvaluations is not None and self.numEvaluations+self.batchSize > self.maxEvaluations:
             return True
@@ -1,6 +1,6 @@
 __author__ = 'Julian Togelius and Tom Schaul, tom@idsia.ch'
 
-from random import shuffle
+from random import shuffle, choice
 
 from pybrain.optimization.optimizer import BlackBoxOptimizer
 
@@ -19,13 +19,18 @@ class ES(BlackBoxOptimizer):
 
     elitism = False
 
+    #: Steady-state mode: the offspring are evaluated asynchronously (with the
+    #: evaluationBackend), and each one replaces the worst individual as soon as
+    #: its result arrives, if it is better.
+    asynchronous = False
+
     def _additionalInit(self):
         assert self.lambada % self.mu == 0, 'lambda ('+str(self.lambada)+\
                                             ') must be multiple of mu ('+str(self.mu)+').'
         self.hallOfFame = []
         # population is a list of (fitness, individual) tuples.
         self.population = [(self._oneEvaluation(self._initEvaluable), self._initEvaluable)] * self._popsize
-        list(map(self._replaceByMutation, list(range(1, self._popsize))))
+        self._replaceByMutations(list(range(1, self._popsize)))
         self._sortPopulation()
 
     @property
@@ -36,29 +41,53 @@ class ES(BlackBoxOptimizer):
             return self.lambada
 
     def _replaceByMutation(self, index):
-        x = self.population[index][1].copy()
-        x.mutate()
-        self.population[index] = (self._oneEvaluation(x), x)
+        self._replaceByMutations([index])
+
+    def _replaceByMutations(self, indices):
+        xs = []
+        for index in indices:
+            x = self.population[index][1].copy()
+            x.mutate()
+            xs.append(x)
+        for index, x, fitness in zip(indices, xs, self._batchEvaluation(xs)):
+            self.population[index] = (fitness, x)
 
     def _learnStep(self):
+        if self.asynchronous:
+            self._asynchronousLearnStep()
+            return
+
         # re-evaluate the mu individuals if the fitness function is noisy
         if self.evaluatorIsNoisy:
-            for i in range (self.mu):
-                x = self.population[i][1]
-                self.population[i] = (self._oneEvaluation(x), x)
+            xs = [x for _, x in self.population[:self.mu]]
+            self.population[:self.mu] = list(zip(self._batchEvaluation(xs), xs))
             self._sortPopulation(noHallOfFame = True)
 
         # produce offspring from the the mu best ones
-        self.population = self.population[:self.mu] * (self._popsize/self.mu)
+        self.population = self.population[:self.mu] * (self._popsize // self.mu)
 
         # mutate the offspring
         if self.elitism:
-            list(map(self._replaceByMutation, list(range(self.mu, self._popsize))))
+            self._replaceByMutations(list(range(self.mu, self._popsize)))
         else:
-            list(map(self._replaceByMutation, list(range(self._popsize))))
+            self._replaceByMutations(list(range(self._popsize)))
 
         self._sortPopulation()
 
+    def _produceChild(self):
+        x = choice(self.population[:self.mu])[1].copy()
+        x.mutate()
+        return x
+
+    def _asynchronousLearnStep(self):
+        """ Integrate lambda offspring, in the order their results arrive. """
+        for x, fitness in self._asynchronousEvaluations(self._produceChild, self.lambada):
+            if fitness is not None and fitness > self.population[-1][0]:
+                self.population[-1] = (fitness, x)
+                self.population.sort(key = lambda x: -x[0])
+        if self.storeHallOfFame:
+            self.hallOfFame.append(self.population[0][1])
+
     def _sortPopulation(self, noHallOfFame = False):
         # shuffle-sort the population and fitnesses
         shuffle(self.population)
@@ -67,6 +96,17 @@ class ES(BlackBoxOptimizer):
             # the best per generation stored here
             self.hallOfFame.append(self.population[0][1])
 
+    def _emigrants(self, number):
+        return [(x, fitness) for fitness, x in self.population[:number]]
+
+    def _immigrate(self, migrants):
+        """ The migrants replace the worst individuals. """
+        BlackBoxOptimizer._immigrate(self, migrants)
+        migrants = migrants[:len(self.population)]
+        if migrants:
+            self.population[-len(migrants):] = [(fitness, x.copy()) for x, fitness in migrants]
+            self._sortPopulation(noHallOfFame = True)
+
     @property
     def batchSize(self):
         if self.evaluatorIsNoisy:
@@ -17,15 +17,32 @@ class Evolution(BlackBoxOptimizer):
         self.currentpop = []
         self.fitnesses = []
         self._allGenerations = []
+        self._lastGeneration = []
         self.initPopulation()
 
     def _learnStep(self):
         """ do one generation step """
-        self.fitnesses = [self._oneEvaluation(indiv) for indiv in self.currentpop]
+        self.fitnesses = self._batchEvaluation(self.currentpop)
         if self.storeAllPopulations:
             self._allGenerations.append((self.currentpop, self.fitnesses))
+        self._lastGeneration = list(zip(self.currentpop, self.fitnesses))
         self.produceOffspring()
 
+    def _emigrants(self, number):
+        """ The best individuals of the last generation. """
+        if not self._lastGeneration:
+            return BlackBoxOptimizer._emigrants(self, number)
+        generation = sorted(self._lastGeneration, key=lambda x: x[1], reverse=not self.minimize)
+        return generation[:number]
+
+    def _immigrate(self, migrants):
+        """ The migrants replace the last individuals of the next generation 
+        (which get evaluated again). """
+        BlackBoxOptimizer._immigrate(self, migrants)
+        migrants = migrants[:len(self.currentpop)]
+        if migrants:
+            self.currentpop[-len(migrants):] = [e.copy() for e, _ in migrants]
+
     def initPopulation(self):
         """ initialize the population """
         abstractMethod()
@@ -1,12 +1,12 @@
 __author__ = 'Tom Schaul, tom@idsia.ch'
 
-from scipy import randn, zeros
+from scipy import randn, zeros, isscalar
 from scipy import random as rd, array
 from random import choice, random, gauss, shuffle, sample
 from numpy import ndarray
 
 from pybrain.optimization.populationbased.evolution import Evolution
-from pybrain.optimization.optimizer import ContinuousOptimizer
+from pybrain.optimization.optimizer import BlackBoxOptimizer, ContinuousOptimizer
 
 
 class GA(ContinuousOptimizer, Evolution):
@@ -32,8 +32,16 @@ class GA(ContinuousOptimizer, Evolution):
     
     mustMaximize = True
 
+    #: Steady-state mode: the children are evaluated asynchronously (with the
+    #: evaluationBackend), and each one replaces the worst individual as soon as
+    #: its result arrives, if it is better.
+    asynchronous = False
+
     '''added by JPQ'''
     def initBoundaries(self):
+        if isscalar(self.xBound):
+            # the same bound in every dimension, as for the BBOB functions
+            self.xBound = [(-self.xBound, self.xBound)] * self.numParameters
         assert len(self.xBound) == self.numParameters
         self.mins = array([min_ for min_, max_ in self.xBound])
         self.maxs = array([max_ for min_, max_ in self.xBound])
@@ -170,6 +178,45 @@ class GA(ContinuousOptimizer, Evolution):
         return res
     # ---
     
+    def _learnStep(self):
+        if not self.asynchronous:
+            Evolution._learnStep(self)
+        elif len(self.fitnesses) != len(self.currentpop):
+            # the initial population is evaluated as a whole
+            self.fitnesses = self._batchEvaluation(self.currentpop)
+        else:
+            self._asynchronousLearnStep()
+        if self.asynchronous:
+            if self.storeAllPopulations:
+                self._allGenerations.append((list(self.currentpop), list(self.fitnesses)))
+            self._lastGeneration = list(zip(self.currentpop, self.fitnesses))
+
+    def _produceChild(self):
+        parents = self.select()
+        if len(parents) < 2:
+            return self.mutated(choice(parents))
+        return self.mutated(self.crossOver(sample(parents, 2), 1)[0])
+
+    def _replaceWorst(self, indiv, fitness):
+        worst = min(range(len(self.fitnesses)), key=lambda i: self.fitnesses[i])
+        if fitness > self.fitnesses[worst]:
+            self.currentpop[worst] = indiv
+            self.fitnesses[worst] = fitness
+
+    def _asynchronousLearnStep(self):
+        """ Integrate as many children as there are individuals, in the order 
+        their results arrive. """
+        for child, fitness in self._asynchronousEvaluations(self._produceChild, self.populationSize):
+            if fitness is not None:
+                self._replaceWorst(child, fitness)
+
+    def _immigrate(self, migrants):
+        if not self.asynchronous:
+            return Evolution._immigrate(self, migrants)
+        BlackBoxOptimizer._immigrate(self, migrants)
+        for indiv, fitness in migrants:
+            self._replaceWorst(indiv.copy(), fitness)
+
     @property
     def selectionSize(self):
         """ the number of parents selected from the current population """
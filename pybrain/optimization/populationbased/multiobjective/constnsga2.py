@@ -1,11 +1,12 @@
 __author__ = 'proposed by Jean Pierre Queau , jeanpierre.queau"sbmoffshore.com'
 
 
-from scipy import array
+from scipy import array, sort, argsort, flatnonzero, sum
 
 from pybrain.optimization.optimizer import BlackBoxOptimizer
 from pybrain.optimization.populationbased.ga import GA
-from pybrain.tools.nondominated import const_non_dominated_front, const_crowding_distance, const_non_dominated_sort
+from pybrain.tools.nondominated import const_non_dominated_front, const_non_dominated_ranks, \
+    crowding_distances
 
 # TODO: not very elegant, because of the conversions between tuples and arrays all the time...
 
@@ -69,21 +70,22 @@ class ConstMultiObjectiveGA(GA):
 def nsga2select(population, fitnesses, survivors, allowequality = True):
     """The NSGA-II selection strategy (Deb et al., 2002).
     The number of individuals that survive is given by the survivors parameter."""
-    fronts = const_non_dominated_sort(population,
-                                key=lambda x: fitnesses[x],
-                                allowequality = allowequality)
-    
-    individuals = set()
-    for front in fronts:
-        remaining = survivors - len(individuals)
-        if not remaining > 0:
-            break
-        if len(front) > remaining:
-            # If the current front does not fit in the spots left, use those
-            # that have the biggest crowding distance.
-            crowd_dist = const_crowding_distance(front, fitnesses)
-            front = sorted(front, key=lambda x: crowd_dist[x], reverse=True)
-            front = set(front[:remaining])
-        individuals |= front
-
-    return list(individuals)
+    population = list(set(population))
+    survivors = min(survivors, len(population))
+    if not survivors > 0:
+        return []
+    fits = [fitnesses[x] for x in population]
+    keys = array([f[0] for f in fits])
+    ranks = const_non_dominated_ranks(keys, [f[1] for f in fits], [sum(f[2]) for f in fits],
+                                      allowequality)
+    # all the fronts that fit in, and from the last one those 
+    # that have the biggest crowding distance.
+    last = sort(ranks)[survivors - 1]
+    individuals = list(flatnonzero(ranks < last))
+    front = flatnonzero(ranks == last)
+    remaining = survivors - len(individuals)
+    if len(front) > remaining:
+        crowd_dist = crowding_distances(keys[front])
+        front = front[argsort(-crowd_dist, kind='mergesort')[:remaining]]
+    individuals.extend(front)
+    return [population[i] for i in individuals]
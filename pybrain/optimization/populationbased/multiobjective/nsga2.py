@@ -1,10 +1,10 @@
 __author__ = 'Justin Bayer, Tom Schaul, {justin,tom}@idsia.ch'
 
 
-from scipy import array
+from scipy import array, sort, argsort, flatnonzero
 
 from pybrain.optimization.populationbased.ga import GA
-from pybrain.tools.nondominated import non_dominated_front, crowding_distance, non_dominated_sort
+from pybrain.tools.nondominated import non_dominated_front, non_dominated_ranks, crowding_distances
 
 # TODO: not very elegant, because of the conversions between tuples and arrays all the time...
 
@@ -30,15 +30,18 @@ class MultiObjectiveGA(GA):
         if isinstance(self.fitnesses,dict):
             oldfitnesses = self.fitnesses
             self.fitnesses = dict()
+            new = []
             for indiv in self.currentpop:
                 if tuple(indiv) in oldfitnesses:
                     self.fitnesses[tuple(indiv)] = oldfitnesses[tuple(indiv)]
                 else:
-                    self.fitnesses[tuple(indiv)] = self._oneEvaluation(indiv)
+                    new.append(indiv)
+            for indiv, fitness in zip(new, self._batchEvaluation(new)):
+                self.fitnesses[tuple(indiv)] = fitness
             del oldfitnesses
         else:
         # ---
-            self.fitnesses = dict([(tuple(indiv), self._oneEvaluation(indiv)) for indiv in self.currentpop])
+            self.fitnesses = dict(zip(map(tuple, self.currentpop), self._batchEvaluation(self.currentpop)))
 
         if self.storeAllPopulations:
             self._allGenerations.append((self.currentpop, self.fitnesses))
@@ -64,21 +67,20 @@ class MultiObjectiveGA(GA):
 def nsga2select(population, fitnesses, survivors, allowequality = True):
     """The NSGA-II selection strategy (Deb et al., 2002).
     The number of individuals that survive is given by the survivors parameter."""
-    fronts = non_dominated_sort(population,
-                                key=lambda x: fitnesses[x],
-                                allowequality = allowequality)
-    
-    individuals = set()
-    for front in fronts:
-        remaining = survivors - len(individuals)
-        if not remaining > 0:
-            break
-        if len(front) > remaining:
-            # If the current front does not fit in the spots left, use those
-            # that have the biggest crowding distance.
-            crowd_dist = crowding_distance(front, fitnesses)
-            front = sorted(front, key=lambda x: crowd_dist[x], reverse=True)
-            front = set(front[:remaining])
-        individuals |= front
-
-    return list(individuals)
+    population = list(set(population))
+    survivors = min(survivors, len(population))
+    if not survivors > 0:
+        return []
+    keys = array([fitnesses[x] for x in population])
+    ranks = non_dominated_ranks(keys, allowequality)
+    # all the fronts that fit in, and from the last one those 
+    # that have the biggest crowding distance.
+    last = sort(ranks)[survivors - 1]
+    individuals = list(flatnonzero(ranks < last))
+    front = flatnonzero(ranks == last)
+    remaining = survivors - len(individuals)
+    if len(front) > remaining:
+        crowd_dist = crowding_distances(keys[front])
+        front = front[argsort(-crowd_dist, kind='mergesort')[:remaining]]
+    individuals.extend(front)
+    return [population[i] for i in individuals]
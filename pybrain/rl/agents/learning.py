@@ -9,12 +9,13 @@ class LearningAgent(LoggingAgent):
         used continuously or with episodes.
     """
 
-    def __init__(self, module, learner = None):
+    def __init__(self, module, learner = None, history = None):
         """
         :key module: the acting module
-        :key learner: the learner (optional) """
+        :key learner: the learner (optional)
+        :key history: the dataset for the history (optional), see LoggingAgent """
 
-        LoggingAgent.__init__(self, module.indim, module.outdim)
+        LoggingAgent.__init__(self, module.indim, module.outdim, history)
 
         self.module = module
         self.learner = learner
@@ -55,6 +56,27 @@ class LearningAgent(LoggingAgent):
         return self.lastaction
 
 
+    def getActions(self):
+        """ Activate the module with the batch of last observations at once, and
+            explore on all of them. The module must not be sequential. """
+        LoggingAgent.getActions(self)
+
+        self.lastaction = self.module.activateBatch(self.lastobs)
+
+        if self.learning:
+            self.lastaction = self.learner.exploreBatch(self.lastobs, self.lastaction,
+                                                        self.lastindices)
+
+        return self.lastaction
+
+
+    def finishEpisode(self, index):
+        LoggingAgent.finishEpisode(self, index)
+        if self.learning:
+            self.learner.finishEpisode(index)
+            self.learner.newEpisode()
+
+
     def newEpisode(self):
         """ Indicate the beginning of a new episode in the training cycle. """
         # reset the module when a new episode starts.
@@ -7,7 +7,7 @@ from pybrain.datasets import ReinforcementDataSet
 class LoggingAgent(Agent):
     """ This agent stores actions, states, and rewards encountered during
         interaction with an environment in a ReinforcementDataSet (which is
-        a variation of SequentialDataSet).
+        a variation of SequentialDataSet), or in a ReplayMemory of fixed size.
         The stored history can be used for learning and is erased by resetting
         the agent. It also makes sure that integrateObservation, getAction and
         giveReward are called in exactly that order.
@@ -20,15 +20,23 @@ class LoggingAgent(Agent):
     lastreward = None
 
 
-    def __init__(self, indim, outdim, **kwargs):
+    def __init__(self, indim, outdim, history=None, **kwargs):
+        """
+        :key history: the dataset in which the history is stored, e.g. a
+            ReplayMemory of fixed size (by default, a new ReinforcementDataSet) """
         self.setArgs(**kwargs)
-        
+
         # store input and output dimension
         self.indim = indim
         self.outdim = outdim
 
         # create the history dataset
-        self.history = ReinforcementDataSet(indim, outdim)
+        if history is None:
+            history = ReinforcementDataSet(indim, outdim)
+        self.history = history
+
+        # the transitions of the unfinished episodes of a batch, per copy of the task
+        self._episodes = {}
 
 
     def integrateObservation(self, obs):
@@ -41,9 +49,9 @@ class LoggingAgent(Agent):
 
     def getAction(self):
         """Step 2: store the action in a temporary variable until reward is given. """
-        assert self.lastobs != None
-        assert self.lastaction == None
-        assert self.lastreward == None
+        assert self.lastobs is not None
+        assert self.lastaction is None
+        assert self.lastreward is None
 
         # implement getAction in subclass and set self.lastaction
 
@@ -51,9 +59,9 @@ class LoggingAgent(Agent):
     def giveReward(self, r):
         """Step 3: store observation, action and reward in the history dataset. """
         # step 3: assume that state and action have been set
-        assert self.lastobs != None
-        assert self.lastaction != None
-        assert self.lastreward == None
+        assert self.lastobs is not None
+        assert self.lastaction is not None
+        assert self.lastreward is None
 
         self.lastreward = r
 
@@ -68,10 +76,52 @@ class LoggingAgent(Agent):
             self.history.newSequence()
 
 
+    def integrateObservations(self, observations, indices):
+        """Batch version of step 1: the rows of `observations` come from several
+        copies of the task, identified by `indices`. """
+        self.lastobs = observations
+        self.lastindices = list(indices)
+        self.lastaction = None
+        self.lastreward = None
+
+
+    def getActions(self):
+        """Batch version of step 2: implement in subclass and set self.lastaction
+        to one action per row of the observations. """
+        assert self.lastobs is not None
+        assert self.lastaction is None
+        assert self.lastreward is None
+
+
+    def giveRewards(self, rewards):
+        """Batch version of step 3: the transitions are kept per copy of the task,
+        until its episode is finished. """
+        assert self.lastobs is not None
+        assert self.lastaction is not None
+        assert self.lastreward is None
+
+        self.lastreward = rewards
+
+        if self.logging:
+            for index, obs, action, reward in zip(self.lastindices, self.lastobs,
+                                                  self.lastaction, rewards):
+                self._episodes.setdefault(index, []).append((obs, action, reward))
+
+
+    def finishEpisode(self, index):
+        """ The episode on the copy `index` of the task is over: store its
+        transitions in the history dataset, as one sequence. """
+        transitions = self._episodes.pop(index, [])
+        if self.logging and transitions:
+            self.history.newSequence()
+            self.history.extendLinked(*zip(*transitions))
+
+
     def reset(self):
         """ Clear the history of the agent. """
         self.lastobs = None
         self.lastaction = None
         self.lastreward = None
+        self._episodes = {}
 
         self.history.clear()
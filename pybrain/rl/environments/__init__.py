@@ -1,3 +1,4 @@
 from pybrain.rl.environments.environment import Environment
 from pybrain.rl.environments.task import Task
-from pybrain.rl.environments.episodic import EpisodicTask
\ No newline at end of file
+from pybrain.rl.environments.episodic import EpisodicTask
+from pybrain.rl.environments.parallel import ParallelEpisodicEvaluator
@@ -1,11 +1,9 @@
-# try importing the external dependencies
+from pybrain.rl.environments.cartpole.cartpole import CartPoleEnvironment, CartPoleLinEnvironment, CartPoleBatchEnvironment
 try:
-    from matplotlib.mlab import rk4
+    # the renderer needs the matplotlib library
+    from pybrain.rl.environments.cartpole.renderer import CartPoleRenderer
 except ImportError:
-    raise ImportError('This environment needs the matplotlib library installed.')
-
-from pybrain.rl.environments.cartpole.cartpole import CartPoleEnvironment, CartPoleLinEnvironment
-from pybrain.rl.environments.cartpole.renderer import CartPoleRenderer
+    pass
 from pybrain.rl.environments.cartpole.balancetask import BalanceTask, EasyBalanceTask, DiscreteBalanceTask, DiscreteNoHelpTask, JustBalanceTask, LinearizedBalanceTask, DiscretePOMDPTask
 from pybrain.rl.environments.cartpole.doublepole import DoublePoleEnvironment
 from pybrain.rl.environments.cartpole.nonmarkovpole import NonMarkovPoleEnvironment
@@ -1,13 +1,24 @@
 __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 
-from matplotlib.mlab import rk4
-from math import sin, cos
 import time
-from scipy import eye, matrix, random, asarray
+from scipy import eye, matrix, random, asarray, array, sin, cos, zeros
 
 from pybrain.rl.environments.graphical import GraphicalEnvironment
 
 
+def rk4(derivs, x, dt):
+    """ One step (dt) of the classical 4th order Runge-Kutta method, from the
+        state x (or the states in its rows), with the same arithmetic as
+        matplotlib.mlab.rk4. derivs maps states to their derivatives.
+    """
+    dt2 = dt / 2.0
+    k1 = derivs(x)
+    k2 = derivs(x + dt2 * k1)
+    k3 = derivs(x + dt2 * k2)
+    k4 = derivs(x + dt * k3)
+    return x + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
 class CartPoleEnvironment(GraphicalEnvironment):
     """ This environment implements the cart pole balancing benchmark, as stated in:
         Riedmiller, Peters, Schaal: "Evaluation of Policy Gradient Methods and
@@ -53,31 +64,41 @@ class CartPoleEnvironment(GraphicalEnvironment):
         self.step()
 
     def step(self):
-        self.sensors = rk4(self._derivs, self.sensors, [0, self.dt])
-        self.sensors = self.sensors[-1]
+        self.sensors = self.integrate(asarray([self.sensors], float),
+                                      asarray(self.action, float).flatten()[:1])[0]
         if self.hasRenderer():
             self.getRenderer().updateData(self.sensors)
             if self.delay:
                 time.sleep(0.05)
 
+    def integrate(self, states, forces):
+        """ Advance the independent cart poles in the rows of states, each pushed
+            by its force, by one step (dt) at once, and return their new states.
+        """
+        return rk4(lambda x: self._derivs(x, forces), states, self.dt)
+
     def reset(self):
         """ re-initializes the environment, setting the cart back in a random position.
         """
+        self.sensors = self._initialState()
+
+    def _initialState(self):
         if self.randomInitialization:
             angle = random.uniform(-0.2, 0.2)
             pos = random.uniform(-0.5, 0.5)
         else:
             angle = -0.2
             pos = 0.2
-        self.sensors = (angle, 0.0, pos, 0.0)
+        return (angle, 0.0, pos, 0.0)
 
-    def _derivs(self, x, t):
+    def _derivs(self, x, F):
         """ This function is needed for the Runge-Kutta integration approximation method. It calculates the
-            derivatives of the state variables given in x. for each variable in x, it returns the first order
-            derivative at time t.
+            derivatives of the state variables in the rows of x, for the forces F: for each variable, it
+            returns the first order derivative.
         """
-        F = self.action
-        (theta, theta_, _s, s_) = x
+        theta = x[:, 0]
+        theta_ = x[:, 1]
+        s_ = x[:, 3]
         u = theta_
         sin_theta = sin(theta)
         cos_theta = cos(theta)
@@ -87,7 +108,7 @@ class CartPoleEnvironment(GraphicalEnvironment):
         u_ = (self.g * sin_theta * (mc + mp) - (F + mp * l * theta_ ** 2 * sin_theta) * cos_theta) / (4 / 3 * l * (mc + mp) - mp * l * cos_theta ** 2)
         v = s_
         v_ = (F - mp * l * (u_ * cos_theta - (theta_ ** 2 * sin_theta))) / (mc + mp)
-        return (u, u_, v, v_)
+        return array([u, u_, v, v_]).T
 
     def getPoleAngles(self):
         """ auxiliary access to just the pole angle(s), to be used by BalanceTask """
@@ -99,6 +120,45 @@ class CartPoleEnvironment(GraphicalEnvironment):
 
 
 
+class CartPoleBatchEnvironment(CartPoleEnvironment):
+    """ A number of independent cart poles, which are advanced together. The
+        sensors have one row per cart pole, the action is one force per cart
+        pole, and the auxiliary accessors give one entry per cart pole.
+        With the same random seed, the cart poles follow the same trajectories
+        as that many CartPoleEnvironments, one after the other.
+    """
+
+    def __init__(self, size, polelength=None):
+        self.size = size
+        CartPoleEnvironment.__init__(self, polelength)
+        self.action = zeros(size)
+
+    def getSensors(self):
+        return self.sensors.copy()
+
+    def performAction(self, action):
+        self.action = asarray(action, float).reshape(self.size)
+        self.step()
+
+    def step(self):
+        self.sensors = self.integrate(self.sensors, self.action)
+
+    def reset(self, rows=None):
+        """ re-initializes the given cart poles (all by default).
+        """
+        if rows is None:
+            self.sensors = zeros((self.size, 4))
+            rows = range(self.size)
+        for row in rows:
+            self.sensors[row] = self._initialState()
+
+    def getPoleAngles(self):
+        return self.sensors[:, :1]
+
+    def getCartPosition(self):
+        return self.sensors[:, 2]
+
+
 class CartPoleLinEnvironment(CartPoleEnvironment):
     """ This is a linearized implementation of the cart-pole system, as described in
     Peters J, Vijayakumar S, Schaal S (2003) Reinforcement learning for humanoid robotics.
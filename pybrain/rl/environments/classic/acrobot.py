@@ -6,7 +6,7 @@ from the "FAReinforcement" library
 of Jose Antonio Martin H. (version 1.0).
 """
     
-from scipy import pi, array, cos, sin
+from scipy import pi, array, asarray, cos, sin, clip, where
 from pybrain.rl.environments.episodic import EpisodicTask
 
 
@@ -126,9 +126,15 @@ class AcrobotTask(EpisodicTask):
     def DoAction(self, a, x):
         self.steps = self.steps + 1
         torque = self.action_list[a]
+        return list(self.dynamics([x], [torque])[0])
 
+    def dynamics(self, states, torques):
+        """ Advance the acrobots in the rows of `states` (theta1, theta2,
+        theta1_dot, theta2_dot), each with its torque, by one time step at once,
+        and return their new states. """
         # Parameters for simulation
-        theta1, theta2, theta1_dot, theta2_dot = x
+        theta1, theta2, theta1_dot, theta2_dot = asarray(states, float).T
+        torque = asarray(torques, float)
 
         for _ in range(4):
             d1 = self.m1 * self.lc1Square + self.m2 * (self.l1Square + self.lc2Square + 2 * self.l1 * self.lc2 * cos(theta2)) + self.I1 + self.I2
@@ -141,42 +147,16 @@ class AcrobotTask(EpisodicTask):
             accel2 = accel2 / (self.m2 * self.lc2Square + self.I2 - (d2 * d2 / d1))
             accel1 = -(d2 * accel2 + phi1) / d1
 
-            theta1_dot = theta1_dot + accel1 * self.delta_t
-
-            if theta1_dot < -self.maxSpeed1:
-                theta1_dot = -self.maxSpeed1
-
-            if theta1_dot > self.maxSpeed1:
-                theta1_dot = self.maxSpeed1
-
+            theta1_dot = clip(theta1_dot + accel1 * self.delta_t, -self.maxSpeed1, self.maxSpeed1)
             theta1 = theta1 + theta1_dot * self.delta_t
-            theta2_dot = theta2_dot + accel2 * self.delta_t
-
-            if theta2_dot < -self.maxSpeed2:
-                theta2_dot = -self.maxSpeed2
-
-            if theta2_dot > self.maxSpeed2:
-                theta2_dot = self.maxSpeed2
-
+            theta2_dot = clip(theta2_dot + accel2 * self.delta_t, -self.maxSpeed2, self.maxSpeed2)
             theta2 = theta2 + theta2_dot * self.delta_t
 
         # bounded angles?
-        #if theta1 < -pi:
-        #    theta1 = -pi
-        #elif theta1 > pi:
-        #    theta1 = pi
-        if theta1 < -pi:
-            theta1 += 2*pi
-        elif theta1 > pi:
-            theta1 -= 2*pi
-        if theta2 < -pi:
-            theta2 += 2*pi
-        elif theta2 > pi:
-            theta2 -= 2*pi
-
-        xp = [theta1, theta2, theta1_dot, theta2_dot]
-
-        return xp
+        theta1 = where(theta1 < -pi, theta1 + 2*pi, where(theta1 > pi, theta1 - 2*pi, theta1))
+        theta2 = where(theta2 < -pi, theta2 + 2*pi, where(theta2 > pi, theta2 - 2*pi, theta2))
+
+        return array([theta1, theta2, theta1_dot, theta2_dot]).T
 
 
 class SimpleAcrobot(AcrobotTask):
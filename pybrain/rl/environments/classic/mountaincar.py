@@ -6,7 +6,7 @@ from the "FAReinforcement" library
 of Jose Antonio Martin H. (version 1.0).
 """
     
-from scipy import array, cos
+from scipy import array, asarray, cos, clip, where
 from pybrain.rl.environments.episodic import EpisodicTask
 
 
@@ -103,14 +103,17 @@ class MountainCar(EpisodicTask):
         # acti: is the force to be applied to the car
         # x: is the vector containning the position and speed of the car
         # xp: is the vector containing the new position and velocity of the car
-        #print('action',a)
-        #print('state',s)
         force = self.action_list[a]
 
         self.steps = self.steps + 1
 
-        position = s[0]
-        speed = s[1]
+        return list(self.dynamics([s], [force])[0])
+
+    def dynamics(self, states, forces):
+        """ Advance the cars in the rows of `states` (position, speed), each with
+        its force, by one time step at once, and return their new states. """
+        position, speed = asarray(states, float).T
+        force = asarray(forces, float)
 
         # bounds for position
         bpleft = -1.4
@@ -119,18 +122,13 @@ class MountainCar(EpisodicTask):
         bsleft = -0.07
         bsright = 0.07
 
-        speedt1 = speed + (0.001 * force) + (-0.0025 * cos(3.0 * position))
-        
-        if speedt1 < bsleft:
-            speedt1 = bsleft
-        elif speedt1 > bsright:
-            speedt1 = bsright
+        speedt1 = clip(speed + (0.001 * force) + (-0.0025 * cos(3.0 * position)), bsleft, bsright)
 
         post1 = position + speedt1
 
-        if post1 <= bpleft:
-            post1 = bpleft
-            speedt1 = 0.0
+        # the car stops at the left bound
+        speedt1 = where(post1 <= bpleft, 0.0, speedt1)
+        post1 = where(post1 <= bpleft, bpleft, post1)
 
-        return [post1, speedt1]
+        return array([post1, speedt1]).T
 
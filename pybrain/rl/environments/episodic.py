@@ -60,13 +60,19 @@ class EpisodicTask(Task, FitnessEvaluator):
         r = 0.
         for _ in range(self.batchSize):
             if isinstance(x, Module):
-                x.reset()
-                self.reset()
-                while not self.isFinished():
-                    self.performAction(x.activate(self.getObservation()))
+                r += self._moduleEpisode(x)
             elif isinstance(x, Agent):
                 EpisodicExperiment(self, x).doEpisodes()
+                r += self.getTotalReward()
             else:
                 raise ValueError(self.__class__.__name__+' cannot evaluate the fitness of '+str(type(x)))
-            r += self.getTotalReward()
         return r / float(self.batchSize)
+
+    def _moduleEpisode(self, module):
+        """ Do one episode with the actions produced by the module, and return
+        the total reward. """
+        module.reset()
+        self.reset()
+        while not self.isFinished():
+            self.performAction(module.activate(self.getObservation()))
+        return self.getTotalReward()
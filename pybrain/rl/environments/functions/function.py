@@ -50,6 +50,12 @@ class FunctionEnvironment(Environment, FitnessEvaluator):
         assert type(x) == ndarray, 'FunctionEnvironment: Input not understood: '+str(type(x))
         return self.f(x)
 
+    def f_batch(self, X):
+        """ Return the array of the function values on all the rows of the
+        matrix X, i.e. on a whole population at once. Subclasses can override
+        this with a vectorized version. """
+        return array([self.f(x) for x in X])
+
     # methods for conforming to the Environment interface:
     def reset(self):
         self.result = None
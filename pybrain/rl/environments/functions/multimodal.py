@@ -4,7 +4,8 @@ from __future__ import print_function
 
 __author__ = 'Tom Schaul, tom@idsia.ch'
 
-from scipy import power, exp, cos, sqrt, rand, sin, floor, dot, ones, sign, randn, prod
+from scipy import power, exp, cos, sqrt, rand, sin, floor, dot, ones, sign, randn, prod, \
+    array, arange, minimum, trunc
 from scipy.linalg import orth
 from math import pi
 from random import shuffle
@@ -26,6 +27,10 @@ class FunnelFunction(MultiModalFunction):
         return min(dot(x - 2.5 * ones(self.xdim), x - 2.5 * ones(self.xdim)), \
             self.funnelDepth * self.xdim + self.funnelSize * dot(x + 2.5 * ones(self.xdim), x + 2.5 * ones(self.xdim)))
 
+    def f_batch(self, X):
+        return minimum(((X - 2.5) ** 2).sum(axis=1),
+                       self.funnelDepth * self.xdim + self.funnelSize * ((X + 2.5) ** 2).sum(axis=1))
+
 
 
 class RastriginFunction(MultiModalFunction):
@@ -42,6 +47,10 @@ class RastriginFunction(MultiModalFunction):
             s += (ai * xi) ** 2 - 10 * cos(2 * pi * ai * xi)
         return s + 10 * len(x)
 
+    def f_batch(self, X):
+        a = array([power(self.a, (i - 1) / (self.xdim - 1)) for i in range(self.xdim)])
+        return ((a * X) ** 2 - 10 * cos(2 * pi * a * X)).sum(axis=1) + 10 * X.shape[1]
+
 
 class WeierstrassFunction(MultiModalFunction):
     """ Global optimum is not unique. 
@@ -59,6 +68,15 @@ class WeierstrassFunction(MultiModalFunction):
             res -= self.xdim * a ** k * cos(2 * pi * b ** k * 0.5)
         return res
 
+    def f_batch(self, X):
+        a = 0.5
+        b = 3
+        res = 0
+        for k in range(self.kmax):
+            res += (a ** k * cos(2 * pi * b ** k * (X + 0.5))).sum(axis=1)
+            res -= self.xdim * a ** k * cos(2 * pi * b ** k * 0.5)
+        return res
+
 
 class SchaffersF7Function(MultiModalFunction):
         
@@ -66,6 +84,10 @@ class SchaffersF7Function(MultiModalFunction):
         s = sqrt(x[:-1] ** 2 + x[1:] ** 2)
         return sum(sqrt(s) * (1 + sin(50 * power(s, 0.2)) ** 2)) ** 2
 
+    def f_batch(self, X):
+        s = sqrt(X[:, :-1] ** 2 + X[:, 1:] ** 2)
+        return (sqrt(s) * (1 + sin(50 * power(s, 0.2)) ** 2)).sum(axis=1) ** 2
+
 
 class AckleyFunction(MultiModalFunction):
     def f(self, x):
@@ -74,6 +96,12 @@ class AckleyFunction(MultiModalFunction):
         res += 20 + exp(1)
         return res
 
+    def f_batch(self, X):
+        res = -20 * exp(-0.2 * sqrt(1. / self.xdim * (X ** 2).sum(axis=1)))
+        res -= exp((1. / self.xdim) * cos(2 * pi * X).sum(axis=1))
+        res += 20 + exp(1)
+        return res
+
 
 class GriewankFunction(MultiModalFunction):
     def f(self, x):
@@ -81,6 +109,9 @@ class GriewankFunction(MultiModalFunction):
         for i, xi in enumerate(x):
             prod *= cos(xi / sqrt(i + 1))
         return 1 + sum(x ** 2) / 4000. - prod
+
+    def f_batch(self, X):
+        return 1 + (X ** 2).sum(axis=1) / 4000. - prod(cos(X / sqrt(arange(1, X.shape[1] + 1))), axis=1)
     
 class BucheRastriginFunction(MultiModalFunction):
     """ Deceptive and highly multi-modal."""
@@ -93,6 +124,11 @@ class BucheRastriginFunction(MultiModalFunction):
                 e += 1
             z[i] *= power(10, e)
         return dot(z,z) + 10 * self.xdim - 10*sum(cos(2*pi*z))
+
+    def f_batch(self, X):
+        e = arange(self.xdim)/(self.xdim-1.)/2. + ((X <= 0) | (arange(self.xdim)%2==0))
+        Z = X * power(10, e)
+        return (Z * Z).sum(axis=1) + 10 * self.xdim - 10*cos(2*pi*Z).sum(axis=1)
     
 class GriewankRosenbrockFunction(MultiModalFunction):
     """ Composite between the two. """
@@ -100,6 +136,10 @@ class GriewankRosenbrockFunction(MultiModalFunction):
     def f(self, x):
         s = 100 * (x[:-1] ** 2 - x[1:]) ** 2 + (x[:-1] - 1) ** 2
         return 1/(self.xdim-1.) * sum(s / 4000. - cos(s)) +1
+
+    def f_batch(self, X):
+        s = 100 * (X[:, :-1] ** 2 - X[:, 1:]) ** 2 + (X[:, :-1] - 1) ** 2
+        return 1/(self.xdim-1.) * (s / 4000. - cos(s)).sum(axis=1) +1
     
 
 
@@ -117,6 +157,11 @@ class Schwefel_2_13Function(MultiModalFunction):
             Bix = sum(self.A[i] * sin(x) + self.B[i] * cos(x))
             res += (Ai - Bix) ** 2
         return res
+
+    def f_batch(self, X):
+        A = (self.A * sin(self.alphas) + self.B * cos(self.alphas)).sum(axis=1)
+        BX = dot(sin(X), self.A.T) + dot(cos(X), self.B.T)
+        return ((A - BX) ** 2).sum(axis=1)
     
 class Schwefel20Function(MultiModalFunction):
     """ f20 in BBOB. """
@@ -137,6 +182,13 @@ class Schwefel20Function(MultiModalFunction):
         z[1:] += (z[:-1]-self.xopt[:-1]) * 0.25
         z = 100 * (dot(self._diags, (z-self.xopt)) + self.xopt)
         return - 1. / float(self.xdim) * sum(z * sin(sqrt(abs(z)))) + self._k + 100 * penalize(z / 100.)
+
+    def f_batch(self, X):
+        Z = 2 * X * self._signs
+        Z[:, 1:] += (Z[:, :-1] - self.xopt[:-1]) * 0.25
+        Z = 100 * (dot(Z - self.xopt, self._diags.T) + self.xopt)
+        return (- 1. / float(self.xdim) * (Z * sin(sqrt(abs(Z)))).sum(axis=1)
+                + self._k + 100 * penalize(Z / 100.))
         
     
 class GallagherGauss101MeFunction(MultiModalFunction):
@@ -148,7 +200,6 @@ class GallagherGauss101MeFunction(MultiModalFunction):
 
     def __init__(self, *args, **kwargs):
         MultiModalFunction.__init__(self, *args, **kwargs)
-        print((self.numPeaks, self.xdim))
         self._opts = [(rand(self.xdim) - 0.5) * 8]
         self._opts.extend([(rand(self.xdim) - 0.5) * 9.8 for _ in range(self.numPeaks-1)])
         alphas = [power(self.maxCond, 2 * i / float(self.numPeaks - 2)) for i in range(self.numPeaks - 1)]
@@ -163,6 +214,13 @@ class GallagherGauss101MeFunction(MultiModalFunction):
         return (10 - max([self._ws[i] * exp(-1 / (2. * self.xdim) * dot(rxy[i], dot(self._covs[i], rxy[i]))) 
                           for i in range(self.numPeaks)])) ** 2
 
+    def f_batch(self, X):
+        peaks = []
+        for i in range(self.numPeaks):
+            RXY = dot(X - self._opts[i], self._R.T)
+            peaks.append(self._ws[i] * exp(-1 / (2. * self.xdim) * (RXY * dot(RXY, self._covs[i].T)).sum(axis=1)))
+        return (10 - array(peaks).max(axis=0)) ** 2
+
 
 class GallagherGauss21HiFunction(GallagherGauss101MeFunction):
     """ 21 random local optima (high peaks). """
@@ -179,6 +237,12 @@ class KatsuuraFunction(MultiModalFunction):
                                                     for j in range(1, 33)]),
                                  10. / power(self.xdim, 1.2)) 
                           for i in range(self.xdim)])
+
+    def f_batch(self, X):
+        powers = 2. ** arange(1, 33)
+        T = X[:, :, None] * powers
+        S = (abs(T - trunc(T)) / powers).sum(axis=2)
+        return - 1 + prod(power(1 + arange(1, self.xdim + 1) * S, 10. / power(self.xdim, 1.2)), axis=1)
     
 class LunacekBiRastriginFunction(MultiModalFunction):
     """ A deceptive double-funnel structure with many local optima. 
@@ -201,6 +265,13 @@ class LunacekBiRastriginFunction(MultiModalFunction):
                     self.xdim + self._s * dot(x_ - self._mu1, x_ - self._mu1)) 
                 + 10 * (self.xdim - sum(cos(2 * pi * z))))
 
+    def f_batch(self, X):
+        X_ = X * self._signs * 2
+        Z = dot(dot(dot(X_ - self._mu0, self._R2.T), self._diags.T), self._R1.T)
+        return (minimum(((X_ - self._mu0) ** 2).sum(axis=1),
+                        self.xdim + self._s * ((X_ - self._mu1) ** 2).sum(axis=1))
+                + 10 * (self.xdim - cos(2 * pi * Z).sum(axis=1)))
+
          
         
 
@@ -223,3 +294,7 @@ class BraninFunction(MultiModalFunction):
     def f(self, x):
         return self._a * (x[1] - self._b * x[0] ** 2 + self._c * x[0] - self._d) ** 2 + self._e * ((1 - self._f) * cos(x[0]) + 1) - self.vopt
 
+    def f_batch(self, X):
+        return self.f(X.T)
+
+
@@ -1,7 +1,8 @@
 __author__ = 'Tom Schaul, tom@idsia.ch'
 
 
-from scipy import rand, dot, power, diag, eye, sqrt, sin, log, exp, ravel, clip, arange
+from scipy import rand, dot, power, diag, eye, sqrt, sin, log, exp, ravel, clip, arange, \
+    array, asarray, maximum
 from scipy.linalg import orth, norm, inv
 from random import shuffle, random, gauss
 
@@ -25,6 +26,8 @@ def oppositeFunction(basef):
         else:
             res = FitnessEvaluator()        
         res.f = lambda x:-basef.f(x)
+        if hasattr(basef, 'f_batch'):
+            res.f_batch = lambda X:-basef.f_batch(X)
         if not basef.desiredValue is None:
             res.desiredValue = -basef.desiredValue
         res.toBeMinimized = not basef.toBeMinimized
@@ -52,6 +55,7 @@ class TranslateFunction(FunctionEnvironment):
                 x = x.params
             return basef.f(x - self._offset)
         self.f = tf
+        self.f_batch = lambda X: basef.f_batch(X - self._offset)
     
 
 class RotateFunction(FunctionEnvironment):
@@ -74,9 +78,15 @@ class RotateFunction(FunctionEnvironment):
                 x = x.params
             return basef.f(dot(x, self._M))    
         self.f = rf
+        self.f_batch = lambda X: basef.f_batch(dot(X, self._M))
         
 
 def penalize(x, distance=5):
+    """ Squared distance of x to the box [-distance, distance]^n, or of
+    each of its rows if x is a matrix. """
+    if x.ndim == 2:
+        tmp = maximum(abs(x) - distance, 0)
+        return (tmp * tmp).sum(axis=1)
     ax = abs(x)
     tmp = clip(ax-distance, 0, ax.max())
     return dot(tmp, tmp)
@@ -95,6 +105,7 @@ class SoftConstrainedFunction(FunctionEnvironment):
         if basef.penalized:
             # already OK
             self.f = basef.f
+            self.f_batch = basef.f_batch
         else:
             if not self.toBeMinimized:
                 penalizationFactor *= -1
@@ -105,6 +116,7 @@ class SoftConstrainedFunction(FunctionEnvironment):
                 return basef.f(x) + penalize(x, distance) * penalizationFactor
             
             self.f = scf
+            self.f_batch = lambda X: basef.f_batch(X) + penalize(X, distance) * penalizationFactor
     
     
 def generateDiags(alpha, dim, shuffled=False):    
@@ -228,11 +240,42 @@ class BBOBTransformationFunction(FunctionEnvironment):
                             
         self.f = lambda x: (noisetrans(basef.f(tmp4(x))) 
                             + penalized * penalize(x))
+
+        # the same transformations, on all the rows of a matrix at once
+        if rotate:
+            if sparse:
+                btmp1 = lambda X: asarray(X * r)
+            else:
+                btmp1 = tmp1
+        else:
+            btmp1 = tmp1
+        if oscillate:
+            btmp2 = lambda X: BBOBTransformationFunction.oscillatify(btmp1(X))
+        else:
+            btmp2 = btmp1
+        if asymmetry is not None:
+            btmp3 = lambda X: BBOBTransformationFunction.asymmetrify(btmp2(X), asymmetry)
+        else:
+            btmp3 = btmp2
+        if sparse:
+            if prefix is None:
+                btmp4 = lambda X: btmp3(X - self.xopt)
+            else:
+                btmp4 = lambda X: asarray(btmp3(X - self.xopt) * prefix.T)
+        else:
+            btmp4 = lambda X: dot(btmp3(X - self.xopt), prefix.T)
+        if ntmp is None:
+            bnoisetrans = lambda F: F
+        else:
+            bnoisetrans = lambda F: array([noisetrans(f) for f in F])
+
+        self.f_batch = lambda X: (bnoisetrans(basef.f_batch(btmp4(X)))
+                                  + penalized * penalize(X))
         
 
     @staticmethod
     def asymmetrify(x, beta=0.2):
-        dim = len(x)
+        dim = x.shape[-1]
         return x * (x<=0) + (x>0) * exp((1+beta*arange(dim)/(dim-1.)*sqrt(abs(x))) * log(abs(x)+1e-100))
         #res = x.copy()
         #for i, xi in enumerate(x):
@@ -4,6 +4,8 @@ __author__ = 'Tom Schaul, tom@idsia.ch'
 
 from math import sqrt
 
+from scipy import sqrt as vsqrt
+
 from pybrain.rl.environments.functions.function import FunctionEnvironment
 
 
@@ -17,13 +19,22 @@ class LinearFunction(UnboundedFunctionEnvironment):
     def f(self, x):
         return sum(x)
 
+    def f_batch(self, X):
+        return X.sum(axis=1)
+
 
 class ParabRFunction(UnboundedFunctionEnvironment):
     def f(self, x):
         return -x[0] + 100 * sum(x[1:]**2)
 
+    def f_batch(self, X):
+        return -X[:, 0] + 100 * (X[:, 1:]**2).sum(axis=1)
+
 
 class SharpRFunction(UnboundedFunctionEnvironment):
     def f(self, x):
         return -x[0] + 100*sqrt(sum(x[1:]**2))
 
+    def f_batch(self, X):
+        return -X[:, 0] + 100*vsqrt((X[:, 1:]**2).sum(axis=1))
+
@@ -2,7 +2,7 @@
 
 __author__ = 'Tom Schaul, tom@idsia.ch'
 
-from scipy import ones, sqrt, dot, sign, randn, power, rand, floor, array
+from scipy import ones, sqrt, dot, sign, randn, power, rand, floor, array, cumsum, maximum, where
 from scipy.linalg import norm, orth
 
 from pybrain.rl.environments.functions.function import FunctionEnvironment
@@ -13,6 +13,9 @@ class SphereFunction(FunctionEnvironment):
     def f(self, x):
         return dot(x,x)
 
+    def f_batch(self, X):
+        return (X * X).sum(axis=1)
+
 
 class SchwefelFunction(FunctionEnvironment):
     def f(self, x):
@@ -21,6 +24,9 @@ class SchwefelFunction(FunctionEnvironment):
             s += sum(x[:i])**2
         return s
 
+    def f_batch(self, X):
+        return (cumsum(X[:, :-1], axis=1) ** 2).sum(axis=1)
+
 
 class CigarFunction(FunctionEnvironment):
     """ Bent Cigar function """
@@ -29,6 +35,9 @@ class CigarFunction(FunctionEnvironment):
     def f(self, x):
         return x[0]**2 + 1e6*dot(x[1:],x[1:])
 
+    def f_batch(self, X):
+        return X[:, 0]**2 + 1e6*(X[:, 1:]**2).sum(axis=1)
+
 
 class TabletFunction(FunctionEnvironment):
     """ Also known as discus function."""
@@ -37,6 +46,9 @@ class TabletFunction(FunctionEnvironment):
     def f(self, x):
         return 1e6*x[0]**2 + dot(x[1:],x[1:])
 
+    def f_batch(self, X):
+        return 1e6*X[:, 0]**2 + (X[:, 1:]**2).sum(axis=1)
+
 
 class ElliFunction(FunctionEnvironment):
     """ Ellipsoid. """
@@ -50,6 +62,9 @@ class ElliFunction(FunctionEnvironment):
     def f(self, x):
         return dot(self._as*x, x)
 
+    def f_batch(self, X):
+        return (self._as*X*X).sum(axis=1)
+
 class StepElliFunction(ElliFunction):
     """ Plateaus make for a zero derivative """
     
@@ -64,6 +79,11 @@ class StepElliFunction(ElliFunction):
         z = floor(0.5 + x) * (x>0.5) + floor(0.5 + 10*x)/10. * (x<=0.5)
         z = dot(self._R, z)         
         return 0.1 * max(1e-4 * abs(z[0]), ElliFunction.f(self, z))
+
+    def f_batch(self, X):
+        Z = floor(0.5 + X) * (X>0.5) + floor(0.5 + 10*X)/10. * (X<=0.5)
+        Z = dot(Z, self._R.T)
+        return 0.1 * maximum(1e-4 * abs(Z[:, 0]), ElliFunction.f_batch(self, Z))
     
     
     
@@ -79,6 +99,12 @@ class AttractiveSectorFunction(FunctionEnvironment):
         quad = (x*self.xopt > 0)
         sz = 100 * x * quad + x * (quad==False)         
         return power(BBOBTransformationFunction.oscillatify(dot(sz, sz)), 0.9)
+
+    def f_batch(self, X):
+        from .transformations import BBOBTransformationFunction
+        quad = (X*self.xopt > 0)
+        SZ = 100 * X * quad + X * (quad==False)
+        return power(BBOBTransformationFunction.oscillatify((SZ * SZ).sum(axis=1)), 0.9)
         
         
 
@@ -86,6 +112,9 @@ class SharpRFunctionBis(FunctionEnvironment):
     """ Bounded version of the Sharp ridge function. """
     def f(self, x):
         return x[0]**2 + 100*sqrt(dot(x[1:],x[1:]))
+
+    def f_batch(self, X):
+        return X[:, 0]**2 + 100*sqrt((X[:, 1:]**2).sum(axis=1))
     
 
 class DiffPowFunction(FunctionEnvironment):
@@ -101,6 +130,11 @@ class DiffPowFunction(FunctionEnvironment):
             s += abs(x[i])**(2+self.a*i/(len(x)-1))
         return s
 
+    def f_batch(self, X):
+        n = X.shape[1]
+        exponents = array([2+self.a*i/(n-1) for i in range(n)])
+        return (abs(X)**exponents).sum(axis=1)
+
 
 class RosenbrockFunction(FunctionEnvironment):
     """ Banana-shaped function with a tricky optimum in the valley at 1,1.
@@ -116,6 +150,9 @@ class RosenbrockFunction(FunctionEnvironment):
 
     def f(self, x):
         return sum(100*(x[:-1]**2-x[1:])**2 + (x[:-1]-1)**2)
+
+    def f_batch(self, X):
+        return (100*(X[:, :-1]**2-X[:, 1:])**2 + (X[:, :-1]-1)**2).sum(axis=1)
         
         
 class GlasmachersFunction(FunctionEnvironment):
@@ -128,6 +165,12 @@ class GlasmachersFunction(FunctionEnvironment):
         a = self.c * norm(x[:m])
         b = norm(x[m:])
         return a + b + sqrt(2*a*b+b**2)
+
+    def f_batch(self, X):
+        m = self.xdim//2
+        a = self.c * sqrt((X[:, :m]**2).sum(axis=1))
+        b = sqrt((X[:, m:]**2).sum(axis=1))
+        return a + b + sqrt(2*a*b+b**2)
     
     
 class BoundedLinear(FunctionEnvironment):
@@ -145,5 +188,9 @@ class BoundedLinear(FunctionEnvironment):
             if xi*self._signs[i] > 5:
                 x_[i] = self._signs[i]*5
         return 5*sum(self._w) - dot(self._w*self._signs, x_) 
+
+    def f_batch(self, X):
+        X_ = where(X*self._signs > 5, self._signs*5, X)
+        return 5*sum(self._w) - dot(X_, self._w*self._signs)
         
         
@@ -0,0 +1,116 @@
+""" Evaluating modules on an episodic task with a pool of processes, e.g.
+
+    evaluator = ParallelEpisodicEvaluator(BalanceTask, net, batchSize=8)
+    CMAES(evaluator, net).learn()
+
+The evaluator can also take the place of the task for an OptimizationAgent:
+
+    EpisodicExperiment(evaluator, OptimizationAgent(net, CMAES())).doEpisodes(100)
+"""
+
+import random
+from multiprocessing import Pool, cpu_count
+from numpy import random as nprandom
+from scipy import array
+
+from pybrain.utilities import setAllArgs
+from pybrain.rl.environments.fitnessevaluator import FitnessEvaluator
+from pybrain.structure.parametercontainer import ParameterContainer
+
+
+def _seededEpisode(task, module, params, seed):
+    """ The total reward of one episode of the task, with the given parameters
+    of the module, and the random generators seeded with the seed. """
+    random.seed(seed)
+    nprandom.seed(seed)
+    module._setParameters(params)
+    return task._moduleEpisode(module)
+
+
+# The task and the module of a worker process.
+_task = None
+_module = None
+
+
+def _initWorker(taskFactory, module):
+    global _task, _module
+    _task = taskFactory()
+    _module = module
+
+
+def _workerEpisode(job):
+    return _seededEpisode(_task, _module, *job)
+
+
+class ParallelEpisodicEvaluator(FitnessEvaluator):
+    """ Evaluates a module by its average total reward over `batchSize`
+    episodes of an episodic task (like EpisodicTask.f), for many sets of
+    parameters at once with f_batch(). All the episodes are distributed over
+    `processes` worker processes (or done here, if it is 1).
+
+    Every worker builds its own task once, by calling `taskFactory` (e.g. the
+    class of the task, or a functools.partial of it), and gets a copy of the
+    module when it starts; after that, only the parameters are sent.
+
+    Each episode starts with the random generators seeded with the next of
+    the consecutive seeds from `seed` on, so that the results do not depend
+    on the number of processes, or on which of them does which episode. """
+
+    batchSize = 1
+    processes = None
+    seed = 0
+
+    def __init__(self, taskFactory, module, **kwargs):
+        setAllArgs(self, kwargs)
+        if self.processes is None:
+            self.processes = cpu_count()
+        self.taskFactory = taskFactory
+        self.module = module.copy()
+        self.numEpisodes = 0
+        self._pool = None
+        self._task = None
+
+    def f(self, x):
+        """ The average total reward of the module (or with the parameters) x. """
+        if isinstance(x, ParameterContainer):
+            x = x.params
+        return self.f_batch([x])[0]
+
+    def f_batch(self, X):
+        """ The average total rewards with the parameters in the rows of X. """
+        jobs = []
+        for x in X:
+            for _ in range(self.batchSize):
+                jobs.append((x, self.seed + self.numEpisodes))
+                self.numEpisodes += 1
+        rewards = array(self._map(jobs), dtype=float).reshape(len(X), self.batchSize)
+        return rewards.mean(axis=1)
+
+    def _map(self, jobs):
+        if self.processes == 1:
+            if self._task is None:
+                self._task = self.taskFactory()
+            # keep the random generators of this process as they were
+            states = random.getstate(), nprandom.get_state()
+            try:
+                return [_seededEpisode(self._task, self.module, *job) for job in jobs]
+            finally:
+                random.setstate(states[0])
+                nprandom.set_state(states[1])
+        if self._pool is None:
+            self._pool = Pool(self.processes, _initWorker, (self.taskFactory, self.module))
+        chunksize = max(1, len(jobs) // (4 * self.processes))
+        return self._pool.map(_workerEpisode, jobs, chunksize=chunksize)
+
+    def close(self):
+        """ Stop the worker processes. """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_task'] = None
+        return state
@@ -1,3 +1,4 @@
 from pybrain.rl.experiments.experiment import Experiment
 from pybrain.rl.experiments.episodic import EpisodicExperiment
-from pybrain.rl.experiments.continuous import ContinuousExperiment
\ No newline at end of file
+from pybrain.rl.experiments.continuous import ContinuousExperiment
+from pybrain.rl.experiments.vectorized import VectorizedEpisodicExperiment
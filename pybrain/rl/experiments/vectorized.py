@@ -0,0 +1,68 @@
+from scipy import array
+
+from pybrain.rl.experiments.experiment import Experiment
+
+
+class VectorizedEpisodicExperiment(Experiment):
+    """ Runs episodes on several copies of an episodic task in lockstep. In every
+    step, the observations of all copies are given to the agent as a batch (one
+    row per copy), so that its module is activated once for all of them. When
+    the episode on a copy is finished, the next one starts right away on it.
+
+    The agent has to implement the batch interface of LoggingAgent
+    (integrateObservations, getActions, giveRewards, finishEpisode), which
+    keeps the transitions of every copy apart, so that each episode becomes one
+    sequence in the history, as with EpisodicExperiment.
+
+    For example, with 16 copies of a task:
+
+        tasks = [BalanceTask() for _ in range(16)]
+        experiment = VectorizedEpisodicExperiment(tasks, LearningAgent(net, ENAC()))
+    """
+
+    def __init__(self, tasks, agent):
+        Experiment.__init__(self, None, agent)
+        self.tasks = list(tasks)
+
+    def _oneInteraction(self):
+        raise Exception('On several copies of a task, only full episodes can be done.')
+
+    def doEpisodes(self, number = 1):
+        """ Do `number` episodes, spread over the copies of the task, and return
+        the rewards of each step of each episode as a list, in the order in which
+        the episodes were started. """
+        all_rewards = []
+        # the copies of the task in use, and the index of their current episodes
+        running = {}
+        for index, task in enumerate(self.tasks[:number]):
+            running[index] = self._startEpisode(task, all_rewards)
+
+        while True:
+            for i in sorted(running):
+                while i in running and self.tasks[i].isFinished():
+                    self.agent.finishEpisode(i)
+                    if len(all_rewards) < number:
+                        running[i] = self._startEpisode(self.tasks[i], all_rewards)
+                    else:
+                        del running[i]
+            if not running:
+                break
+
+            indices = sorted(running)
+            self.agent.integrateObservations(
+                array([self.tasks[i].getObservation() for i in indices]), indices)
+            actions = self.agent.getActions()
+            rewards = []
+            for i, action in zip(indices, actions):
+                self.tasks[i].performAction(action)
+                rewards.append(self.tasks[i].getReward())
+                all_rewards[running[i]].append(rewards[-1])
+            self.agent.giveRewards(rewards)
+            self.stepid += 1
+
+        return all_rewards
+
+    def _startEpisode(self, task, all_rewards):
+        task.reset()
+        all_rewards.append([])
+        return len(all_rewards) - 1
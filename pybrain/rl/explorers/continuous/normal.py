@@ -2,6 +2,7 @@ __author__ = "Thomas Rueckstiess, ruecksti@in.tum.de"
 
 from scipy import random
 
+from pybrain.structure.modules.module import Module
 from pybrain.rl.explorers.explorer import Explorer
 from pybrain.tools.functions import expln, explnPrime
 from pybrain.structure.parametercontainer import ParameterContainer
@@ -37,9 +38,15 @@ class NormalExplorer(Explorer, ParameterContainer):
 
     sigma = property(_getSigma, _setSigma)
 
+    def activateBatch(self, states, actions):
+        return Module.activateBatch(self, actions)
+
     def _forwardImplementation(self, inbuf, outbuf):
         outbuf[:] = random.normal(inbuf, expln(self.sigma))
 
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf[:] = random.normal(inbuf, expln(self.sigma))
+
     def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
         expln_sigma = expln(self.sigma)
         self._derivs += ((outbuf - inbuf) ** 2 - expln_sigma ** 2) / expln_sigma * explnPrime(self.sigma)
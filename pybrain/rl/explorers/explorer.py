@@ -1,6 +1,8 @@
 __author__ = "Thomas Rueckstiess, ruecksti@in.tum.de"
 
 
+from scipy import array
+
 from pybrain.structure.modules.module import Module
 
 
@@ -39,6 +41,14 @@ class Explorer(Module):
         """
         return Module.activate(self, action)
 
+    def activateBatch(self, states, actions):
+        """ Like activate(), on the rows of `states` and `actions`. By default,
+            one by one; explorers that ignore the state can do it at once with
+            Module.activateBatch().
+        """
+        return array([self.activate(state, action)
+                      for state, action in zip(states, actions)])
+
 
     def newEpisode(self):
         """ Inform the explorer about the start of a new episode. """
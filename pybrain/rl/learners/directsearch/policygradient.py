@@ -1,5 +1,7 @@
 __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 
+from scipy import array
+
 from pybrain.rl.learners.directsearch.directsearch import DirectSearchLearner
 from pybrain.rl.learners.learner import DataSetLearner, ExploringLearner
 from pybrain.utilities import abstractMethod
@@ -39,6 +41,9 @@ class PolicyGradientLearner(DirectSearchLearner, DataSetLearner, ExploringLearne
         # network to tie module and explorer together
         self.network = None
 
+        # loglh of the unfinished episodes of a batch, per copy of the task
+        self._pendingLoglh = {}
+
 
     def _setLearningRate(self, alpha):
         """ pass the alpha value through to the gradient descent object """
@@ -117,18 +122,42 @@ class PolicyGradientLearner(DirectSearchLearner, DataSetLearner, ExploringLearne
         self.network._setParameters(p)
         self.network.reset()
 
-    def explore(self, state, action):
+    def _explore(self, state, action):
+        """ Return the explorative action and the derivatives of its log
+            likelihood. The module has to be activated on the state before. """
         # forward pass of exploration
         explorative = ExploringLearner.explore(self, state, action)
 
-        # backward pass through network and store derivs
+        # backward pass through network, for the derivatives of this sample alone
+        self.network.resetDerivatives()
         self.network.backward()
-        self.loglh.appendLinked(self.network.derivs.copy())
+        return explorative, self.network.derivs.copy()
 
+    def explore(self, state, action):
+        explorative, loglh = self._explore(state, action)
+        self.loglh.appendLinked(loglh)
         return explorative
 
+    def exploreBatch(self, states, actions, indices):
+        """ The derivatives of the log likelihoods are kept per copy of the task,
+            until its episode is over, so that they stay aligned with the history. """
+        explorative = []
+        for state, action, index in zip(states, actions, indices):
+            # the backward pass needs the buffers of the module for this state
+            self.module.activate(state)
+            e, loglh = self._explore(state, action)
+            self._pendingLoglh.setdefault(index, []).append(loglh)
+            explorative.append(e)
+        return array(explorative)
+
+    def finishEpisode(self, index):
+        loglhs = self._pendingLoglh.pop(index, [])
+        if loglhs:
+            self.loglh.extendLinked(loglhs)
+
     def reset(self):
         self.loglh.clear()
+        self._pendingLoglh = {}
 
     def calculateGradient(self):
         abstractMethod()
@@ -35,6 +35,19 @@ class ExploringLearner(Learner):
             # logging.warning("No explorer found: no exploration could be done.")
             return action
 
+    def exploreBatch(self, states, actions, indices):
+        """ Explore on a batch: the rows of `states` and `actions` come from the
+        copies of a task identified by `indices`. Return the explorative actions
+        as the rows of a 2d array. """
+        if self.explorer is not None:
+            return self.explorer.activateBatch(states, actions)
+        else:
+            return actions
+
+    def finishEpisode(self, index):
+        """ Informs the learner that the episode on the copy `index` of the task
+        (as given to exploreBatch) is over. """
+
 
 class EpisodicLearner(Learner):
     """ Assumes the task is episodic, not life-long,
@@ -19,6 +19,20 @@ class NFQ(ValueBasedLearner):
         # convert reinforcement dataset to NFQ supervised dataset
         supervised = SupervisedDataSet(self.module.network.indim, 1)
 
+        if self._replaying():
+            self._addReplayedSamples(supervised)
+        else:
+            self._addSequenceSamples(supervised)
+
+        # train module with backprop/rprop on dataset
+        trainer = RPropMinusTrainer(self.module.network, dataset=supervised, batchlearning=True, verbose=False)
+        trainer.trainUntilConvergence(maxEpochs=self.maxEpochs)
+
+        # alternative: backprop, was not as stable as rprop
+        # trainer = BackpropTrainer(self.module.network, dataset=supervised, learningrate=0.005, batchlearning=True, verbose=True)
+        # trainer.trainUntilConvergence(maxEpochs=self.maxEpochs)
+
+    def _addSequenceSamples(self, supervised):
         for seq in self.dataset:
             lastexperience = None
             for state, action, reward in seq:
@@ -39,13 +53,12 @@ class NFQ(ValueBasedLearner):
                 # update last experience with current one
                 lastexperience = (state, action, reward)
 
-        # train module with backprop/rprop on dataset
-        trainer = RPropMinusTrainer(self.module.network, dataset=supervised, batchlearning=True, verbose=False)
-        trainer.trainUntilConvergence(maxEpochs=self.maxEpochs)
-
-        # alternative: backprop, was not as stable as rprop
-        # trainer = BackpropTrainer(self.module.network, dataset=supervised, learningrate=0.005, batchlearning=True, verbose=True)
-        # trainer.trainUntilConvergence(maxEpochs=self.maxEpochs)
-
-
-
+    def _addReplayedSamples(self, supervised):
+        """ Fit on all transitions in the ReplayMemory, which is bounded. """
+        for state, action, reward, nextstate, _, terminal in zip(*self.dataset.transitions()):
+            Q = self.module.getValue(state, action[0])
+            inp = r_[state, one_to_n(action[0], self.module.numActions)]
+            target = reward
+            if not terminal:
+                target += self.gamma * max(self.module.getActionValues(nextstate))
+            supervised.addSample(inp, Q + 0.5*(target - Q))
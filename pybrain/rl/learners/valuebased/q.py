@@ -1,6 +1,7 @@
 __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 
 from pybrain.rl.learners.valuebased.valuebased import ValueBasedLearner
+from pybrain.rl.learners.valuebased.tabular import datasetTransitions, tdUpdates
 
 
 class Q(ValueBasedLearner):
@@ -28,37 +29,26 @@ class Q(ValueBasedLearner):
             False, only the last data sample is considered. The user himself
             has to make sure to keep the dataset consistent with the agent's
             history.
+
+            If the dataset is a ReplayMemory, a minibatch of transitions is
+            drawn from it instead, and the updates are weighted by their
+            importance-sampling weights.
         """
+        if self._replaying():
+            self._learnOnReplay()
+            return
+
         if self.batchMode:
-            samples = self.dataset
+            states, actions, rewards, nextstates, nextactions = datasetTransitions(self.dataset)
+            tdUpdates(self.module, states, actions, rewards, nextstates, nextactions,
+                      self.alpha, self.gamma)
         else:
-            samples = [[self.dataset.getSample()]]
-
-        for seq in samples:
-            # information from the previous episode (sequence)
-            # should not influence the training on this episode
-            self.laststate = None
-            self.lastaction = None
-            self.lastreward = None
-
-            for state, action, reward in seq:
-
-                state = int(state)
-                action = int(action)
-
-                # first learning call has no last state: skip
-                if self.laststate == None:
-                    self.lastaction = action
-                    self.laststate = state
-                    self.lastreward = reward
-                    continue
-
-                qvalue = self.module.getValue(self.laststate, self.lastaction)
-                maxnext = self.module.getValue(state, self.module.getMaxAction(state))
-                self.module.updateValue(self.laststate, self.lastaction, qvalue + self.alpha * (self.lastreward + self.gamma * maxnext - qvalue))
-
-                # move state to oldstate
-                self.laststate = state
-                self.lastaction = action
-                self.lastreward = reward
-
+            # a single sample is no transition yet: nothing to learn from
+            self.dataset.getSample()
+
+    def _learnOnReplay(self):
+        (states, actions, rewards, nextstates, nextactions, terminals), indices, weights = self._sampleReplay()
+        tderrors = tdUpdates(self.module, states[:, 0].astype(int), actions[:, 0].astype(int), rewards,
+                             nextstates[:, 0].astype(int), nextactions[:, 0].astype(int),
+                             self.alpha * weights, self.gamma, terminals=terminals)
+        self._updatePriorities(indices, tderrors)
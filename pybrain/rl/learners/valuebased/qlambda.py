@@ -1,6 +1,9 @@
 __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 
+from scipy import flatnonzero
+
 from pybrain.rl.learners.valuebased.valuebased import ValueBasedLearner
+from pybrain.rl.learners.valuebased.tabular import tdUpdates
 
 
 class QLambda(ValueBasedLearner):
@@ -21,22 +24,44 @@ class QLambda(ValueBasedLearner):
 
 
     def learn(self):
-        states = self.dataset['state']
-        actions = self.dataset['action']
-        rewards = self.dataset['reward']
+        if self._replaying():
+            self._learnOnReplay()
+            return
+
+        # the samples along the eligibility trace, newest first
+        steps = self._traceSteps(len(self.dataset) - 1)
+        if not steps:
+            return
+        first = len(self.dataset) - 1 - len(steps)
+        states = self.dataset['state'][first:, 0].astype(int)[::-1]
+        actions = self.dataset['action'][first:, 0].astype(int)[::-1]
+        # the rewards are truncated to ints
+        rewards = self.dataset['reward'][first:, 0].astype(int)[::-1]
 
-        for i in range(states.shape[0] - 1, 0, -1):
-            lbda = self.qlambda ** (states.shape[0] - 1 - i)
+        tdUpdates(self.module, states[1:], actions[1:], rewards[1:], states[:-1], actions[:-1],
+                  steps, self.gamma)
+
+    def _traceSteps(self, length):
+        """ The step sizes of at most `length` updates along the trace. """
+        steps = []
+        for k in range(length):
+            lbda = self.qlambda ** k
             # if eligibility trace gets too long, break
             if lbda < 0.0001:
                 break
+            steps.append(self.alpha * lbda)
+        return steps
 
-            state = int(states[i])
-            laststate = int(states[i - 1])
-            # action = int(actions[i])
-            lastaction = int(actions[i - 1])
-            lastreward = int(rewards[i - 1])
-
-            qvalue = self.module.getValue(laststate, lastaction)
-            maxnext = self.module.getValue(state, self.module.getMaxAction(state))
-            self.module.updateValue(laststate, lastaction, qvalue + self.alpha * lbda * (lastreward + self.gamma * maxnext - qvalue))
+    def _learnOnReplay(self):
+        """ Go back along the trace through the newest transitions in the
+        ReplayMemory, up to the end of the previous episode. """
+        states, actions, rewards, nextstates, nextactions, terminals = self.dataset.recent(self.replayBatchSize)
+        length = len(rewards)
+        ends = flatnonzero(terminals[1:])
+        if len(ends) > 0:
+            length = ends[0] + 1
+        steps = self._traceSteps(length)
+        k = len(steps)
+        tdUpdates(self.module, states[:k, 0].astype(int), actions[:k, 0].astype(int), rewards[:k],
+                  nextstates[:k, 0].astype(int), nextactions[:k, 0].astype(int),
+                  steps, self.gamma, terminals=terminals[:k])
@@ -0,0 +1,101 @@
+""" Batch TD updates on an ActionValueTable, with NumPy operations over index
+arrays instead of one call to getValue/updateValue per sample.
+
+The updates are applied in exactly the same order as one by one: they are
+cut into blocks of consecutive updates that do not depend on each other (no
+update reads or writes a value that an earlier one in the block writes), and
+each block is applied at once. """
+
+from scipy import arange, asarray, ones, zeros, where, maximum, searchsorted, flatnonzero
+
+
+#: Blocks shorter than this are applied one update at a time, which is faster
+#: for them than the array operations.
+minBlockLength = 8
+
+
+def datasetTransitions(dataset):
+    """ The transitions between consecutive samples of the same sequence in a
+    ReinforcementDataSet, in the order of the dataset, as arrays of states,
+    actions, rewards, next states and next actions (the states and actions
+    as ints). """
+    n = len(dataset)
+    states = dataset['state'][:n, 0].astype(int)
+    actions = dataset['action'][:n, 0].astype(int)
+    rewards = dataset['reward'][:n, 0]
+    starts = dataset._sequenceStarts()
+    linked = ones(n, dtype=bool)
+    linked[starts[starts < n]] = False
+    last = flatnonzero(linked[1:])
+    return states[last], actions[last], rewards[last], states[last + 1], actions[last + 1]
+
+
+def _lastEarlier(writes, reads):
+    """ For every k, the largest j < k with writes[j] == reads[k], or -1. """
+    n = len(writes)
+    keys = writes.astype('int64') * n + arange(n)
+    keys.sort()
+    positions = searchsorted(keys, reads.astype('int64') * n + arange(n)) - 1
+    found = keys[maximum(positions, 0)]
+    return where((positions >= 0) & (found // n == reads), found % n, -1)
+
+
+def _blockStarts(states, actions, nextstates, nextactions, numActions, greedy):
+    """ The starts of the blocks of independent consecutive updates. """
+    cells = states * numActions + actions
+    dependencies = _lastEarlier(cells, cells)
+    if greedy:
+        # the maximum reads the whole row of the next state
+        dependencies = maximum(dependencies, _lastEarlier(states, nextstates))
+    else:
+        dependencies = maximum(dependencies, _lastEarlier(cells, nextstates * numActions + nextactions))
+    starts = [0]
+    for k, dependency in enumerate(dependencies.tolist()):
+        if dependency >= starts[-1]:
+            starts.append(k)
+    return starts
+
+
+def tdUpdates(table, states, actions, rewards, nextstates, nextactions, steps, gamma,
+              greedy=True, terminals=None):
+    """ Apply the updates Q(s, a) += step * (r + gamma * Q(s', a') - Q(s, a)) to
+    the ActionValueTable, one after the other, where Q(s', a') is the maximum
+    over the actions in s' if `greedy` (Q-learning), and the value of the next
+    action otherwise (SARSA). Terminal transitions have the target r.
+
+    `steps` are the step sizes, one per update or the same for all.
+    Return the TD errors. """
+    values = table.params.reshape(table.numRows, table.numColumns)
+    n = len(states)
+    steps = asarray(steps, dtype=float) * ones(n)
+    if terminals is None:
+        terminals = zeros(n, dtype=bool)
+    tderrors = zeros(n)
+    starts = _blockStarts(states, actions, nextstates, nextactions, table.numColumns, greedy)
+    # Python scalars are faster for the short blocks
+    scalars = [x.tolist() for x in (states, actions, rewards, nextstates, nextactions, steps, terminals)]
+    for start, stop in zip(starts, starts[1:] + [n]):
+        if stop - start < minBlockLength:
+            for k in range(start, stop):
+                state, action, reward, nextstate, nextaction, step, terminal = [x[k] for x in scalars]
+                target = reward
+                if not terminal:
+                    if greedy:
+                        target += gamma * values[nextstate].max()
+                    else:
+                        target += gamma * values.item(nextstate, nextaction)
+                qvalue = values.item(state, action)
+                tderror = target - qvalue
+                values[state, action] = qvalue + step * tderror
+                tderrors[k] = tderror
+        else:
+            block = slice(start, stop)
+            if greedy:
+                nextvalues = values[nextstates[block]].max(axis=1)
+            else:
+                nextvalues = values[nextstates[block], nextactions[block]]
+            targets = where(terminals[block], rewards[block], rewards[block] + gamma * nextvalues)
+            qvalues = values[states[block], actions[block]]
+            tderrors[block] = targets - qvalues
+            values[states[block], actions[block]] = qvalues + steps[block] * tderrors[block]
+    return tderrors
@@ -1,5 +1,8 @@
 __author__ = 'Thomas Rueckstiess, ruecksti@in.tum.de'
 
+from scipy import ones
+
+from pybrain.datasets import ReplayMemory
 from pybrain.rl.learners.learner import ExploringLearner, DataSetLearner, EpisodicLearner
 from pybrain.rl.explorers.discrete.egreedy import EpsilonGreedyExplorer
 
@@ -13,6 +16,14 @@ class ValueBasedLearner(ExploringLearner, DataSetLearner, EpisodicLearner):
     #: Does the algorithm run in batch mode or online?
     batchMode = True
 
+    #: The number of transitions drawn per learning step, if the dataset is a
+    #: ReplayMemory.
+    replayBatchSize = 32
+
+    #: The exponent of the importance-sampling weights, if the ReplayMemory is
+    #: prioritized.
+    replayBeta = 0.4
+
     _module = None
     _explorer = None
 
@@ -44,4 +55,18 @@ class ValueBasedLearner(ExploringLearner, DataSetLearner, EpisodicLearner):
 
     explorer = property(_getExplorer, _setExplorer)
 
+    def _replaying(self):
+        return isinstance(self.dataset, ReplayMemory)
+
+    def _sampleReplay(self):
+        """ Draw a minibatch of transitions from the ReplayMemory, and return
+        them, their indices and their importance-sampling weights (the indices
+        are None, and the weights 1, if the memory is not prioritized). """
+        if self.dataset.prioritized:
+            return self.dataset.samplePrioritized(self.replayBatchSize, self.replayBeta)
+        return self.dataset.sample(self.replayBatchSize), None, ones(self.replayBatchSize)
 
+    def _updatePriorities(self, indices, tderrors):
+        """ Prioritize the replayed transitions by their TD errors. """
+        if indices is not None:
+            self.dataset.updatePriorities(indices, abs(tderrors) + 1e-6)
@@ -92,12 +92,49 @@ class Connection(Named):
             self.inmod.outputerror[inmodOffset, self.inSliceFrom:self.inSliceTo],
             self.inmod.outputbuffer[inmodOffset, self.inSliceFrom:self.inSliceTo])
 
+    def forwardBatch(self, n):
+        """Like .forward(), but for the first `n` rows of the buffers at once,
+        every row being an independent sample."""
+        self.forwardRows(slice(0, n), slice(0, n))
+
+    def backwardBatch(self, n):
+        """Like .backward(), but for the first `n` rows of the buffers at once.
+        The parameter derivatives are summed over the batch."""
+        self.backwardRows(slice(0, n), slice(0, n))
+
+    def forwardRows(self, inrows, outrows):
+        """Like .forwardBatch(), but for the rows given by the slice `inrows`
+        of the inmodule's buffers and `outrows` of the outmodule's buffers."""
+        self._forwardBatchImplementation(
+            self.inmod.outputbuffer[inrows, self.inSliceFrom:self.inSliceTo],
+            self.outmod.inputbuffer[outrows, self.outSliceFrom:self.outSliceTo])
+
+    def backwardRows(self, inrows, outrows):
+        """Like .backwardBatch(), but for the rows given by the slice `inrows`
+        of the inmodule's buffers and `outrows` of the outmodule's buffers."""
+        self._backwardBatchImplementation(
+            self.outmod.inputerror[outrows, self.outSliceFrom:self.outSliceTo],
+            self.inmod.outputerror[inrows, self.inSliceFrom:self.inSliceTo],
+            self.inmod.outputbuffer[inrows, self.inSliceFrom:self.inSliceTo])
+
     def _forwardImplementation(self, inbuf, outbuf):
         abstractMethod()
 
     def _backwardImplementation(self, outerr, inerr, inbuf):
         abstractMethod()
 
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        """Batch version of the forward transformation on 2d buffers. The
+        default processes the rows one by one."""
+        for inrow, outrow in zip(inbuf, outbuf):
+            self._forwardImplementation(inrow, outrow)
+
+    def _backwardBatchImplementation(self, outerr, inerr, inbuf):
+        """Batch version of the backward transformation on 2d buffers. The
+        default processes the rows one by one."""
+        for rows in zip(outerr, inerr, inbuf):
+            self._backwardImplementation(*rows)
+
     def __repr__(self):
         """A simple representation (this should probably be expanded by
         subclasses). """
@@ -23,6 +23,14 @@ class FullConnection(Connection, ParameterContainer):
         ds = self.derivs
         ds += outer(inbuf, outerr).T.flatten()
 
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf += dot(inbuf, reshape(self.params, (self.outdim, self.indim)).T)
+
+    def _backwardBatchImplementation(self, outerr, inerr, inbuf):
+        inerr += dot(outerr, reshape(self.params, (self.outdim, self.indim)))
+        ds = self.derivs
+        ds += dot(outerr.T, inbuf).flatten()
+
     def whichBuffers(self, paramIndex):
         """Return the index of the input module's output buffer and
         the output module's input buffer for the given weight."""
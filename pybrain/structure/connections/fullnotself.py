@@ -27,3 +27,13 @@ class FullNotSelfConnection(FullConnection):
         inerr += dot(p.T, outerr)
         ds = self.derivs
         ds += outer(inbuf, outerr).T.flatten()
+
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        p = reshape(self.params, (self.outdim, self.indim)) * (1-eye(self.outdim))
+        outbuf += dot(inbuf, p.T)
+
+    def _backwardBatchImplementation(self, outerr, inerr, inbuf):
+        p = reshape(self.params, (self.outdim, self.indim)) * (1-eye(self.outdim))
+        inerr += dot(outerr, p)
+        ds = self.derivs
+        ds += dot(outerr.T, inbuf).flatten()
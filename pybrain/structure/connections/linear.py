@@ -24,3 +24,9 @@ class LinearConnection(Connection, ParameterContainer):
     def _backwardImplementation(self, outerr, inerr, inbuf):
         #CHECKME: not setting derivatives -- this means the multiplicative weight is never updated!
         inerr += outerr * self.params
+
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf += inbuf * self.params
+
+    def _backwardBatchImplementation(self, outerr, inerr, inbuf):
+        inerr += outerr * self.params
@@ -10,4 +10,10 @@ class LinearLayer(NeuronLayer):
         outbuf[:] = inbuf
 
     def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
-        inerr[:] = outerr
\ No newline at end of file
+        inerr[:] = outerr
+
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf[:] = inbuf
+
+    def _backwardBatchImplementation(self, outerr, inerr, outbuf, inbuf):
+        inerr[:] = outerr
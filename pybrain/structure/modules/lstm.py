@@ -8,6 +8,15 @@ from pybrain.structure.parametercontainer import ParameterContainer
 from pybrain.tools.functions import sigmoid, sigmoidPrime, tanhPrime
 
 
+def _gateView(buffername, index):
+    """Return a property giving the part of the stacked buffer `buffername`
+    that belongs to the gate at position `index`."""
+    def get(self):
+        dim = self.outdim
+        return getattr(self, buffername)[:, index * dim:(index + 1) * dim]
+    return property(get)
+
+
 class LSTMLayer(NeuronLayer, ParameterContainer):
     """Long short-term memory cell layer.
 
@@ -17,6 +26,9 @@ class LSTMLayer(NeuronLayer, ParameterContainer):
     - cell input
     - output gate
 
+    The net inputs and activations of all four parts, and their errors, are
+    kept stacked in the same order in the buffers `gatex`, `gate` and
+    `gateError`, so that each timestep needs as few operations as possible.
     """
 
     sequential = True
@@ -31,6 +43,16 @@ class LSTMLayer(NeuronLayer, ParameterContainer):
     h = lambda _, x: tanh(x)
     hprime = lambda _, x: tanhPrime(x)
 
+    # Views of the individual gates in the stacked buffers.
+    ingatex = _gateView('gatex', 0)
+    forgetgatex = _gateView('gatex', 1)
+    outgatex = _gateView('gatex', 3)
+    ingate = _gateView('gate', 0)
+    forgetgate = _gateView('gate', 1)
+    outgate = _gateView('gate', 3)
+    ingateError = _gateView('gateError', 0)
+    forgetgateError = _gateView('gateError', 1)
+    outgateError = _gateView('gateError', 3)
 
     def __init__(self, dim, peepholes = False, name = None):
         """
@@ -40,16 +62,10 @@ class LSTMLayer(NeuronLayer, ParameterContainer):
 
         # Internal buffers, created dynamically:
         self.bufferlist = [
-            ('ingate', dim),
-            ('outgate', dim),
-            ('forgetgate', dim),
-            ('ingatex', dim),
-            ('outgatex', dim),
-            ('forgetgatex', dim),
+            ('gatex', 4 * dim),
+            ('gate', 4 * dim),
+            ('gateError', 4 * dim),
             ('state', dim),
-            ('ingateError', dim),
-            ('outgateError', dim),
-            ('forgetgateError', dim),
             ('stateError', dim),
         ]
 
@@ -80,67 +96,94 @@ class LSTMLayer(NeuronLayer, ParameterContainer):
         return self.maxoffset == self.offset
 
     def _forwardImplementation(self, inbuf, outbuf):
-        self.maxoffset = max(self.offset + 1, self.maxoffset)
+        self._forwardStep(self.offset, 1, inbuf[None], outbuf[None])
 
-        dim = self.outdim
-        # slicing the input buffer into the 4 parts
-        try:
-            self.ingatex[self.offset] = inbuf[:dim]
-        except IndexError:
-            raise str((self.offset, self.ingatex.shape))
+    def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
+        self._backwardStep(self.offset, 1, outerr[None], inerr[None])
+
+    def supportsSequenceBlocks(self):
+        return True
 
-        self.forgetgatex[self.offset] = inbuf[dim:dim*2]
-        cellx = inbuf[dim*2:dim*3]
-        self.outgatex[self.offset] = inbuf[dim*3:]
+    def forwardBlock(self, t, n):
+        self.offset = t
+        rows = slice(t * n, (t + 1) * n)
+        self._forwardStep(t, n, self.inputbuffer[rows], self.outputbuffer[rows])
 
-        # peephole treatment
-        if self.peepholes and self.offset > 0:
-            self.ingatex[self.offset] += self.ingatePeepWeights * self.state[self.offset-1]
-            self.forgetgatex[self.offset] += self.forgetgatePeepWeights * self.state[self.offset-1]
+    def backwardBlock(self, t, n):
+        self.offset = t
+        rows = slice(t * n, (t + 1) * n)
+        self._backwardStep(t, n, self.outputerror[rows], self.inputerror[rows])
 
-        self.ingate[self.offset] = self.f(self.ingatex[self.offset])
-        self.forgetgate[self.offset] = self.f(self.forgetgatex[self.offset])
+    def _forwardStep(self, t, n, inbuf, outbuf):
+        """Forward pass of timestep `t` of `n` sequences, whose inputs and
+        outputs are given as the rows of `inbuf` and `outbuf`."""
+        self.maxoffset = max(t + 1, self.maxoffset)
+        dim = self.outdim
+        rows = slice(t * n, (t + 1) * n)
+        gatex = self.gatex[rows]
+        gate = self.gate[rows]
+        state = self.state[rows]
+
+        gatex[:] = inbuf
+        if t > 0:
+            laststate = self.state[(t - 1) * n:t * n]
+            # peephole treatment
+            if self.peepholes:
+                gatex[:, :dim] += self.ingatePeepWeights * laststate
+                gatex[:, dim:dim*2] += self.forgetgatePeepWeights * laststate
+
+        gate[:, :dim*2] = self.f(gatex[:, :dim*2])
+        gate[:, dim*2:dim*3] = self.g(gatex[:, dim*2:dim*3])
 
-        self.state[self.offset] = self.ingate[self.offset] * self.g(cellx)
-        if self.offset > 0:
-            self.state[self.offset] += self.forgetgate[self.offset] * self.state[self.offset-1]
+        state[:] = gate[:, :dim] * gate[:, dim*2:dim*3]
+        if t > 0:
+            state += gate[:, dim:dim*2] * laststate
 
         if self.peepholes:
-            self.outgatex[self.offset] += self.outgatePeepWeights * self.state[self.offset]
-        self.outgate[self.offset] = self.f(self.outgatex[self.offset])
+            gatex[:, dim*3:] += self.outgatePeepWeights * state
+        gate[:, dim*3:] = self.f(gatex[:, dim*3:])
 
-        outbuf[:] = self.outgate[self.offset] * self.h(self.state[self.offset])
+        outbuf[:] = gate[:, dim*3:] * self.h(state)
 
-    def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
+    def _backwardStep(self, t, n, outerr, inerr):
+        """Backward pass of timestep `t` of `n` sequences, whose output and
+        input errors are given as the rows of `outerr` and `inerr`."""
         dim = self.outdim
-        cellx = inbuf[dim*2:dim*3]
-
-        self.outgateError[self.offset] = self.fprime(self.outgatex[self.offset]) * outerr * self.h(self.state[self.offset])
-        self.stateError[self.offset] = outerr * self.outgate[self.offset] * self.hprime(self.state[self.offset])
+        rows = slice(t * n, (t + 1) * n)
+        gatex = self.gatex[rows]
+        gate = self.gate[rows]
+        gateError = self.gateError[rows]
+        state = self.state[rows]
+        stateError = self.stateError[rows]
+
+        gateError[:, dim*3:] = self.fprime(gatex[:, dim*3:]) * outerr * self.h(state)
+        stateError[:] = outerr * gate[:, dim*3:] * self.hprime(state)
         if not self._isLastTimestep():
-            self.stateError[self.offset] += self.stateError[self.offset+1] * self.forgetgate[self.offset+1]
+            following = slice((t + 1) * n, (t + 2) * n)
+            stateError += self.stateError[following] * self.gate[following, dim:dim*2]
             if self.peepholes:
-                self.stateError[self.offset] += self.ingateError[self.offset+1] * self.ingatePeepWeights
-                self.stateError[self.offset] += self.forgetgateError[self.offset+1] * self.forgetgatePeepWeights
+                stateError += self.gateError[following, :dim] * self.ingatePeepWeights
+                stateError += self.gateError[following, dim:dim*2] * self.forgetgatePeepWeights
         if self.peepholes:
-            self.stateError[self.offset] += self.outgateError[self.offset] * self.outgatePeepWeights
-        cellError = self.ingate[self.offset] * self.gprime(cellx) * self.stateError[self.offset]
-        if self.offset > 0:
-            self.forgetgateError[self.offset] = self.fprime(self.forgetgatex[self.offset]) * self.stateError[self.offset] * self.state[self.offset-1]
+            stateError += gateError[:, dim*3:] * self.outgatePeepWeights
+        gateError[:, dim*2:dim*3] = gate[:, :dim] * self.gprime(gatex[:, dim*2:dim*3]) * stateError
 
-        self.ingateError[self.offset] = self.fprime(self.ingatex[self.offset]) * self.stateError[self.offset] * self.g(cellx)
+        gateprime = self.fprime(gatex[:, :dim*2])
+        if t > 0:
+            laststate = self.state[(t - 1) * n:t * n]
+            gateError[:, dim:dim*2] = gateprime[:, dim:] * stateError * laststate
+        else:
+            gateError[:, dim:dim*2] = 0
+        gateError[:, :dim] = gateprime[:, :dim] * stateError * gate[:, dim*2:dim*3]
 
         # compute derivatives
         if self.peepholes:
-            self.outgatePeepDerivs += self.outgateError[self.offset] * self.state[self.offset]
-            if self.offset > 0:
-                self.ingatePeepDerivs += self.ingateError[self.offset] * self.state[self.offset-1]
-                self.forgetgatePeepDerivs += self.forgetgateError[self.offset] * self.state[self.offset-1]
-
-        inerr[:dim] = self.ingateError[self.offset]
-        inerr[dim:dim*2] = self.forgetgateError[self.offset]
-        inerr[dim*2:dim*3] = cellError
-        inerr[dim*3:] = self.outgateError[self.offset]
+            self.outgatePeepDerivs += (gateError[:, dim*3:] * state).sum(axis=0)
+            if t > 0:
+                self.ingatePeepDerivs += (gateError[:, :dim] * laststate).sum(axis=0)
+                self.forgetgatePeepDerivs += (gateError[:, dim:dim*2] * laststate).sum(axis=0)
+
+        inerr[:] = gateError
 
     def whichNeuron(self, inputIndex = None, outputIndex = None):
         if inputIndex != None:
@@ -81,6 +81,60 @@ class Module(Named):
                                      self.outputbuffer[self.offset],
                                      self.inputbuffer[self.offset])
 
+    def forwardBatch(self, n):
+        """Produce the outputs from the first `n` rows of the input buffer,
+        treating every row as an independent sample."""
+        self._forwardBatchImplementation(self.inputbuffer[:n],
+                                         self.outputbuffer[:n])
+
+    def backwardBatch(self, n):
+        """Produce the input errors from the first `n` rows of the output
+        error buffer, treating every row as an independent sample."""
+        self._backwardBatchImplementation(self.outputerror[:n],
+                                          self.inputerror[:n],
+                                          self.outputbuffer[:n],
+                                          self.inputbuffer[:n])
+
+    def supportsSequenceBlocks(self):
+        """Tell whether the module can process several sequences together,
+        with .forwardBlock() and .backwardBlock()."""
+        return not self.sequential
+
+    def forwardBlock(self, t, n):
+        """Forward pass of timestep `t` of `n` sequences that are processed
+        together, with the samples of timestep `t` stored in rows t*n to
+        (t+1)*n of the buffers.
+
+        Sequential modules have to overwrite this (and
+        .supportsSequenceBlocks()) to support more than one sequence."""
+        if self.sequential:
+            if n > 1:
+                raise NotImplementedError(
+                    "%s cannot process several sequences at once." %
+                    self.__class__.__name__)
+            self.offset = t
+            self.forward()
+        else:
+            self._forwardBatchImplementation(self.inputbuffer[t * n:(t + 1) * n],
+                                             self.outputbuffer[t * n:(t + 1) * n])
+
+    def backwardBlock(self, t, n):
+        """Backward pass of timestep `t` of `n` sequences that are processed
+        together, see .forwardBlock()."""
+        if self.sequential:
+            if n > 1:
+                raise NotImplementedError(
+                    "%s cannot process several sequences at once." %
+                    self.__class__.__name__)
+            self.offset = t
+            self.backward()
+        else:
+            rows = slice(t * n, (t + 1) * n)
+            self._backwardBatchImplementation(self.outputerror[rows],
+                                              self.inputerror[rows],
+                                              self.outputbuffer[rows],
+                                              self.inputbuffer[rows])
+
     def reset(self):
         """Set all buffers, past and present, to zero."""
         self.offset = 0
@@ -123,6 +177,35 @@ class Module(Named):
         self.forward()
         return self.outputbuffer[self.offset].copy()
 
+    def activateBatch(self, inpts):
+        """Transform every row of the 2d array `inpts` independently and return
+        the outputs as the rows of a 2d array.
+
+        The buffers are (re)used in their time dimension to hold the batch, so
+        this must not be used on sequential modules."""
+        assert not self.sequential, "Batches are not defined for sequential modules."
+        n = len(inpts)
+        self._prepareBatch(n)
+        self.inputbuffer[:n] = inpts
+        self.forwardBatch(n)
+        return self.outputbuffer[:n].copy()
+
+    def backActivateBatch(self, outerrs):
+        """Transform the rows of the 2d array `outerrs` backward and return the
+        errors on the input as the rows of a 2d array.
+
+        Must follow a call to .activateBatch() with the same number of rows."""
+        n = len(outerrs)
+        self.outputerror[:n] = outerrs
+        self.backwardBatch(n)
+        return self.inputerror[:n].copy()
+
+    def _prepareBatch(self, n):
+        """Make sure the buffers hold at least `n` rows and set them to zero."""
+        if getattr(self, self.bufferlist[0][0]).shape[0] < n:
+            self._resetBuffers(n)
+        self.reset()
+
     def backActivate(self, outerr):
         """Do one transformation of an output error outerr backward and return
         the error on the input."""
@@ -140,3 +223,16 @@ class Module(Named):
         in subclasses, does not have to.
 
         Should also compute the derivatives of the parameters."""
+
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        """Forward transformation of a batch of samples, one per row of the 2d
+        buffers. Subclasses should overwrite this with a vectorized version;
+        the default processes the rows one by one."""
+        for inrow, outrow in zip(inbuf, outbuf):
+            self._forwardImplementation(inrow, outrow)
+
+    def _backwardBatchImplementation(self, outerr, inerr, outbuf, inbuf):
+        """Backward transformation of a batch of samples, one per row of the 2d
+        buffers. The parameter derivatives are accumulated over the batch."""
+        for rows in zip(outerr, inerr, outbuf, inbuf):
+            self._backwardImplementation(*rows)
@@ -9,4 +9,10 @@ class ReluLayer(NeuronLayer):
         outbuf[:] = inbuf * (inbuf > 0)
 
     def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
-        inerr[:] = outerr * (inbuf > 0)
\ No newline at end of file
+        inerr[:] = outerr * (inbuf > 0)
+
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf[:] = inbuf * (inbuf > 0)
+
+    def _backwardBatchImplementation(self, outerr, inerr, outbuf, inbuf):
+        inerr[:] = outerr * (inbuf > 0)
@@ -20,6 +20,13 @@ class SoftmaxLayer(NeuronLayer):
     def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
         inerr[:] = outerr
 
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf[:] = safeExp(inbuf)
+        outbuf /= outbuf.sum(axis=1)[:, None]
+
+    def _backwardBatchImplementation(self, outerr, inerr, outbuf, inbuf):
+        inerr[:] = outerr
+
 
 class PartialSoftmaxLayer(NeuronLayer):
     """Layer implementing a softmax distribution over slices of the input."""
@@ -13,3 +13,9 @@ class SoftSignLayer(NeuronLayer):
 
     def _backwardImplementation(self, outerr, inerr, outbuf, inbuf):
         inerr[:] = (1 - abs(outbuf))**2 * outerr
+
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        outbuf[:] = inbuf / (1 + abs(inbuf))
+
+    def _backwardBatchImplementation(self, outerr, inerr, outbuf, inbuf):
+        inerr[:] = (1 - abs(outbuf))**2 * outerr
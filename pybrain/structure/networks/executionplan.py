@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""Module that contains the ExecutionPlan class."""
+
+
+from pybrain.structure.networks.network import Network, \
+    NetworkConstructionException
+
+
+class ExecutionPlan(object):
+    """Flat representation of the forward and backward passes of a sorted
+    feed-forward network.
+
+    All the buffer views and slices the passes need are computed once, so
+    that a single activation is reduced to a sequence of calls of the
+    modules' and connections' transformation functions, without any
+    dictionary lookups, slicing or resetting of whole buffers.
+
+    The plan only holds views of the network's buffers: it has to be rebuilt
+    whenever those are reallocated, which the network does by itself."""
+
+    def __init__(self, net):
+        if net.sequential:
+            raise NetworkConstructionException(
+                "Execution plans are only available for feed-forward networks.")
+        self.net = net
+        self._build()
+
+    def __getstate__(self):
+        # Views and bound methods cannot be copied meaningfully, rebuild them
+        # on first use instead.
+        return {'net': self.net, '_forwardSteps': None}
+
+    def _build(self):
+        net = self.net
+        # Buffers that are accumulated into, and those of nested networks,
+        # have to be cleared before every pass.
+        self._clearForward = []
+        self._clearBackward = []
+        self._resets = []
+        receiving = set()
+        sending = set()
+        for m in net.modulesSorted:
+            for c in net.connections[m]:
+                sending.add(c.inmod)
+                receiving.add(c.outmod)
+        for m in net.modulesSorted:
+            if isinstance(m, Network):
+                self._resets.append(m.reset)
+            if m in receiving and m not in net.inmodules:
+                self._clearForward.append(m.inputbuffer[0])
+            if m in sending and m not in net.outmodules:
+                self._clearBackward.append(m.outputerror[0])
+            if m.indim > 0:
+                self._clearBackward.append(m.inputerror[0])
+
+        self._inputs = []
+        self._inputErrors = []
+        index = 0
+        for m in net.inmodules:
+            self._inputs.append((m.inputbuffer[0], slice(index, index + m.indim)))
+            self._inputErrors.append((m.inputerror[0], slice(index, index + m.indim)))
+            index += m.indim
+
+        self._outputs = []
+        self._outputErrors = []
+        index = 0
+        for m in net.outmodules:
+            self._outputs.append((m.outputbuffer[0], slice(index, index + m.outdim)))
+            self._outputErrors.append((m.outputerror[0], slice(index, index + m.outdim)))
+            index += m.outdim
+
+        self._forwardSteps = []
+        self._backwardSteps = []
+        for m in net.modulesSorted:
+            self._forwardSteps.append((m._forwardImplementation,
+                                       (m.inputbuffer[0], m.outputbuffer[0])))
+            self._backwardSteps.append((m._backwardImplementation,
+                                        (m.outputerror[0], m.inputerror[0],
+                                         m.outputbuffer[0], m.inputbuffer[0])))
+            for c in net.connections[m]:
+                inslice = slice(c.inSliceFrom, c.inSliceTo)
+                outslice = slice(c.outSliceFrom, c.outSliceTo)
+                self._forwardSteps.append((c._forwardImplementation,
+                                           (c.inmod.outputbuffer[0, inslice],
+                                            c.outmod.inputbuffer[0, outslice])))
+                self._backwardSteps.append((c._backwardImplementation,
+                                            (c.outmod.inputerror[0, outslice],
+                                             c.inmod.outputerror[0, inslice],
+                                             c.inmod.outputbuffer[0, inslice])))
+        self._backwardSteps.reverse()
+
+        self._inbuf = net.inputbuffer[0]
+        self._outbuf = net.outputbuffer[0]
+        self._outerr = net.outputerror[0]
+        self._inerr = net.inputerror[0]
+
+    def activate(self, inpt):
+        """Do one forward pass of the network on `inpt` and return the
+        output."""
+        if self._forwardSteps is None:
+            self._build()
+        inbuf = self._inbuf
+        inbuf[:] = inpt
+        for reset in self._resets:
+            reset()
+        for buf in self._clearForward:
+            buf.fill(0)
+        for buf, index in self._inputs:
+            buf[:] = inbuf[index]
+        for f, args in self._forwardSteps:
+            f(*args)
+        outbuf = self._outbuf
+        for buf, index in self._outputs:
+            outbuf[index] = buf
+        return outbuf.copy()
+
+    def backActivate(self, outerr):
+        """Do one backward pass of the network on `outerr`, following the
+        last call to .activate(), and return the error on the input."""
+        if self._forwardSteps is None:
+            self._build()
+        errbuf = self._outerr
+        errbuf[:] = outerr
+        for buf in self._clearBackward:
+            buf.fill(0)
+        for buf, index in self._outputErrors:
+            buf[:] = errbuf[index]
+        for f, args in self._backwardSteps:
+            f(*args)
+        inerr = self._inerr
+        for buf, index in self._inputErrors:
+            inerr[index] = buf
+        return inerr.copy()
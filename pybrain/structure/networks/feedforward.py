@@ -5,7 +5,10 @@
 
 __author__ = 'Justin Bayer, bayer.justin@googlemail.com'
 
+from scipy import zeros
+
 from pybrain.structure.networks.network import Network
+from pybrain.structure.networks.executionplan import ExecutionPlan
 
 
 class FeedForwardNetworkComponent(object):
@@ -15,9 +18,28 @@ class FeedForwardNetworkComponent(object):
 
     def activate(self, inpt):
         """Do one transformation of an input and return the result."""
+        if self._plan is not None and self.sorted:
+            return self._plan.activate(inpt)
         self.reset()
         return super(FeedForwardNetworkComponent, self).activate(inpt)
 
+    def backActivate(self, outerr):
+        """Do one transformation of an output error outerr backward and return
+        the error on the input."""
+        if self._plan is not None and self.sorted:
+            return self._plan.backActivate(outerr)
+        return super(FeedForwardNetworkComponent, self).backActivate(outerr)
+
+    def compile(self):
+        """Precompute an execution plan that speeds up subsequent calls of
+        .activate() and .backActivate().
+
+        The plan is kept up to date automatically when the network is sorted
+        again or its buffers change."""
+        if not self.sorted:
+            self.sortModules()
+        self._plan = ExecutionPlan(self)
+
     def _forwardImplementation(self, inbuf, outbuf):
         assert self.sorted, ".sortModules() has not been called"
         index = 0
@@ -54,6 +76,53 @@ class FeedForwardNetworkComponent(object):
             inerr[index:index + m.indim] = m.inputerror[offset]
             index += m.indim
 
+    def _forwardBatchImplementation(self, inbuf, outbuf):
+        assert self.sorted, ".sortModules() has not been called"
+        n = len(inbuf)
+        index = 0
+        for m in self.inmodules:
+            m.inputbuffer[:n] = inbuf[:, index:index + m.indim]
+            index += m.indim
+
+        for m in self.modulesSorted:
+            m.forwardBatch(n)
+            for c in self.connections[m]:
+                c.forwardBatch(n)
+
+        index = 0
+        for m in self.outmodules:
+            outbuf[:, index:index + m.outdim] = m.outputbuffer[:n]
+            index += m.outdim
+
+    def _backwardBatchImplementation(self, outerr, inerr, outbuf, inbuf):
+        assert self.sorted, ".sortModules() has not been called"
+        n = len(outerr)
+        index = 0
+        for m in self.outmodules:
+            m.outputerror[:n] = outerr[:, index:index + m.outdim]
+            index += m.outdim
+
+        for m in reversed(self.modulesSorted):
+            for c in self.connections[m]:
+                c.backwardBatch(n)
+            m.backwardBatch(n)
+
+        index = 0
+        for m in self.inmodules:
+            inerr[:, index:index + m.indim] = m.inputerror[:n]
+            index += m.indim
+
+    def activateOnDataset(self, dataset, batchsize=1024):
+        """Run the network's forward pass on the given dataset, `batchsize`
+        samples at a time, and return the output."""
+        inpts = dataset.data[dataset.link[0]][:len(dataset)]
+        out = zeros((len(dataset), self.outdim))
+        for start in range(0, len(dataset), batchsize):
+            out[start:start + batchsize] = \
+                self.activateBatch(inpts[start:start + batchsize])
+        self.reset()
+        return out
+
 
 class FeedForwardNetwork(FeedForwardNetworkComponent, Network):
     """FeedForwardNetworks are networks that do not work for sequential data.
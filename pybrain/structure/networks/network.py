@@ -4,6 +4,8 @@ __author__ = 'Daan Wierstra and Tom Schaul'
 
 import scipy
 
+import mmap
+import os
 import logging
 from itertools import chain
 
@@ -18,11 +20,32 @@ class NetworkConstructionException(Exception):
     """Exception that indicates that the structure of the network is invalid."""
 
 
+def _sharedBlock(size, filename=None, mode='w+'):
+    """Return an array of `size` floats that lives in shared memory: in an
+    anonymous memory map if no `filename` is given, otherwise in the memory
+    mapped file of that name. A file of the right size is not truncated
+    (other processes may have attached to it), even with mode 'w+'."""
+    if filename is None:
+        return scipy.frombuffer(mmap.mmap(-1, max(size, 1) * 8))[:size]
+    if mode == 'w+' and os.path.exists(filename) and os.path.getsize(filename) == size * 8:
+        mode = 'r+'
+    return scipy.memmap(filename, dtype=float, mode=mode, shape=(size,))
+
+
 class Network(Module, ParameterContainer):
     """Abstract class for linking different modules with connections."""
 
     __offset = 0
 
+    # Compiled execution plan, if any. See .compile().
+    _plan = None
+
+    # Arguments of the last call to .shareParameters(), if any.
+    _sharing = None
+
+    # The block of shared memory holding the parameters, if any.
+    _sharedMemory = None
+
     def __getOffset(self):
         return self.__offset
 
@@ -165,6 +188,51 @@ class Network(Module, ParameterContainer):
             x._setDerivatives(self.derivs[index:index + x.paramdim], self)
             index += x.paramdim
 
+    def shareParameters(self, filename=None, derivatives=False):
+        """Move the parameters of the network into shared memory, so that
+        other processes can use them without a copy.
+
+        Without a `filename`, the parameters are kept in an anonymous memory
+        map, which is shared with all processes forked afterwards. Otherwise
+        they are kept in the memory mapped file of that name (e.g. below
+        /dev/shm), to which networks of the same structure in other processes
+        can be attached with .attachParameters(). If `derivatives` is set, the
+        derivatives are shared as well, following the parameters in the same
+        block of memory.
+
+        The network stays shared when it is sorted again (in the same block
+        of memory, as long as the number of parameters does not change);
+        copies of the network are not shared."""
+        self.sortModules()
+        self._useSharedBlock(filename, derivatives, 'w+', True)
+
+    def attachParameters(self, filename, derivatives=False):
+        """Use the parameters (and with `derivatives`, the derivatives) in the
+        file `filename` created by .shareParameters() of a network of the same
+        structure, without copying them."""
+        self.sortModules()
+        self._useSharedBlock(filename, derivatives, 'r+', False)
+
+    def _useSharedBlock(self, filename, derivatives, mode, keepValues):
+        """Put the parameters into the shared block of memory, which is reused
+        if it is the one the network used before, with the same size. With
+        `keepValues`, the current values are copied into it."""
+        dim = self.paramdim
+        size = dim * (2 if derivatives else 1)
+        block = self._sharedMemory
+        if (block is None or len(block) != size
+                or self._sharing != (filename, derivatives)):
+            block = _sharedBlock(size, filename, mode)
+        if keepValues:
+            block[:dim] = self.params
+            if derivatives:
+                block[dim:] = self.derivs
+        self._setParameters(block[:dim])
+        if derivatives:
+            self._setDerivatives(block[dim:])
+        self._sharedMemory = block
+        self._sharing = filename, derivatives
+
     def _forwardImplementation(self, inbuf, outbuf):
         raise NotImplementedError("Must be implemented by subclass.")
 
@@ -257,18 +325,40 @@ class Network(Module, ParameterContainer):
         self.bufferlist = []
         Module.__init__(self, self.indim, self.outdim, name=self.name)
         self.sorted = True
+        if self._sharing is not None:
+            self._useSharedBlock(self._sharing[0], self._sharing[1], 'w+', True)
+        if self._plan is not None:
+            self.compile()
 
     def _resetBuffers(self, length=1):
         super(Network, self)._resetBuffers(length)
         for m in self.modules:
             m._resetBuffers(length)
+        if self._plan is not None and self.sorted:
+            # The plan holds views of the old buffers.
+            self.compile()
+
+    def compile(self):
+        """Precompute an execution plan that speeds up subsequent calls of
+        .activate() and .backActivate().
+
+        The plan is kept up to date automatically when the network is sorted
+        again or its buffers change.
+
+        Only feed-forward networks have such a plan; for the others, this does
+        nothing."""
 
     def copy(self, keepBuffers=False):
         if not keepBuffers:
             self._resetBuffers()
         cp = Evolvable.copy(self)
         if self.paramdim > 0:
-            cp._setParameters(self.params.copy())
+            cp._setParameters(scipy.array(self.params))
+        if self._sharing is not None:
+            cp._sharing = None
+            cp._sharedMemory = None
+            if self.paramdim > 0:
+                cp._setDerivatives(scipy.array(self.derivs))
         return cp
 
     def convertToFastNetwork(self):
@@ -7,7 +7,10 @@
 __author__ = 'Justin Bayer, bayer.justin@googlemail.com'
 
 
+from scipy import asarray
+
 from pybrain.structure.networks.network import Network
+from pybrain.structure.networks.sequenceplan import SequencePlan
 from pybrain.structure.connections.shared import SharedConnection
 
 
@@ -15,6 +18,9 @@ class RecurrentNetworkComponent(object):
 
     sequential = True
 
+    # Schedule for .activateSequences(), built on demand.
+    _sequencePlan = None
+
     def __init__(self, forget=None, name=None, *args, **kwargs):
         self.recurrentConns = []
         self.maxoffset = 0
@@ -60,6 +66,39 @@ class RecurrentNetworkComponent(object):
         self.backward()
         return self.inputerror[self.offset].copy()
 
+    def supportsSequenceBlocks(self):
+        """Tell whether all modules can process several sequences together,
+        which .activateSequences() needs for more than one sequence."""
+        return all(m.supportsSequenceBlocks() for m in self.modules)
+
+    def activateSequences(self, inputs):
+        """Process several sequences of equal length at once and return the
+        outputs.
+
+        `inputs` is an array of shape (length, number of sequences, indim),
+        or of shape (length, indim) for a single sequence; the outputs have
+        the corresponding shape. The buffers are allocated once for the whole
+        sequences, and the parts of the network that do not depend on earlier
+        timesteps are processed for all timesteps at once. The network is
+        reset before."""
+        assert self.sorted, ".sortModules() has not been called"
+        assert not self.forget, "Cannot process sequences in a forgetful network"
+        if self._sequencePlan is None:
+            self._sequencePlan = SequencePlan(self)
+        inputs = asarray(inputs, dtype=float)
+        if inputs.ndim == 2:
+            return self._sequencePlan.activate(inputs[:, None, :])[:, 0]
+        return self._sequencePlan.activate(inputs)
+
+    def backActivateSequences(self, outerrs):
+        """Backpropagate the output errors of the sequences processed by the
+        last call to .activateSequences() through time, and return the input
+        errors. The shapes are the same as for .activateSequences()."""
+        outerrs = asarray(outerrs, dtype=float)
+        if outerrs.ndim == 2:
+            return self._sequencePlan.backActivate(outerrs[:, None, :])[:, 0]
+        return self._sequencePlan.backActivate(outerrs)
+
     def forward(self):
         """Produce the output from the input."""
         if not (self.offset + 1 < self.inputbuffer.shape[0]):
@@ -133,6 +172,7 @@ class RecurrentNetworkComponent(object):
             index += m.indim
 
     def sortModules(self):
+        self._sequencePlan = None
         self.recurrentConns.sort(key=lambda x: x.name)
         super(RecurrentNetworkComponent, self).sortModules()
 
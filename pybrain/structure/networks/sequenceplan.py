@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""Module that contains the SequencePlan class."""
+
+
+from scipy import asarray
+
+
+class SequencePlan(object):
+    """Schedule for processing whole sequences with a recurrent network.
+
+    Several sequences of equal length are processed together. The samples of
+    one timestep are stored as consecutive rows of the buffers: row t*n + i
+    holds timestep t of sequence i. The modules are split into three groups:
+
+    - those that do not depend on earlier timesteps at all, which are
+      processed for all timesteps of all sequences in a single batch,
+    - those that take part in a recurrence (or are sequential themselves),
+      which are processed timestep by timestep, and
+    - those that depend on the recurrent part but do not feed back into it,
+      which are again processed in a single batch afterwards.
+
+    Connections are processed in a single batch whenever their input module
+    is, so that e.g. the input projections of a recurrent layer become one
+    matrix product over the whole sequence."""
+
+    def __init__(self, net):
+        self.net = net
+        self._build()
+
+    def _build(self):
+        net = self.net
+        modules = net.modulesSorted
+        successors = dict((m, [c.outmod for c in net.connections[m]])
+                          for m in modules)
+        sequential = set(m for m in modules if m.sequential)
+
+        # Modules that depend on earlier timesteps.
+        dependent = set()
+        stack = [c.outmod for c in net.recurrentConns] + list(sequential)
+        while stack:
+            m = stack.pop()
+            if m not in dependent:
+                dependent.add(m)
+                stack.extend(successors[m])
+
+        # Modules that feed into a recurrence.
+        feeding = set()
+        sources = set(c.inmod for c in net.recurrentConns) | sequential
+        for m in reversed(modules):
+            if m in sources or any(s in feeding for s in successors[m]):
+                feeding.add(m)
+
+        stepped = set(m for m in modules if m in dependent and m in feeding)
+        self.before = [m for m in modules if m not in dependent]
+        self.stepped = [m for m in modules if m in stepped]
+        self.after = [m for m in modules if m in dependent and m not in stepped]
+
+        # The connections within the stepped part, and the ones leaving it.
+        self.steppedConnections = dict(
+            (m, [c for c in net.connections[m] if c.outmod in stepped])
+            for m in self.stepped)
+        self.leaving = [c for m in self.stepped for c in net.connections[m]
+                        if c.outmod not in stepped]
+
+        # Recurrent connections that start in the first group can be processed
+        # in a single batch too, shifted by one timestep.
+        self.steppedRecurrent = [c for c in net.recurrentConns
+                                 if c.inmod in stepped]
+        self.shiftedRecurrent = dict(
+            (m, [c for c in net.recurrentConns if c.inmod is m])
+            for m in self.before)
+
+    def activate(self, inputs):
+        """Process the sequences given as an array of shape (length, number
+        of sequences, indim) and return the outputs as an array of shape
+        (length, number of sequences, outdim)."""
+        net = self.net
+        length, n = inputs.shape[:2]
+        rows = length * n
+        self._length, self._n = length, n
+        net._prepareBatch(rows + n)
+
+        net.inputbuffer[:rows] = inputs.reshape(rows, net.indim)
+        index = 0
+        for m in net.inmodules:
+            m.inputbuffer[:rows] = net.inputbuffer[:rows, index:index + m.indim]
+            index += m.indim
+
+        shifted = slice(0, rows - n), slice(n, rows)
+        for m in self.before:
+            m.forwardBatch(rows)
+            for c in net.connections[m]:
+                c.forwardBatch(rows)
+            for c in self.shiftedRecurrent[m]:
+                c.forwardRows(*shifted)
+
+        for t in range(length):
+            block = slice(t * n, (t + 1) * n)
+            if t > 0:
+                previous = slice((t - 1) * n, t * n)
+                for c in self.steppedRecurrent:
+                    c.forwardRows(previous, block)
+            for m in self.stepped:
+                m.forwardBlock(t, n)
+                for c in self.steppedConnections[m]:
+                    c.forwardRows(block, block)
+
+        for c in self.leaving:
+            c.forwardBatch(rows)
+        for m in self.after:
+            m.forwardBatch(rows)
+            for c in net.connections[m]:
+                c.forwardBatch(rows)
+
+        index = 0
+        for m in net.outmodules:
+            net.outputbuffer[:rows, index:index + m.outdim] = m.outputbuffer[:rows]
+            index += m.outdim
+        return net.outputbuffer[:rows].reshape(length, n, net.outdim).copy()
+
+    def backActivate(self, outerrs):
+        """Backpropagate the output errors, given as an array of shape (length,
+        number of sequences, outdim), through the sequences of the last call
+        to .activate() and return the input errors."""
+        net = self.net
+        length, n = self._length, self._n
+        rows = length * n
+        assert outerrs.shape[:2] == (length, n)
+
+        net.outputerror[:rows] = asarray(outerrs).reshape(rows, net.outdim)
+        index = 0
+        for m in net.outmodules:
+            m.outputerror[:rows] = net.outputerror[:rows, index:index + m.outdim]
+            index += m.outdim
+
+        for m in reversed(self.after):
+            for c in net.connections[m]:
+                c.backwardBatch(rows)
+            m.backwardBatch(rows)
+        for c in self.leaving:
+            c.backwardBatch(rows)
+
+        for t in reversed(list(range(length))):
+            block = slice(t * n, (t + 1) * n)
+            if t < length - 1:
+                following = slice((t + 1) * n, (t + 2) * n)
+                for c in self.steppedRecurrent:
+                    c.backwardRows(block, following)
+            for m in reversed(self.stepped):
+                for c in self.steppedConnections[m]:
+                    c.backwardRows(block, block)
+                m.backwardBlock(t, n)
+
+        shifted = slice(0, rows - n), slice(n, rows)
+        for m in reversed(self.before):
+            for c in self.shiftedRecurrent[m]:
+                c.backwardRows(*shifted)
+            for c in net.connections[m]:
+                c.backwardBatch(rows)
+            m.backwardBatch(rows)
+
+        index = 0
+        for m in net.inmodules:
+            net.inputerror[:rows, index:index + m.indim] = m.inputerror[:rows]
+            index += m.indim
+        return net.inputerror[:rows].reshape(length, n, net.indim).copy()
@@ -1,3 +1,4 @@
 from pybrain.supervised.trainers.trainer import Trainer
 from pybrain.supervised.trainers.backprop import BackpropTrainer
 from pybrain.supervised.trainers.rprop import RPropMinusTrainer
+from pybrain.supervised.trainers.parallelbackprop import ParallelBackpropTrainer
@@ -2,10 +2,11 @@ from __future__ import print_function
 
 __author__ = 'Daan Wierstra and Tom Schaul'
 
-from scipy import dot, argmax
+from scipy import dot, argmax, array, ravel, append
 from random import shuffle
 from math import isnan
 from pybrain.supervised.trainers.trainer import Trainer
+from pybrain.structure.networks.recurrent import RecurrentNetworkComponent
 from pybrain.utilities import fListToString
 from pybrain.auxiliary import GradientDescent
 
@@ -17,7 +18,7 @@ class BackpropTrainer(Trainer):
 
     def __init__(self, module, dataset=None, learningrate=0.01, lrdecay=1.0,
                  momentum=0., verbose=False, batchlearning=False,
-                 weightdecay=0.):
+                 weightdecay=0., batchsize=None):
         """Create a BackpropTrainer to train the specified `module` on the
         specified `dataset`.
 
@@ -32,12 +33,23 @@ class BackpropTrainer(Trainer):
 
         `weightdecay` corresponds to the weightdecay rate, where 0 is no weight
         decay at all.
+
+        If `batchsize` is given and the module is not sequential (e.g. a
+        FeedForwardNetwork), the samples are propagated `batchsize` at a time
+        as the rows of one matrix. For a RecurrentNetwork, up to `batchsize`
+        sequences of equal length are propagated through time together (one
+        at a time, if it contains sequential modules that do not support
+        this, see Module.supportsSequenceBlocks()). With
+        `batchlearning` this yields the same gradient as the sample-by-sample
+        computation; otherwise the parameters are updated once per batch
+        instead of once per sequence.
         """
         Trainer.__init__(self, module)
         self.setData(dataset)
         self.verbose = verbose
         self.batchlearning = batchlearning
         self.weightdecay = weightdecay
+        self.batchsize = batchsize
         self.epoch = 0
         self.totalepochs = 0
         # set up gradient descender
@@ -50,15 +62,36 @@ class BackpropTrainer(Trainer):
     def train(self):
         """Train the associated module for one epoch."""
         assert len(self.ds) > 0, "Dataset cannot be empty."
+        if self._useBatches():
+            chunks = self._provideBatches(self.ds, shuffled=True)
+            calcDerivs = self._calcDerivsBatch
+        else:
+            chunks = []
+            for seq in self.ds._provideSequences():
+                chunks.append(seq)
+            shuffle(chunks)
+            calcDerivs = self._calcDerivs
+        return self._trainOnChunks(chunks, calcDerivs)
+
+    def trainOnBatches(self, batches):
+        """Train the associated module for one pass over the given iterable of
+        batches, as yielded e.g. by DataSet.linkedBatches() or by a generator,
+        instead of the dataset of the trainer.
+
+        A batch is a list holding an array per field: inputs, targets and
+        optionally importances. For a sequential module, the arrays have the
+        shape (length, number of sequences, dim), otherwise the samples are
+        their rows."""
+        return self._trainOnChunks(batches, self._calcDerivsBatch)
+
+    def _trainOnChunks(self, chunks, calcDerivs):
+        """Do one pass over `chunks`, computing the derivatives of each with
+        `calcDerivs`."""
         self.module.resetDerivatives()
         errors = 0
         ponderation = 0.
-        shuffledSequences = []
-        for seq in self.ds._provideSequences():
-            shuffledSequences.append(seq)
-        shuffle(shuffledSequences)
-        for seq in shuffledSequences:
-            e, p = self._calcDerivs(seq)
+        for chunk in chunks:
+            e, p = calcDerivs(chunk)
             errors += e
             ponderation += p
             if not self.batchlearning:
@@ -106,6 +139,92 @@ class BackpropTrainer(Trainer):
 
         return error, ponderation
 
+    def _useBatches(self):
+        """Tell whether samples are to be propagated as batches."""
+        if not self.batchsize:
+            return False
+        return (not self.module.sequential
+                or isinstance(self.module, RecurrentNetworkComponent))
+
+    def _provideBatches(self, dataset, shuffled=False):
+        """Return an iterator over the batches of the dataset that suit the
+        module."""
+        if self.module.sequential:
+            return self._provideSequenceBatches(dataset, shuffled)
+        return self._provideSampleBatches(dataset, shuffled)
+
+    def _provideSequenceBatches(self, dataset, shuffled=False):
+        """Return an iterator over batches of sequences of equal length. A
+        batch is a list holding one array of shape (length, number of
+        sequences, dim) per linked field."""
+        length = len(dataset)
+        if dataset.hasField('sequence_index'):
+            starts = ravel(dataset.getField('sequence_index')).astype(int)
+        else:
+            starts = array(list(range(length)))
+        stops = append(starts[1:], length)
+        bylength = {}
+        for start, stop in zip(starts, stops):
+            bylength.setdefault(stop - start, []).append(start)
+        chunks = []
+        for seqlength in sorted(bylength):
+            seqstarts = bylength[seqlength]
+            if shuffled:
+                shuffle(seqstarts)
+            for i in range(0, len(seqstarts), self.batchsize):
+                chunks.append((seqlength, seqstarts[i:i + self.batchsize]))
+        if shuffled:
+            shuffle(chunks)
+        fields = [dataset.data[l] for l in dataset.link]
+        for seqlength, seqstarts in chunks:
+            yield [array([f[s:s + seqlength] for s in seqstarts]).swapaxes(0, 1)
+                   for f in fields]
+
+    def _provideSampleBatches(self, dataset, shuffled=False):
+        """Return an iterator over batches of the dataset. A batch is a list
+        holding one 2d array of at most `batchsize` rows per linked field."""
+        return dataset.linkedBatches(self.batchsize, shuffled=shuffled)
+
+    def _batchError(self, batch, output):
+        """Return the error, the ponderation and the (importance weighted)
+        output errors of the module output on a batch."""
+        outerr = batch[1] - output
+        if len(batch) > 2:
+            importance = batch[2]
+            error = 0.5 * (importance * outerr ** 2).sum()
+            ponderation = importance.sum()
+            outerr *= importance
+        else:
+            error = 0.5 * (outerr ** 2).sum()
+            ponderation = float(outerr.size)
+        return error, ponderation, outerr
+
+    def _calcDerivsBatch(self, batch):
+        """Like ._calcDerivs(), but for a batch of independent samples, or of
+        sequences, that is propagated through the module at once."""
+        if not self.module.sequential:
+            output = self.module.activateBatch(batch[0])
+            error, ponderation, outerr = self._batchError(batch, output)
+            self.module.backActivateBatch(outerr)
+            return error, ponderation
+        error = 0
+        ponderation = 0.
+        for block in self._sequenceBlocks(batch):
+            output = self.module.activateSequences(block[0])
+            e, p, outerr = self._batchError(block, output)
+            self.module.backActivateSequences(outerr)
+            error += e
+            ponderation += p
+        return error, ponderation
+
+    def _sequenceBlocks(self, batch):
+        """Split a batch of sequences into the blocks that the module can
+        process at once: the whole batch, or one sequence per block if some
+        sequential module in it cannot process several."""
+        if self.module.supportsSequenceBlocks():
+            return [batch]
+        return [[f[:, i:i + 1] for f in batch] for i in range(batch[0].shape[1])]
+
     def _checkGradient(self, dataset=None, silent=False):
         """Numeric check of the computed gradient for debugging purposes."""
         if dataset:
@@ -140,6 +259,22 @@ class BackpropTrainer(Trainer):
         if dataset == None:
             dataset = self.ds
         dataset.reset()
+        if self._useBatches() and not verbose:
+            error = 0.
+            ponderation = 0.
+            for batch in self._provideBatches(dataset):
+                if self.module.sequential:
+                    blocks = self._sequenceBlocks(batch)
+                    outputs = [self.module.activateSequences(b[0]) for b in blocks]
+                else:
+                    blocks = [batch]
+                    outputs = [self.module.activateBatch(batch[0])]
+                for block, output in zip(blocks, outputs):
+                    e, p, _ = self._batchError(block, output)
+                    error += e
+                    ponderation += p
+            assert ponderation > 0
+            return error / ponderation
         if verbose:
             print('\nTesting on data:')
         errors = []
@@ -0,0 +1,179 @@
+from __future__ import print_function
+
+from random import shuffle
+from multiprocessing import Process, Queue, cpu_count
+from multiprocessing.sharedctypes import RawArray
+
+from scipy import frombuffer, may_share_memory
+
+from pybrain.supervised.trainers.backprop import BackpropTrainer
+
+
+def _work(trainer, index):
+    """Loop of the worker process `index`: compute the derivatives for the
+    sequences it is given, until it receives None."""
+    module = trainer.module
+    params = frombuffer(trainer._sharedParams)
+    module._setParameters(params)
+    gradients = frombuffer(trainer._sharedGradients).reshape(trainer.processes, -1)
+    results = frombuffer(trainer._sharedResults).reshape(trainer.processes, 2)
+    # For asynchronous learning, the descent works on the shared parameters
+    # directly.
+    descent = trainer.descent
+    descent.values = params
+    tasks = trainer._tasks[index]
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        asynchronous, indices = task
+        module.resetDerivatives()
+        error = 0.
+        ponderation = 0.
+        for i in indices:
+            e, p = trainer._calcDerivs(trainer._sequences[i])
+            error += e
+            ponderation += p
+            if asynchronous:
+                descent(module.derivs - trainer.weightdecay * params, error)
+                module.resetDerivatives()
+        gradients[index] = module.derivs
+        results[index] = error, ponderation
+        trainer._done.put(index)
+
+
+class ParallelBackpropTrainer(BackpropTrainer):
+    """BackpropTrainer that distributes the sequences of the dataset over
+    several worker processes.
+
+    Every worker holds a copy of the module, but the parameters of all copies
+    live in a single shared memory block, so they never have to be sent to
+    the workers. The workers send back their summed derivatives the same way.
+
+    With `batchlearning`, the gradient is exactly the one of the
+    BackpropTrainer. Without it, a descent step is done once for every
+    `processes` sequences, on the summed derivatives of these -- unless
+    `asynchronous` is set: then every worker does its own descent steps, one
+    per sequence, directly on the shared parameters and without any locking
+    ("Hogwild!" style). This scales best, but the steps of the workers
+    interleave in unpredictable ways, which makes training non-deterministic.
+
+    The workers are started on the first call to .train() and work on a
+    snapshot of the dataset; changing the dataset of the trainer restarts
+    them. If the parameters of the module are replaced between epochs, the
+    module is moved back to the shared parameters, with the new values."""
+
+    def __init__(self, module, dataset=None, processes=None,
+                 asynchronous=False, **kwargs):
+        """Create a trainer with `processes` workers (default: the number of
+        CPUs). All other arguments are those of the BackpropTrainer."""
+        self.processes = processes or cpu_count()
+        self.asynchronous = asynchronous
+        self._workers = None
+        BackpropTrainer.__init__(self, module, dataset, **kwargs)
+
+    def setData(self, dataset):
+        """Associate the given dataset with the trainer."""
+        self.close()
+        BackpropTrainer.setData(self, dataset)
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._workers is None:
+            return
+        for tasks in self._tasks:
+            tasks.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = None
+
+    def _startWorkers(self):
+        self._dataset = self.ds
+        self._sequences = list(self.ds._provideSequences())
+        paramdim = self.module.paramdim
+        self._sharedParams = RawArray('d', paramdim)
+        self._sharedGradients = RawArray('d', self.processes * paramdim)
+        self._sharedResults = RawArray('d', self.processes * 2)
+        self._tasks = [Queue() for _ in range(self.processes)]
+        self._done = Queue()
+
+        params = frombuffer(self._sharedParams)
+        params[:] = self.module.params
+        self.module._setParameters(params)
+        if not may_share_memory(self.module.params, params):
+            raise ValueError("The parameters of the module cannot be shared.")
+
+        workers = [Process(target=_work, args=(self, i))
+                   for i in range(self.processes)]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        self._workers = workers
+
+    def _sharedModuleParams(self):
+        """Return the shared parameters, which the workers read, after making
+        sure that the module still uses them: if its parameters were replaced
+        in the meantime (e.g. by ._setParameters(), or by sorting it again),
+        their values are copied into the shared block, which the module uses
+        again; if their number changed, the workers are restarted."""
+        params = frombuffer(self._sharedParams)
+        if self.module.paramdim != len(params):
+            self.close()
+            self._startWorkers()
+            return frombuffer(self._sharedParams)
+        if not may_share_memory(self.module.params, params):
+            params[:] = self.module.params
+            self.module._setParameters(params)
+        return params
+
+    def _distribute(self, shards, asynchronous=False):
+        """Let the workers process the given lists of sequence indices, and
+        return the summed derivatives, error and ponderation."""
+        for index, shard in enumerate(shards):
+            self._tasks[index].put((asynchronous, shard))
+        for _ in shards:
+            self._done.get()
+        n = len(shards)
+        gradients = frombuffer(self._sharedGradients).reshape(self.processes, -1)
+        results = frombuffer(self._sharedResults).reshape(self.processes, 2)
+        error, ponderation = results[:n].sum(axis=0)
+        return gradients[:n].sum(axis=0), error, ponderation
+
+    def train(self):
+        """Train the associated module for one epoch."""
+        assert len(self.ds) > 0, "Dataset cannot be empty."
+        if self._workers is not None and self._dataset is not self.ds:
+            self.close()
+        if self._workers is None:
+            self._startWorkers()
+        params = self._sharedModuleParams()
+        order = list(range(len(self._sequences)))
+        shuffle(order)
+
+        if self.batchlearning or self.asynchronous:
+            shards = [order[i::self.processes] for i in range(self.processes)]
+            shards = [s for s in shards if s]
+            derivs, errors, ponderation = self._distribute(
+                shards, not self.batchlearning)
+            if self.batchlearning:
+                self.module.derivs[:] = derivs
+                params[:] = self.descent(self.module.derivs)
+        else:
+            errors = 0.
+            ponderation = 0.
+            for i in range(0, len(order), self.processes):
+                shards = [[j] for j in order[i:i + self.processes]]
+                derivs, e, p = self._distribute(shards)
+                errors += e
+                ponderation += p
+                self.module.derivs[:] = derivs
+                gradient = self.module.derivs - self.weightdecay * params
+                new = self.descent(gradient, errors)
+                if new is not None:
+                    params[:] = new
+
+        if self.verbose:
+            print("Total error: {z: .12g}".format(z=errors / ponderation))
+        self.epoch += 1
+        self.totalepochs += 1
+        return errors / ponderation
@@ -0,0 +1,55 @@
+"""
+Batches of all linked fields:
+
+    >>> from pybrain.datasets import SupervisedDataSet
+    >>> d = SupervisedDataSet(1, 1)
+    >>> for i in range(5):
+    ...     d.addSample([i], [-i])
+    >>> def show(batches):
+    ...     for inp, target in batches:
+    ...         print('%s %s' % (list(inp.ravel()), list(target.ravel())))
+    >>> show(d.linkedBatches(2))
+    [0.0, 1.0] [0.0, -1.0]
+    [2.0, 3.0] [-2.0, -3.0]
+    [4.0] [-4.0]
+    >>> show(d.linkedBatches(2, last='drop'))
+    [0.0, 1.0] [0.0, -1.0]
+    [2.0, 3.0] [-2.0, -3.0]
+    >>> show(d.linkedBatches(2, permutation=[4, 3, 2, 1, 0], last='pad'))
+    [4.0, 3.0] [-4.0, -3.0]
+    [2.0, 1.0] [-2.0, -1.0]
+    [0.0, 4.0] [0.0, -4.0]
+
+Shuffled, every sample is used once:
+
+    >>> sorted(x for inp, _ in d.linkedBatches(2, shuffled=True)
+    ...        for x in inp.ravel())
+    [0.0, 1.0, 2.0, 3.0, 4.0]
+
+The batches can be prefetched by a background thread:
+
+    >>> show(d.linkedBatches(3, prefetched=2))
+    [0.0, 1.0, 2.0] [0.0, -1.0, -2.0]
+    [3.0, 4.0] [-3.0, -4.0]
+
+If the consumer stops early, the thread ends, even when it is waiting for
+room in the queue to signal the end:
+
+    >>> import threading, time
+    >>> from pybrain.utilities import prefetch
+    >>> before = threading.active_count()
+    >>> items = prefetch([1, 2], size=1)
+    >>> next(items)
+    1
+    >>> time.sleep(0.2)
+    >>> items.close()
+    >>> time.sleep(0.5)
+    >>> threading.active_count() == before
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
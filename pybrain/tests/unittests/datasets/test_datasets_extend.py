@@ -0,0 +1,47 @@
+"""
+Whole arrays of rows can be appended at once, to single fields or to all
+linked fields:
+
+    >>> from scipy import array
+    >>> from pybrain import datasets
+    >>> d = datasets.SupervisedDataSet(2, 1)
+    >>> d.extendLinked([[0, 0], [0, 1]], [[0], [1]])
+    >>> d.extendLinkedChunks(((array([[1, 0]]), array([[1]])),
+    ...                       (array([[1, 1]]), array([[0]]))), capacity=10)
+    >>> len(d), len(d.data['input'])
+    (4, 10)
+    >>> list(d['target'].ravel())
+    [0.0, 1.0, 1.0, 0.0]
+    >>> d.extendLinked([[0, 0]], [[0], [1]])
+    Traceback (most recent call last):
+    ...
+    OutOfSyncError
+
+    >>> u = datasets.dataset.DataSet()
+    >>> u.addField('x', 1)
+    >>> u.extend('x', [1, 2, 3])
+    >>> list(u['x'].ravel())
+    [1.0, 2.0, 3.0]
+
+Compacting removes the free space at the end:
+
+    >>> d.compact()
+    >>> d.data['input'].shape
+    (4, 2)
+    >>> d.addSample([2, 2], [2])
+    >>> list(d['input'][-1])
+    [2.0, 2.0]
+
+This also works if there are views on the fields:
+
+    >>> inputs = d['input']
+    >>> d.compact()
+    >>> d.data['input'].shape
+    (5, 2)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
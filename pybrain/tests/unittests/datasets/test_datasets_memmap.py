@@ -0,0 +1,75 @@
+"""
+Datasets can be kept in memory mapped files:
+
+    >>> import os, tempfile
+    >>> from pybrain.datasets import SupervisedDataSet, SequentialDataSet
+    >>> from pybrain.datasets.dataset import DataSet
+    >>> directory = os.path.join(tempfile.mkdtemp(), 'xor')
+    >>> d = SupervisedDataSet(2, 1)
+    >>> d.addSample([0, 0], [0])
+    >>> d.addSample([0, 1], [1])
+    >>> d.mapToDirectory(directory)
+    >>> d.addSample([1, 0], [1])
+    >>> d.addSample([1, 1], [0])
+    >>> d.flush()
+
+Opening them again only reads a small header:
+
+    >>> e = DataSet.loadFromDirectory(directory)
+    >>> type(e).__name__, len(e), e.indim, e.outdim
+    ('SupervisedDataSet', 4, 2, 1)
+    >>> [list(x) for x in e['input']]
+    [[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]]
+    >>> [list(b.ravel()) for b in e.batches('target', 3)]
+    [[0.0, 1.0, 1.0], [0.0]]
+
+The fields still grow, the files with them:
+
+    >>> for i in range(100):
+    ...     e.addSample([i, i], [i])
+    >>> e.flush()
+    >>> f = SupervisedDataSet.loadFromDirectory(directory, mode='r')
+    >>> len(f), list(f['input'][-1])
+    (104, [99.0, 99.0])
+
+Datasets opened with the mode 'c' can be changed and grown, but the files
+stay as they are:
+
+    >>> c = SupervisedDataSet.loadFromDirectory(directory, mode='c')
+    >>> c['input'][0] = [99, 99]
+    >>> for i in range(10):
+    ...     c.addSample([i, i], [i])
+    >>> c.flush()
+    >>> len(c), list(c['input'][0])
+    (114, [99.0, 99.0])
+    >>> g = SupervisedDataSet.loadFromDirectory(directory)
+    >>> len(g), list(g['input'][0])
+    (104, [0.0, 0.0])
+
+Sequential datasets keep their sequences, and can be used for training:
+
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> from pybrain.supervised.trainers import BackpropTrainer
+    >>> s = SequentialDataSet(1, 1)
+    >>> for i in range(3):
+    ...     s.newSequence()
+    ...     for j in range(i + 2):
+    ...         s.addSample([j], [i])
+    >>> s.mapToDirectory(os.path.join(directory, 'seq'))
+    >>> t = DataSet.loadFromDirectory(os.path.join(directory, 'seq'))
+    >>> t.getNumSequences(), [len(seq) for seq in t._provideSequences()]
+    (3, [2, 3, 4])
+    >>> net = buildNetwork(1, 3, 1, recurrent=True)
+    >>> BackpropTrainer(net, t).train() > 0
+    True
+
+Datasets that are not kept in a directory have nothing to flush:
+
+    >>> SupervisedDataSet(2, 1).flush()
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,72 @@
+"""
+A replay memory keeps a fixed number of transitions, in preallocated arrays;
+the samples of a sequence are linked into transitions as they arrive:
+
+    >>> from scipy import array
+    >>> from numpy import random
+    >>> from pybrain.datasets import ReplayMemory, SumTree
+    >>> m = ReplayMemory(1, 1, capacity=3)
+    >>> for i in range(5):
+    ...     m.addSample([i], [i % 2], float(i))
+    >>> m.newSequence()
+    >>> len(m)
+    3
+    >>> states, actions, rewards, nextstates, nextactions, terminals = m.transitions()
+    >>> list(states.ravel()), list(nextstates.ravel()), list(nextactions.ravel())
+    ([2.0, 3.0, 4.0], [3.0, 4.0, 4.0], [1.0, 0.0, 0.0])
+    >>> list(terminals)
+    [False, False, True]
+    >>> list(m.recent(2)[0].ravel())
+    [4.0, 3.0]
+    >>> [x.shape for x in m.sample(8)]
+    [(8, 1), (8, 1), (8,), (8, 1), (8, 1), (8,)]
+
+A sum tree finds the leaves at which the cumulative priorities pass the given
+values:
+
+    >>> t = SumTree(5)
+    >>> t.update([0, 1, 2, 3, 4], [1., 2., 3., 0., 4.])
+    >>> t.total(), list(t.find([0.5, 1.5, 3.5, 6.5, 9.9]))
+    (10.0, [0, 1, 2, 4, 4])
+
+With it, a prioritized memory draws transitions proportionally to their
+priorities, and gives the weights that correct for it:
+
+    >>> random.seed(0)
+    >>> p = ReplayMemory(1, 1, capacity=4, prioritized=True, alpha=1.)
+    >>> for i in range(4):
+    ...     p.addTransition([i], [0], 0., [i], [0])
+    >>> p.updatePriorities([0, 1, 2, 3], [1., 1., 1., 97.])
+    >>> transitions, indices, weights = p.samplePrioritized(100)
+    >>> sum(indices == 3) > 90, weights.max(), weights.min() < 0.2
+    (True, 1.0, True)
+
+The memory can be the history of a learning agent, for which the value-based
+learners replay minibatches:
+
+    >>> from pybrain.rl.environments.mazes import Maze, MDPMazeTask
+    >>> from pybrain.rl.learners.valuebased import ActionValueTable
+    >>> from pybrain.rl.agents import LearningAgent
+    >>> from pybrain.rl.learners import Q
+    >>> from pybrain.rl.experiments import Experiment
+    >>> envmatrix = array([[1, 1, 1, 1, 1],
+    ...                    [1, 0, 0, 0, 1],
+    ...                    [1, 0, 1, 0, 1],
+    ...                    [1, 1, 1, 1, 1]])
+    >>> table = ActionValueTable(20, 4)
+    >>> table.initialize(0.)
+    >>> memory = ReplayMemory(1, 1, capacity=100, prioritized=True)
+    >>> agent = LearningAgent(table, Q(), history=memory)
+    >>> experiment = Experiment(MDPMazeTask(Maze(envmatrix, (1, 3))), agent)
+    >>> for i in range(50):
+    ...     _ = experiment.doInteractions(10)
+    ...     agent.learn()
+    >>> len(memory), table.params.max() > 1
+    (100, True)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,57 @@
+"""
+Build a dataset with sequences of the lengths 1, 2 and 3:
+
+    >>> from pybrain.datasets import SequentialDataSet
+    >>> d = SequentialDataSet(1, 1)
+    >>> for length in range(1, 4):
+    ...     d.newSequence()
+    ...     for i in range(length):
+    ...         d.addSample([length], [i])
+    >>> d.getNumSequences(), [d.getSequenceLength(i) for i in range(3)]
+    (3, [1, 2, 3])
+    >>> list(d.getSequence(1)[0].ravel())
+    [2.0, 2.0]
+    >>> d.getSequenceLength(3)
+    Traceback (most recent call last):
+    ...
+    IndexError: sequence does not exist.
+
+The marker:
+
+    >>> d.gotoSequence(1)
+    >>> d.getCurrentSequence(), d.endOfSequence(1)
+    (1, False)
+    >>> d.index = 3
+    >>> d.getCurrentSequence(), d.endOfSequence(1)
+    (2, True)
+
+Removing sequences from the front, the back and in between:
+
+    >>> d.newSequence()
+    >>> d.addSample([4], [0])
+    >>> d.removeSequence(0)
+    >>> [d.getSequenceLength(i) for i in range(d.getNumSequences())]
+    [2, 3, 1]
+    >>> d.removeSequence(1)
+    >>> [list(d.getSequence(i)[0].ravel()) for i in range(d.getNumSequences())]
+    [[2.0, 2.0], [4.0]]
+    >>> d.removeSequence(1)
+    >>> len(d), d.getNumSequences()
+    (2, 1)
+
+The dataset keeps growing after removals at the front:
+
+    >>> for i in range(20):
+    ...     d.newSequence()
+    ...     d.addSample([i], [i])
+    ...     d.addSample([i], [i])
+    ...     d.removeSequence(0)
+    >>> len(d), d.getNumSequences(), list(d.getSequence(0)[0].ravel())
+    (2, 1, [19.0, 19.0])
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
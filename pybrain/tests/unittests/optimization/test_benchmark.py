@@ -0,0 +1,63 @@
+"""
+A benchmark runs every algorithm on every function, in every dimension, with
+every seed, and records how many evaluations it took to reach the targets:
+
+    >>> import os, tempfile
+    >>> from pybrain.optimization import CMAES
+    >>> from pybrain.optimization.benchmark import runBenchmark, summarize, \\
+    ...     writeRecords, readRecords
+    >>> from pybrain.rl.environments.functions.bbob2010 import bbob_f1
+    >>> records = runBenchmark([CMAES], [bbob_f1], dimensions=[2], seeds=[0, 1],
+    ...                        budget=200, targets=[10., 1e-3], processes=1)
+    >>> len(records)
+    2
+    >>> r = records[0]
+    >>> r['algorithm'], r['function'], r['dim'], r['seed'], r['numEvaluations'] <= 400
+    ('CMAES', 'bbob_f1', 2, 0, True)
+    >>> [n is not None for n in r['evaluationsToTarget']]
+    [True, True]
+    >>> r['evaluationsToTarget'][0] <= r['evaluationsToTarget'][1] <= r['numEvaluations']
+    True
+    >>> r['optimizerTimePerStep'] > 0
+    True
+
+The runs can be done in parallel, with the same results:
+
+    >>> parallel = runBenchmark([CMAES], [bbob_f1], dimensions=[2], seeds=[0, 1],
+    ...                         budget=200, targets=[10., 1e-3], processes=2)
+    >>> [r['best'] for r in parallel] == [r['best'] for r in records]
+    True
+
+The bounds of the BBOB functions are the same in every dimension, which the
+GA takes as well:
+
+    >>> from pybrain.optimization import GA
+    >>> ga = runBenchmark([GA], [bbob_f1], dimensions=[2], seeds=[0], budget=200,
+    ...                   targets=[10.], processes=1)
+    >>> 'error' in ga[0], ga[0]['numEvaluations'] <= 400, ga[0]['evaluationsToTarget'][0] > 0
+    (False, True, True)
+
+Failing runs are recorded, and left out of the summary, which gives the
+expected number of evaluations to reach each target:
+
+    >>> class Failing(CMAES):
+    ...     def _learnStep(self):
+    ...         raise RuntimeError('failing on purpose')
+    >>> failing = runBenchmark([Failing], [bbob_f1], dimensions=[2], seeds=[0],
+    ...                        processes=1)
+    >>> failing[0]['algorithm'], 'failing on purpose' in failing[0]['error']
+    ('Failing', True)
+    >>> [s['algorithm'] for s in summarize(records + failing)]
+    ['CMAES']
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'results.json')
+    >>> writeRecords(records, filename)
+    >>> readRecords(filename) == records
+    True
+    >>> os.remove(filename)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
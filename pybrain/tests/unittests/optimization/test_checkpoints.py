@@ -0,0 +1,45 @@
+"""
+An optimizer can save its state periodically, and a run resumed from the
+checkpoint continues exactly like the original one:
+
+    >>> import os, tempfile
+    >>> from numpy import random
+    >>> from pybrain.optimization import XNES, GA
+    >>> from pybrain.optimization.optimizer import BlackBoxOptimizer
+    >>> from pybrain.rl.environments.functions.unimodal import SphereFunction
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'xnes.pkl')
+    >>> random.seed(3)
+    >>> xnes = XNES(SphereFunction(3), [1., 2., 3.], checkpointFile=filename,
+    ...             checkpointInterval=10)
+    >>> _ = xnes.learn(10)
+    >>> _ = xnes.learn(5)
+    >>> resumed = BlackBoxOptimizer.loadCheckpoint(filename)
+    >>> resumed.numLearningSteps
+    10
+    >>> _ = resumed.learn(5)
+    >>> (resumed._center == xnes._center).all(), resumed._allEvaluations == xnes._allEvaluations
+    (True, True)
+
+Evaluators that cannot be pickled (like this lambda) are not saved, and have
+to be given again:
+
+    >>> f = lambda x: -sum(x ** 2)
+    >>> ga = GA(f, [1., 2.], checkpointFile=filename, checkpointInterval=3,
+    ...         storeAllEvaluations=True)
+    >>> _ = ga.learn(3)
+    >>> _ = ga.learn(2)
+    >>> BlackBoxOptimizer.loadCheckpoint(filename)
+    Traceback (most recent call last):
+      ...
+    ValueError: The evaluator could not be saved, please provide it.
+    >>> resumed = BlackBoxOptimizer.loadCheckpoint(filename, f)
+    >>> _ = resumed.learn(2)
+    >>> resumed._allEvaluations == ga._allEvaluations
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == '__main__':
+    runModuleTestSuite(__import__('__main__'))
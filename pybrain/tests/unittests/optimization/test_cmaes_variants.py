@@ -0,0 +1,38 @@
+"""
+With a lazy decomposition, CMA-ES only decomposes the covariance matrix
+every few generations, but still solves ill-conditioned problems:
+
+    >>> from numpy import random
+    >>> from pybrain.optimization import CMAES, SepCMAES, LMMAES
+    >>> from pybrain.rl.environments.functions.unimodal import ElliFunction, SphereFunction
+    >>> random.seed(3)
+    >>> cmaes = CMAES(ElliFunction(10), random.randn(10), lazyDecomposition=1.)
+    >>> cmaes.learn()[1] < 1e-8
+    True
+    >>> cmaes.numLearningSteps > cmaes.lazyDecomposition / cmaes.covLearningRate / 10 > 2
+    True
+
+The separable variant only adapts the variances, and is faster on separable
+problems:
+
+    >>> sep = SepCMAES(ElliFunction(10), random.randn(10))
+    >>> sep.learn()[1] < 1e-8, sep.numEvaluations < cmaes.numEvaluations
+    (True, True)
+    >>> sep.C.shape
+    (10,)
+
+The limited-memory variant only keeps a few search directions, so both need
+memory linear in the dimension:
+
+    >>> lm = LMMAES(SphereFunction(50), random.randn(50))
+    >>> lm.learn()[1] < 1e-8
+    True
+    >>> lm.directions.shape == (lm.numDirections, 50)
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == '__main__':
+    runModuleTestSuite(__import__('__main__'))
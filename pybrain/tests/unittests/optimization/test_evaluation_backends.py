@@ -0,0 +1,67 @@
+"""
+Evaluating the candidates in parallel gives the same runs as evaluating them
+one by one:
+
+    >>> import random
+    >>> from numpy import random as nprandom
+    >>> from pybrain.optimization import CMAES, GA
+    >>> from pybrain.optimization.evaluation import ThreadEvaluation, \\
+    ...     ProcessEvaluation, SocketEvaluation
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> def run(algorithm, evaluator, evaluable, backend=None):
+    ...     random.seed(42)
+    ...     nprandom.seed(42)
+    ...     optimizer = algorithm(evaluator, evaluable, evaluationBackend=backend,
+    ...                           maxEvaluations=200, storeAllEvaluations=True)
+    ...     best = optimizer.learn()
+    ...     return (list(best[0].params if hasattr(best[0], 'params') else best[0]),
+    ...             best[1], optimizer.numEvaluations, optimizer._allEvaluations)
+    >>> f = lambda x: -sum(x ** 2)
+    >>> serial = run(CMAES, f, [1., 2., 3.])
+    >>> backends = [ThreadEvaluation(3), ProcessEvaluation(2),
+    ...             SocketEvaluation(2)]
+    >>> [run(CMAES, f, [1., 2., 3.], b) == serial for b in backends]
+    [True, True, True]
+    >>> run(GA, f, [1., 2.], backends[1]) == run(GA, f, [1., 2.])
+    True
+
+Also for modules, whose parameters are handed to copies in the workers:
+
+    >>> net = buildNetwork(1, 2, 1)
+    >>> g = lambda net: -abs(net.activate([1.])[0] - 3)
+    >>> serial = run(CMAES, g, net)
+    >>> [run(CMAES, g, net, b) == serial for b in backends]
+    [True, True, True]
+
+Divergence is detected at the same evaluation:
+
+    >>> from pybrain.utilities import DivergenceError
+    >>> h = lambda x: float('nan') if x[0] > 0.5 else -x[0] ** 2
+    >>> def diverge(backend):
+    ...     nprandom.seed(1)
+    ...     optimizer = CMAES(h, [0., 0.], evaluationBackend=backend)
+    ...     try:
+    ...         optimizer._learnStep()
+    ...     except DivergenceError:
+    ...         return optimizer.numEvaluations, optimizer.bestEvaluation
+    >>> diverge(backends[0]) == diverge(None) != None
+    True
+    >>> for backend in backends:
+    ...     backend.close()
+
+Sockets are authenticated with a secret key, which is random for locally
+started workers, and has to be given for the others:
+
+    >>> len(backends[2].authkey), backends[2].authkey != SocketEvaluation(2).authkey
+    (32, True)
+    >>> SocketEvaluation(2, startWorkers=False)
+    Traceback (most recent call last):
+    ...
+    ValueError: The authkey has to be given, for workers started elsewhere.
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,53 @@
+"""
+With a fitness cache, candidates that were evaluated before are not
+evaluated again, which does not change the run:
+
+    >>> import random
+    >>> from numpy import random as nprandom, array
+    >>> from pybrain.optimization import GA, CMAES
+    >>> from pybrain.rl.environments.functions.unimodal import SphereFunction
+    >>> calls = []
+    >>> def f(x):
+    ...     calls.append(x)
+    ...     return -sum(x ** 2)
+    >>> def run(fitnessCacheSize=None):
+    ...     random.seed(1)
+    ...     nprandom.seed(1)
+    ...     del calls[:]
+    ...     ga = GA(f, [1., 2.], fitnessCacheSize=fitnessCacheSize,
+    ...             maxEvaluations=500, storeAllEvaluations=True)
+    ...     ga.learn()
+    ...     return ga
+    >>> plain = run()
+    >>> len(calls), plain.cacheHits, plain.cacheMisses
+    (500, 0, 0)
+    >>> cached = run(1000)
+    >>> len(calls) == cached.cacheMisses, cached.cacheHits + cached.cacheMisses
+    (True, 500)
+    >>> 0 < len(calls) < 500
+    True
+    >>> cached._allEvaluations == plain._allEvaluations
+    True
+
+The least recently used fitnesses are forgotten, and repeated candidates
+in a batch are only evaluated once:
+
+    >>> cmaes = CMAES(SphereFunction(2), [1., 2.], fitnessCacheSize=2)
+    >>> x, y, z = array([1., 1.]), array([2., 2.]), array([3., 3.])
+    >>> cmaes._batchEvaluation([x, y, x, y])
+    [2.0, 8.0, 2.0, 8.0]
+    >>> cmaes.cacheHits, cmaes.cacheMisses
+    (2, 2)
+    >>> _ = cmaes._batchEvaluation([x, z])
+    >>> list(cmaes._fitnessCache.values())
+    [2.0, 18.0]
+    >>> _ = cmaes._oneEvaluation(y)
+    >>> cmaes.cacheHits, cmaes.cacheMisses, cmaes.numEvaluations
+    (3, 4, 7)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,80 @@
+"""
+A bounded history keeps only the last entries, but they keep their indices:
+
+    >>> from pybrain.optimization.history import RingHistory, ArrayHistory, \\
+    ...     MemmapHistory
+    >>> h = RingHistory(3)
+    >>> for i in range(5):
+    ...     h.append('x%d' % i)
+    >>> len(h), h.first, h[4], h[-1], h[2]
+    (5, 2, 'x4', 'x4', 'x2')
+    >>> list(h), h[-2:], h[:3]
+    (['x2', 'x3', 'x4'], ['x3', 'x4'], ['x2'])
+    >>> h[1]
+    Traceback (most recent call last):
+      ...
+    IndexError: history entry 1 is not stored.
+
+Arrays are stored in a single preallocated array:
+
+    >>> a = ArrayHistory(4).new('evaluations')
+    >>> for i in range(6):
+    ...     a.append([i, -i])
+    >>> a[5], a[-3:]
+    (array([ 5, -5]), array([[ 3, -3],
+           [ 4, -4],
+           [ 5, -5]]))
+    >>> a[3] = [0, 0]
+    >>> list(a[2:4].ravel())
+    [2, -2, 0, 0]
+
+And a memory mapped history keeps everything on disk:
+
+    >>> import os, pickle, tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> m = MemmapHistory(directory, capacity=2).new('fitnesses')
+    >>> for i in range(5):
+    ...     m.append(i * 0.5)
+    >>> m[0], m[4], len(m), list(m[1:3])
+    (0.0, 2.0, 5, [0.5, 1.0])
+    >>> [f.startswith('fitnesses-') and f.endswith('.dat') for f in os.listdir(directory)]
+    [True]
+    >>> list(pickle.loads(pickle.dumps(m)))
+    [0.0, 0.5, 1.0, 1.5, 2.0]
+
+Every store has a file of its own, also when they are given the same name:
+
+    >>> n = MemmapHistory(directory, capacity=2).new('fitnesses')
+    >>> n.append(7.)
+    >>> len(os.listdir(directory)), n.filename != m.filename
+    (2, True)
+    >>> list(m), list(n)
+    ([0.0, 0.5, 1.0, 1.5, 2.0], [7.0])
+
+An optimizer run with a bounded history is the same as with the lists:
+
+    >>> import random
+    >>> from numpy import random as nprandom
+    >>> from pybrain.optimization import XNES
+    >>> from pybrain.rl.environments.functions.unimodal import SphereFunction
+    >>> def run(historyStore=None):
+    ...     random.seed(5)
+    ...     nprandom.seed(5)
+    ...     xnes = XNES(SphereFunction(3), [1., 2., 3.], importanceMixing=True,
+    ...                 historyStore=historyStore, maxLearningSteps=20)
+    ...     xnes.learn()
+    ...     return xnes
+    >>> lists, bounded = run(), run(ArrayHistory(100))
+    >>> (lists._center == bounded._center).all()
+    True
+    >>> len(bounded._allEvaluations) == len(lists._allEvaluations) > 100
+    True
+    >>> list(bounded._allEvaluations[-100:]) == lists._allEvaluations[-100:]
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
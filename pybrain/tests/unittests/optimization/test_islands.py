@@ -0,0 +1,71 @@
+"""
+An island model runs several optimizers, here in separate processes, and
+gathers the best they found:
+
+    >>> import random
+    >>> from numpy import random as nprandom, array
+    >>> from pybrain.optimization import IslandModel, GA, HillClimber, ES
+    >>> from pybrain.optimization.populationbased.pso import fullyConnected
+    >>> from pybrain.rl.environments.functions.unimodal import SphereFunction
+    >>> random.seed(1)
+    >>> nprandom.seed(1)
+    >>> f = lambda x: -sum(x ** 2)
+    >>> islands = IslandModel(f, [1., 2.], algorithm=GA, numIslands=3,
+    ...                       migrationInterval=5)
+    >>> best, fitness = islands.learn(2)
+    >>> islands.numEvaluations
+    300
+    >>> fitness == f(best) > -0.1
+    True
+    >>> islands.close()
+
+The direction of the optimization is handled by the islands:
+
+    >>> islands = IslandModel(SphereFunction(3), algorithm=ES, numIslands=2,
+    ...                       topology=fullyConnected,
+    ...                       islandArgs={'mu': 5, 'lambada': 10})
+    >>> best, fitness = islands.learn(3)
+    >>> islands.minimize, fitness < 0.1
+    (True, True)
+    >>> islands.close()
+
+Errors in the islands are raised here, with their tracebacks:
+
+    >>> import os
+    >>> master = os.getpid()
+    >>> def broken(x):
+    ...     if os.getpid() != master:
+    ...         raise IOError('evaluator unavailable')
+    ...     return f(x)
+    >>> islands = IslandModel(broken, [1., 2.], algorithm=HillClimber, numIslands=2)
+    >>> try:
+    ...     islands.learn(1)
+    ... except RuntimeError as e:
+    ...     print('Island 1 failed' in str(e) and 'evaluator unavailable' in str(e))
+    True
+    >>> islands.close()
+
+Migrants replace the worst individuals of populations, and otherwise become
+the best found, if they are better:
+
+    >>> islands = IslandModel(f, [1., 2.], algorithm=HillClimber, numIslands=3,
+    ...                       useProcesses=False)
+    >>> _ = islands.learn(1)
+    >>> first = islands.islands[0]
+    >>> first._immigrate([(first.bestEvaluable.copy(), 1.)])
+    >>> first.bestEvaluation
+    1.0
+    >>> ga = GA(f, [1., 2.])
+    >>> _ = ga.learn(1)
+    >>> [fitness for _, fitness in ga._emigrants(3)] == sorted(ga.fitnesses)[:-4:-1]
+    True
+    >>> ga._immigrate([(array([0., 0.]), 0.)])
+    >>> list(ga.currentpop[-1]), ga.bestEvaluation
+    ([0.0, 0.0], 0.0)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
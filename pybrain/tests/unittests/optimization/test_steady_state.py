@@ -0,0 +1,44 @@
+"""
+In the steady-state mode, the children are evaluated asynchronously and
+integrated one by one, as their results arrive:
+
+    >>> import random, time
+    >>> from numpy import random as nprandom
+    >>> from pybrain.optimization import GA, ES
+    >>> from pybrain.optimization.evaluation import ThreadEvaluation
+    >>> random.seed(2)
+    >>> nprandom.seed(2)
+    >>> f = lambda x: -sum(x ** 2)
+    >>> ga = GA(f, [1., 2.], asynchronous=True, maxEvaluations=300)
+    >>> best, fitness = ga.learn()
+    >>> ga.numEvaluations, fitness > -0.01
+    (300, True)
+    >>> es = ES(f, [1., 2.], asynchronous=True, mu=5, lambada=10,
+    ...         maxEvaluations=300, evaluationBackend=ThreadEvaluation(3))
+    >>> best, fitness = es.learn()
+    >>> es.numEvaluations, fitness > -0.01
+    (300, True)
+    >>> es.evaluationBackend.close()
+
+Evaluations that take too long are counted as failed, and the search goes on
+without waiting for them:
+
+    >>> calls = []
+    >>> def slow(x):
+    ...     calls.append(x)
+    ...     time.sleep(2. if len(calls) == 20 else 0.01)
+    ...     return -sum(x ** 2)
+    >>> backend = ThreadEvaluation(2)
+    >>> ga = GA(slow, [1., 2.], asynchronous=True, evaluationBackend=backend,
+    ...         evaluationTimeout=0.5, maxEvaluations=150)
+    >>> _ = ga.learn()
+    >>> ga.numFailedEvaluations, ga.numEvaluations
+    (1, 149)
+    >>> backend.close()
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
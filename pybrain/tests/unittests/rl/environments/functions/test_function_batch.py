@@ -0,0 +1,44 @@
+"""
+All the benchmark functions can evaluate a whole population (the rows of a
+matrix) at once, with the same results as evaluating the points one by one:
+
+    >>> from numpy import random, allclose
+    >>> from pybrain.rl.environments.functions.bbob2010 import bbob_collection
+    >>> from pybrain.rl.environments.functions.unimodal import RosenbrockFunction
+    >>> from pybrain.rl.environments.functions.transformations import \\
+    ...     TranslateFunction, RotateFunction, oppositeFunction
+    >>> def same(f):
+    ...     X = random.randn(10, f.xdim)
+    ...     values = [f.f(x) for x in X.copy()]
+    ...     return allclose(f.f_batch(X), values, rtol=1e-8)
+    >>> random.seed(0)
+    >>> all(same(bbob(5)) for bbob in bbob_collection)
+    True
+    >>> f = RosenbrockFunction(4)
+    >>> same(TranslateFunction(f)), same(RotateFunction(f)), same(oppositeFunction(f))
+    (True, True, True)
+
+Optimizers give the function all the candidates of a generation together,
+which changes the run only by rounding errors:
+
+    >>> from pybrain.optimization import CMAES
+    >>> from pybrain.rl.environments.functions.function import FunctionEnvironment
+    >>> from pybrain.rl.environments.functions.unimodal import SphereFunction
+    >>> class PointwiseSphere(SphereFunction):
+    ...     f_batch = FunctionEnvironment.f_batch
+    >>> def run(f):
+    ...     random.seed(42)
+    ...     optimizer = CMAES(f, [0.5] * 4, maxEvaluations=300,
+    ...                       storeAllEvaluations=True)
+    ...     best = optimizer.learn()
+    ...     return optimizer._allEvaluations + list(best[0])
+    >>> batched, pointwise = run(SphereFunction(4)), run(PointwiseSphere(4))
+    >>> len(batched) == len(pointwise) and allclose(batched, pointwise)
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == '__main__':
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,60 @@
+"""
+The cart pole is integrated with a fixed step of the 4th order Runge-Kutta
+method, here on x' = x:
+
+    >>> from scipy import random, array, exp, zeros
+    >>> from pybrain.rl.environments.cartpole.cartpole import rk4
+    >>> abs(rk4(lambda x: x, 1., 0.1) - exp(0.1)) < 1e-7
+    True
+
+A batch of cart poles is advanced at once, and follows the same trajectories
+as the single ones, when started with the same random seed:
+
+    >>> from pybrain.rl.environments.cartpole import CartPoleEnvironment, \\
+    ...     CartPoleBatchEnvironment, BalanceTask
+    >>> random.seed(1)
+    >>> single = [CartPoleEnvironment() for _ in range(3)]
+    >>> random.seed(1)
+    >>> batch = CartPoleBatchEnvironment(3)
+    >>> for forces in random.uniform(-10, 10, (50, 3)):
+    ...     batch.performAction(forces)
+    ...     for env, force in zip(single, forces):
+    ...         env.performAction(force)
+    >>> (batch.getSensors() == array([env.getSensors() for env in single])).all()
+    True
+    >>> batch.getPoleAngles().shape, batch.getCartPosition().shape
+    ((3, 1), (3,))
+    >>> batch.reset([0])
+    >>> abs(batch.getSensors()[0, 0]) <= 0.2, batch.getSensors()[0, 1]
+    (True, 0.0)
+
+The tasks use the single environments as before:
+
+    >>> task = BalanceTask(CartPoleEnvironment(), 10)
+    >>> task.reset()
+    >>> while not task.isFinished():
+    ...     task.performAction(array([0.]))
+    >>> task.t
+    10
+
+The classic control tasks advance many systems at once in the same way as
+they advance a single one:
+
+    >>> from pybrain.rl.environments.classic.acrobot import AcrobotTask
+    >>> from pybrain.rl.environments.classic.mountaincar import MountainCar
+    >>> acrobot = AcrobotTask()
+    >>> states = random.uniform(-1, 1, (4, 4))
+    >>> after = acrobot.dynamics(states, [-1., 0., 1., 1.])
+    >>> after[2].tolist() == acrobot.DoAction(2, list(states[2]))
+    True
+    >>> car = MountainCar()
+    >>> after = car.dynamics([[-1.39, -0.07], [0.2, 0.01]], [-1., 1.])
+    >>> after[0].tolist(), after[1].tolist() == car.DoAction(2, [0.2, 0.01])
+    ([-1.4, 0.0], True)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
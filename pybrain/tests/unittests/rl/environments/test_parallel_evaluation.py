@@ -0,0 +1,48 @@
+"""
+A parallel episodic evaluator averages the total reward of a module over
+several episodes, which are distributed over worker processes:
+
+    >>> from functools import partial
+    >>> from scipy import random
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> from pybrain.rl.environments import ParallelEpisodicEvaluator
+    >>> from pybrain.rl.environments.cartpole import BalanceTask
+    >>> net = buildNetwork(4, 1, bias=False)
+    >>> random.seed(0)
+    >>> X = random.randn(6, net.paramdim)
+    >>> task = partial(BalanceTask, maxsteps=50)
+    >>> parallel = ParallelEpisodicEvaluator(task, net, batchSize=3, processes=2)
+    >>> rewards = parallel.f_batch(X)
+    >>> rewards.shape, parallel.numEpisodes
+    ((6,), 18)
+
+Every episode has its own random seed, so the results are the same without
+the workers, and the random generators of this process are not disturbed:
+
+    >>> serial = ParallelEpisodicEvaluator(task, net, batchSize=3, processes=1)
+    >>> state = random.get_state()[1].copy()
+    >>> (serial.f_batch(X) == rewards).all()
+    True
+    >>> (random.get_state()[1] == state).all()
+    True
+
+Modules are evaluated with their parameters; optimizers give the evaluator
+the parameters of whole populations at once:
+
+    >>> net._setParameters(X[2])
+    >>> parallel.numEpisodes = 6
+    >>> parallel.f(net) == rewards[2]
+    True
+    >>> from pybrain.optimization import CMAES
+    >>> optimizer = CMAES(parallel, net, maxEvaluations=20)
+    >>> _ = optimizer.learn()
+    >>> parallel.numEpisodes - 9 == 3 * optimizer.numEvaluations
+    True
+    >>> parallel.close()
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,42 @@
+"""
+A vectorized experiment runs the episodes on several copies of a task at once,
+activating the module of the agent on the observations of all of them together:
+
+    >>> from scipy import random
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> from pybrain.rl.environments.simple import SimpleEnvironment, MinimizeTask
+    >>> from pybrain.rl.agents import LearningAgent
+    >>> from pybrain.rl.learners import ENAC
+    >>> from pybrain.rl.experiments import VectorizedEpisodicExperiment
+    >>> random.seed(0)
+    >>> tasks = [MinimizeTask(SimpleEnvironment(3)) for _ in range(3)]
+    >>> tasks[0].N = 2
+    >>> agent = LearningAgent(buildNetwork(3, 3, bias=False), ENAC())
+    >>> experiment = VectorizedEpisodicExperiment(tasks, agent)
+    >>> rewards = experiment.doEpisodes(5)
+
+A copy starts its next episode as soon as the last one is over, so the short
+episodes of the first copy are done in the meantime. The rewards are given in
+the order in which the episodes were started:
+
+    >>> [len(r) for r in rewards]
+    [2, 15, 15, 2, 2]
+    >>> experiment.stepid
+    15
+
+Every episode becomes one sequence in the history of the agent, in the order
+in which the episodes were finished, and the log likelihoods of the learner
+stay aligned with it:
+
+    >>> history = agent.history
+    >>> [history.getSequenceLength(i) for i in range(history.getNumSequences())]
+    [2, 2, 2, 15, 15]
+    >>> len(agent.learner.loglh) == len(history) == 36
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
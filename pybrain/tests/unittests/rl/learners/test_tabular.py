@@ -0,0 +1,61 @@
+"""
+The tabular learners apply their TD updates in batches, over index arrays, but
+in the same order and with the same results as one update after the other:
+
+    >>> from numpy import random
+    >>> from pybrain.datasets import ReinforcementDataSet
+    >>> from pybrain.rl.learners.valuebased import ActionValueTable, Q, SARSA
+    >>> random.seed(0)
+    >>> d = ReinforcementDataSet(1, 1)
+    >>> for i in range(3000):
+    ...     if i % 100 == 0:
+    ...         d.newSequence()
+    ...     d.addSample([random.randint(50)], [random.randint(4)], random.normal())
+    >>> def oneByOne(values, greedy, alpha=0.5, gamma=0.99):
+    ...     for seq in d:
+    ...         seq = list(seq)
+    ...         for (s, a, r), (s_, a_, _) in zip(seq, seq[1:]):
+    ...             s, a, s_, a_ = int(s), int(a), int(s_), int(a_)
+    ...             nextvalue = max(values[s_]) if greedy else values[s_, a_]
+    ...             values[s, a] = values[s, a] + alpha * (r + gamma * nextvalue - values[s, a])
+    ...     return values
+    >>> initial = random.normal(size=(50, 4))
+    >>> for learner, greedy in [(Q(), True), (SARSA(), False)]:
+    ...     table = ActionValueTable(50, 4)
+    ...     table.params[:] = initial.ravel()
+    ...     learner.module = table
+    ...     learner.dataset = d
+    ...     learner.learn()
+    ...     print((table.params.reshape(50, 4) == oneByOne(initial.copy(), greedy)).all())
+    True
+    True
+
+Consecutive updates that do not depend on each other, as along a path that
+visits every state once, are applied at once:
+
+    >>> from pybrain.rl.learners.valuebased.tabular import tdUpdates, _blockStarts
+    >>> states = random.permutation(1000)
+    >>> actions = states % 2
+    >>> rewards = random.normal(size=999)
+    >>> _blockStarts(states[:-1], actions[:-1], states[1:], actions[1:], 2, False)
+    [0]
+    >>> table = ActionValueTable(1000, 2)
+    >>> table.initialize(0.)
+    >>> tderrors = tdUpdates(table, states[:-1], actions[:-1], rewards,
+    ...                      states[1:], actions[1:], 0.1, 0.9, greedy=False)
+    >>> reference = ActionValueTable(1000, 2)
+    >>> reference.initialize(0.)
+    >>> for k in range(999):
+    ...     q = reference.getValue(states[k], actions[k])
+    ...     tderror = rewards[k] + 0.9 * reference.getValue(states[k + 1], actions[k + 1]) - q
+    ...     reference.updateValue(states[k], actions[k], q + 0.1 * tderror)
+    ...     assert tderror == tderrors[k]
+    >>> (reference.params == table.params).all()
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,58 @@
+"""
+
+Build a network and record some activations and input errors:
+
+    >>> from scipy import array
+    >>> from pybrain.structure import TanhLayer, SoftmaxLayer
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> n = buildNetwork(3, 5, 4, 2, hiddenclass=TanhLayer,
+    ...                  outclass=SoftmaxLayer, bias=True)
+    >>> inputs = [array([1., 2., -1.]), array([0.5, -3., 2.])]
+    >>> outerr = array([0.2, -0.4])
+    >>> outputs = [n.activate(x) for x in inputs]
+    >>> inerr = n.backActivate(outerr)
+    >>> derivs = n.derivs.copy()
+
+The compiled network does exactly the same:
+
+    >>> n.compile()
+    >>> n.resetDerivatives()
+    >>> [(n.activate(x) == y).all() for x, y in zip(inputs, outputs)]
+    [True, True]
+    >>> (n.backActivate(outerr) == inerr).all()
+    True
+    >>> (n.derivs == derivs).all()
+    True
+
+Also after the buffers have been reallocated, and on copies:
+
+    >>> n._resetBuffers(3)
+    >>> (n.activate(inputs[1]) == outputs[1]).all()
+    True
+    >>> (n.copy().activate(inputs[1]) == outputs[1]).all()
+    True
+
+The gradient of a compiled network is still correct:
+
+    >>> from pybrain.tests import gradientCheck
+    >>> n = buildNetwork(3, 5, 2, hiddenclass=TanhLayer, bias=True)
+    >>> n.compile()
+    >>> gradientCheck(n)
+    Perfect gradient
+    True
+
+Other networks have no plan, and compiling them does nothing:
+
+    >>> r = buildNetwork(2, 3, 1, recurrent=True)
+    >>> output = r.activate([1, 2])
+    >>> r.reset()
+    >>> r.compile()
+    >>> (r.activate([1, 2]) == output).all()
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,97 @@
+"""
+
+Build a recurrent network with a recurrent hidden layer, and a dataset of
+sequences of different lengths:
+
+    >>> from scipy import random, array
+    >>> from pybrain.structure import TanhLayer, FullConnection
+    >>> from pybrain.datasets import SequentialDataSet
+    >>> from pybrain.supervised.trainers import BackpropTrainer
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> n = buildNetwork(2, 4, 3, 1, hiddenclass=TanhLayer, recurrent=True)
+    >>> n.addRecurrentConnection(FullConnection(n['hidden0'], n['hidden0']))
+    >>> n.sortModules()
+    >>> d = SequentialDataSet(2, 1)
+    >>> for length in [4, 2, 4, 4, 1]:
+    ...     d.newSequence()
+    ...     for _ in range(length):
+    ...         d.addSample(random.randn(2), random.randn(1))
+
+Propagating the sequences one timestep at a time, and whole sequences at once,
+several of them together, gives the same outputs:
+
+    >>> inputs = [d.getSequence(i)[0] for i in [0, 2, 3]]
+    >>> outputs = []
+    >>> for inp in inputs:
+    ...     n.reset()
+    ...     outputs.append([n.activate(x) for x in inp])
+    >>> together = n.activateSequences(array(inputs).swapaxes(0, 1))
+    >>> abs(together.swapaxes(0, 1) - outputs).max() < 1e-12
+    True
+
+And the same gradient:
+
+    >>> trainer = BackpropTrainer(n, d)
+    >>> n.resetDerivatives()
+    >>> for seq in d._provideSequences():
+    ...     _ = trainer._calcDerivs(seq)
+    >>> derivs = n.derivs.copy()
+    >>> batchtrainer = BackpropTrainer(n, d, batchsize=2)
+    >>> n.resetDerivatives()
+    >>> for batch in batchtrainer._provideBatches(d, shuffled=True):
+    ...     _ = batchtrainer._calcDerivsBatch(batch)
+    >>> abs(derivs - n.derivs).max() < 1e-12
+    True
+
+This also holds for LSTM layers, with and without peepholes:
+
+    >>> from pybrain.structure import LSTMLayer
+    >>> for peepholes in [False, True]:
+    ...     n = buildNetwork(2, 3, 1, hiddenclass=LSTMLayer, recurrent=True,
+    ...                      peepholes=peepholes)
+    ...     trainer = BackpropTrainer(n, d)
+    ...     n.resetDerivatives()
+    ...     for seq in d._provideSequences():
+    ...         _ = trainer._calcDerivs(seq)
+    ...     derivs = n.derivs.copy()
+    ...     batchtrainer = BackpropTrainer(n, d, batchsize=3)
+    ...     n.resetDerivatives()
+    ...     for batch in batchtrainer._provideBatches(d):
+    ...         _ = batchtrainer._calcDerivsBatch(batch)
+    ...     print(abs(derivs - n.derivs).max() < 1e-12)
+    True
+    True
+
+Sequential modules that can only process one sequence at a time get the
+sequences of a batch one by one, with the same gradient:
+
+    >>> from pybrain.structure.modules.module import Module
+    >>> class OneByOneLSTMLayer(LSTMLayer):
+    ...     def supportsSequenceBlocks(self):
+    ...         return False
+    ...     def forwardBlock(self, t, n):
+    ...         Module.forwardBlock(self, t, n)
+    ...     def backwardBlock(self, t, n):
+    ...         Module.backwardBlock(self, t, n)
+    >>> n = buildNetwork(2, 3, 1, hiddenclass=OneByOneLSTMLayer, recurrent=True)
+    >>> n.supportsSequenceBlocks()
+    False
+    >>> batchtrainer = BackpropTrainer(n, d, batchsize=3)
+    >>> n.resetDerivatives()
+    >>> for batch in batchtrainer._provideBatches(d):
+    ...     _ = batchtrainer._calcDerivsBatch(batch)
+    >>> derivs = n.derivs.copy()
+    >>> n.resetDerivatives()
+    >>> for seq in d._provideSequences():
+    ...     _ = BackpropTrainer(n, d)._calcDerivs(seq)
+    >>> abs(derivs - n.derivs).max() < 1e-12
+    True
+    >>> batchtrainer.train() > 0, batchtrainer.testOnData() > 0
+    (True, True)
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
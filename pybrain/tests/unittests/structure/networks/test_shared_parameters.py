@@ -0,0 +1,77 @@
+"""
+The parameters of a network can be moved into shared memory:
+
+    >>> import os, tempfile
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> net = buildNetwork(2, 3, 1)
+    >>> output = net.activate([1, 2])
+    >>> params = net.params.copy()
+    >>> net.shareParameters()
+    >>> (net.params == params).all()
+    True
+    >>> (net.activate([1, 2]) == output).all()
+    True
+
+Forked processes see all changes made by the parent afterwards, and the other
+way round:
+
+    >>> import multiprocessing
+    >>> def double():
+    ...     net.params[:] *= 2
+    >>> net.params[:] = 1
+    >>> child = multiprocessing.Process(target=double)
+    >>> child.start(); child.join()
+    >>> list(net.params[:3])
+    [2.0, 2.0, 2.0]
+
+Also after the network is sorted again, with the processes forked before:
+
+    >>> queue = multiprocessing.Queue()
+    >>> def report():
+    ...     queue.get()
+    ...     queue.put(net.params[0])
+    >>> child = multiprocessing.Process(target=report)
+    >>> child.start()
+    >>> net.sorted = False
+    >>> net.sortModules()
+    >>> net.params[0] = 3
+    >>> queue.put(None); child.join()
+    >>> queue.get()
+    3.0
+
+Other networks of the same structure can attach to parameters kept in a file:
+
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'weights')
+    >>> net.shareParameters(filename, derivatives=True)
+    >>> other = buildNetwork(2, 3, 1)
+    >>> other.attachParameters(filename, derivatives=True)
+    >>> net.params[0] = 5
+    >>> other.params[0]
+    5.0
+    >>> other.derivs[:] = 1
+    >>> net.derivs[-1]
+    1.0
+
+The parameters stay shared when the network is sorted again, but copies have
+their own:
+
+    >>> net.sorted = False
+    >>> net.sortModules()
+    >>> net.params[0]
+    5.0
+    >>> other.sorted = False
+    >>> other.sortModules()
+    >>> net.params[0] = 6
+    >>> other.params[0]
+    6.0
+    >>> copy = net.copy()
+    >>> copy.params[0] = 7
+    >>> net.params[0]
+    6.0
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
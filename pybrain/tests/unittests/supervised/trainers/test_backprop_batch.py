@@ -0,0 +1,52 @@
+"""
+Propagating the samples as batches through a feed-forward network gives the
+same results as propagating them one by one.
+
+    >>> from scipy import random
+    >>> from pybrain.datasets import SupervisedDataSet
+    >>> from pybrain.supervised.trainers import BackpropTrainer
+    >>> from pybrain.structure import TanhLayer, SoftmaxLayer
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> net = buildNetwork(3, 7, 5, 2, hiddenclass=TanhLayer,
+    ...                    outclass=SoftmaxLayer, bias=True)
+    >>> dataset = SupervisedDataSet(3, 2)
+    >>> for i in range(53):
+    ...     dataset.addSample(random.randn(3), random.rand(2))
+
+The outputs:
+
+    >>> single = [net.activate(x) for x in dataset['input']]
+    >>> abs(net.activateOnDataset(dataset) - single).max() < 1e-12
+    True
+
+The gradients, with the batch size not dividing the dataset length:
+
+    >>> trainer = BackpropTrainer(net, dataset)
+    >>> net.resetDerivatives()
+    >>> for seq in dataset._provideSequences():
+    ...     _ = trainer._calcDerivs(seq)
+    >>> derivs = net.derivs.copy()
+    >>> batchtrainer = BackpropTrainer(net, dataset, batchsize=10)
+    >>> net.resetDerivatives()
+    >>> for batch in batchtrainer._provideBatches(dataset, shuffled=True):
+    ...     _ = batchtrainer._calcDerivsBatch(batch)
+    >>> abs(derivs - net.derivs).max() < 1e-12
+    True
+
+And the error on the dataset:
+
+    >>> abs(trainer.testOnData() - batchtrainer.testOnData()) < 1e-12
+    True
+
+Batches can also come straight from another source:
+
+    >>> batches = dataset.linkedBatches(10, shuffled=True, prefetched=1)
+    >>> batchtrainer.trainOnBatches(batches) > 0
+    True
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,66 @@
+"""
+Distributing the sequences over several processes does not change the
+gradient of batch learning.
+
+    >>> from scipy import random
+    >>> from pybrain.datasets import SupervisedDataSet
+    >>> from pybrain.supervised.trainers import BackpropTrainer, \\
+    ...     ParallelBackpropTrainer
+    >>> from pybrain.structure import TanhLayer
+    >>> from pybrain.tools.shortcuts import buildNetwork
+    >>> net = buildNetwork(3, 7, 2, hiddenclass=TanhLayer, bias=True)
+    >>> dataset = SupervisedDataSet(3, 2)
+    >>> for i in range(23):
+    ...     dataset.addSample(random.randn(3), random.randn(2))
+    >>> start = net.params.copy()
+
+    >>> trainer = BackpropTrainer(net, dataset, batchlearning=True)
+    >>> error = trainer.train()
+    >>> params = net.params.copy()
+
+    >>> net._setParameters(start.copy())
+    >>> parallel = ParallelBackpropTrainer(net, dataset, processes=3,
+    ...                                    batchlearning=True)
+    >>> abs(parallel.train() - error) < 1e-12
+    True
+    >>> abs(net.params - params).max() < 1e-12
+    True
+
+The workers see the updated parameters, so the next epoch agrees too, even
+if the parameters of the module were replaced in between:
+
+    >>> params = net.params.copy()
+    >>> error = trainer.train()
+    >>> net._setParameters(params)
+    >>> abs(parallel.train() - error) < 1e-12
+    True
+
+Online learning works in steps over as many sequences as there are processes,
+or asynchronously:
+
+    >>> online = ParallelBackpropTrainer(net, dataset, processes=2)
+    >>> online.train() > 0
+    True
+    >>> online.close()
+    >>> hogwild = ParallelBackpropTrainer(net, dataset, processes=2,
+    ...                                   asynchronous=True)
+    >>> hogwild.train() > 0
+    True
+    >>> hogwild.close()
+
+The other trainers have moved the module to their own shared parameters
+meanwhile, which the first one notices:
+
+    >>> net._setParameters(start.copy())
+    >>> error = BackpropTrainer(net, dataset, batchlearning=True).train()
+    >>> net._setParameters(start.copy())
+    >>> abs(parallel.train() - error) < 1e-12
+    True
+    >>> parallel.close()
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
@@ -0,0 +1,65 @@
+"""
+The non-dominated fronts of a whole population are computed at once, where
+smaller keys are better:
+
+    >>> from pybrain.tools.nondominated import non_dominated_ranks, \\
+    ...     non_dominated_sort, crowding_distances, const_non_dominated_ranks
+    >>> keys = [(1, 4), (2, 2), (4, 1), (2, 4), (3, 3), (1, 4), (5, 5)]
+    >>> list(non_dominated_ranks(keys))
+    [0, 0, 0, 0, 1, 0, 2]
+
+Without allowequality, a key that is only equal in one dimension is enough:
+
+    >>> list(non_dominated_ranks(keys, allowequality=False))
+    [0, 0, 0, 1, 1, 0, 2]
+
+More than two dimensions are handled as well:
+
+    >>> list(non_dominated_ranks([k + (0,) for k in keys], allowequality=False))
+    [0, 0, 0, 1, 1, 0, 2]
+    >>> [sorted(front) for front in non_dominated_sort(keys)]
+    [[(1, 4), (2, 2), (2, 4), (4, 1)], [(3, 3)], [(5, 5)]]
+
+The same as the quadratic versions, on random populations:
+
+    >>> import random
+    >>> from pybrain.tools.nondominated import _non_dominated_front_arr
+    >>> def quadratic(items, allowequality):
+    ...     items, fronts = set(items), []
+    ...     while items:
+    ...         fronts.append(_non_dominated_front_arr(items, allowequality=allowequality))
+    ...         items -= fronts[-1]
+    ...     return fronts
+    >>> random.seed(3)
+    >>> populations = [[tuple(random.randint(0, 4) for _ in range(dim))
+    ...                 for _ in range(30)] for dim in (2, 3, 4) * 10]
+    >>> all(non_dominated_sort(p, allowequality=a) == quadratic(p, a)
+    ...     for p in populations for a in (True, False))
+    True
+
+The boundary points of each dimension have the biggest crowding distance:
+
+    >>> crowding_distances([(0, 3), (1, 2), (2, 1), (3, 0), (1.5, 1.5)])[[0, 1, 3, 4]]
+    array([1.00000000e+100, 1.00000000e+000, 1.00000000e+100, 6.66666667e-001])
+
+With constraints, the feasible individuals come first, then the others by
+their violation:
+
+    >>> list(const_non_dominated_ranks([(1, 1), (2, 2), (0, 0), (0, 0)],
+    ...                                [True, True, False, False], [0, 0, -2, 1]))
+    [0, 1, 3, 2]
+
+NSGA-II selection keeps the best fronts, and the most spread out individuals
+of the last one:
+
+    >>> from pybrain.optimization.populationbased.multiobjective.nsga2 import nsga2select
+    >>> population = [(0, 3), (1, 2), (1.5, 1.5), (2, 1), (3, 0), (3, 3)]
+    >>> sorted(nsga2select(population, dict((p, p) for p in population), 4))
+    [(0, 3), (1, 2), (2, 1), (3, 0)]
+
+"""
+
+from pybrain.tests import runModuleTestSuite
+
+if __name__ == "__main__":
+    runModuleTestSuite(__import__('__main__'))
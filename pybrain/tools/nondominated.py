@@ -2,26 +2,131 @@ __author__ = 'Justin Bayer, Tom Schaul, {justin,tom}@idsia.ch'
 
 
 import collections
-from scipy import array, tile, sum
+from bisect import bisect_left, bisect_right
+from scipy import array, tile, sum, zeros, empty, lexsort, argsort, unique, \
+    flatnonzero, asarray
+
+
+# An item dominates another one if its key is smaller in all dimensions (or,
+# with allowequality=False, smaller or equal, as long as the keys differ). 
+# The vectorized functions work on matrices with one row of keys per item.
+
+
+def non_dominated_ranks(keys, allowequality=True):
+    """ Return the number of the non-dominated front of each row of keys (the
+    first front is 0). Items with equal keys are in the same front. """
+    keys = asarray(keys, dtype=float)
+    if len(keys) == 0:
+        return zeros(0, dtype=int)
+    if keys.shape[1] == 2:
+        return _non_dominated_ranks_2d(keys, allowequality)
+    return _non_dominated_ranks_matrix(keys, allowequality)
+
+
+def _non_dominated_ranks_2d(keys, allowequality):
+    """ O(N log N) sweep for two dimensions: in the order of the first key, an
+    item belongs behind all fronts that contain an item with a smaller second key,
+    and the smallest second keys of the fronts are increasing. """
+    n = len(keys)
+    order = lexsort((keys[:, 1], keys[:, 0]))
+    first, second = keys[order, 0], keys[order, 1]
+    ranks = empty(n, dtype=int)
+    minima = []
+    bisect = bisect_left if allowequality else bisect_right
+    start = 0
+    while start < n:
+        # items that cannot dominate each other are ranked together
+        stop = start + 1
+        while stop < n and first[stop] == first[start] and (allowequality or second[stop] == second[start]):
+            stop += 1
+        for i in range(start, stop):
+            ranks[order[i]] = bisect(minima, second[i])
+        for i in range(start, stop):
+            r = ranks[order[i]]
+            if r == len(minima):
+                minima.append(second[i])
+            elif second[i] < minima[r]:
+                minima[r] = second[i]
+        start = stop
+    return ranks
+
+
+def _dominations(keys, allowequality, blocksize=256):
+    """ Boolean matrix, telling for each pair of items whether the first 
+    dominates the second. It is built by blocks of rows, to bound the memory 
+    needed for the comparisons. """
+    n, dim = keys.shape
+    dominates = empty((n, n), dtype=bool)
+    for start in range(0, n, blocksize):
+        block = keys[start:start + blocksize]
+        smaller = block[:, :1] < keys[:, 0]
+        if allowequality:
+            for k in range(1, dim):
+                smaller &= block[:, k:k + 1] < keys[:, k]
+            dominates[start:start + blocksize] = smaller
+        else:
+            smallerequal = block[:, :1] <= keys[:, 0]
+            for k in range(1, dim):
+                smallerequal &= block[:, k:k + 1] <= keys[:, k]
+                smaller |= block[:, k:k + 1] < keys[:, k]
+            dominates[start:start + blocksize] = smallerequal & smaller
+    return dominates
+
+
+def _non_dominated_ranks_matrix(keys, allowequality):
+    """ Peel off the fronts, counting the dominating items that are left. """
+    dominates = _dominations(keys, allowequality)
+    counts = dominates.sum(axis=0)
+    ranks = empty(len(keys), dtype=int)
+    front = flatnonzero(counts == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        counts[front] = -1
+        counts -= dominates[front].sum(axis=0)
+        front = flatnonzero(counts == 0)
+        rank += 1
+    return ranks
+
+
+def const_non_dominated_ranks(keys, feasible, violations, allowequality=True):
+    """ Like non_dominated_ranks, but the feasible items come first, and the 
+    infeasible ones are ranked by their (total) constraint violation only. """
+    feasible = asarray(feasible, dtype=bool)
+    violations = abs(asarray(violations, dtype=float))
+    ranks = empty(len(feasible), dtype=int)
+    ranks[feasible] = non_dominated_ranks(asarray(keys)[feasible], allowequality)
+    offset = ranks[feasible].max() + 1 if feasible.any() else 0
+    levels = unique(violations[~feasible])
+    ranks[~feasible] = offset + levels.searchsorted(violations[~feasible])
+    return ranks
+
+
+def crowding_distances(keys):
+    """ Vectorized crowding distance-measure for multiple objectives, for a
+    matrix with one row of keys per item. """
+    keys = asarray(keys, dtype=float)
+    distances = zeros(len(keys))
+    if len(keys) == 0:
+        return distances
+    for i in range(keys.shape[1]):
+        order = argsort(keys[:, i], kind='mergesort')
+        values = keys[order, i]
+        # Make sure the boundary points are always selected.
+        distances[order[0]] = 1e100
+        distances[order[-1]] = 1e100
+        # normalization between 0 and 1.
+        normalization = values[-1] - values[0]
+        if normalization > 0:
+            distances[order[1:-1]] += (values[2:] - values[:-2]) / normalization
+    return distances
 
 
 def crowding_distance(individuals, fitnesses):
     """ Crowding distance-measure for multiple objectives. """
-    distances = collections.defaultdict(lambda: 0)
     individuals = list(individuals)
-    # Infer the number of objectives by looking at the fitness of the first.
-    n_obj = len(fitnesses[individuals[0]])
-    for i in range(n_obj):
-        individuals.sort(key=lambda x: fitnesses[x][i])
-        # normalization between 0 and 1.
-        normalization = float(fitnesses[individuals[0]][i] - fitnesses[individuals[-1]][i])
-        # Make sure the boundary points are always selected.
-        distances[individuals[0]] = 1e100
-        distances[individuals[-1]] = 1e100
-        tripled = list(zip(individuals, individuals[1:-1], individuals[2:]))
-        for pre, ind, post in tripled:
-            distances[ind] += (fitnesses[pre][i] - fitnesses[post][i]) / normalization
-    return distances
+    distances = crowding_distances([fitnesses[x] for x in individuals])
+    return collections.defaultdict(lambda: 0, zip(individuals, distances))
 
 
 def _non_dominated_front_old(iterable, key=lambda x: x, allowequality=True):
@@ -150,9 +255,9 @@ def _non_dominated_front_merge_arr(iterable, key=lambda x: x, allowequality=True
     items = list(iterable)
     l = len(items)
     if l > 100:
-        part1 = list(_non_dominated_front_merge_arr(items[:l / 2], key, allowequality))
-        part2 = list(_non_dominated_front_merge_arr(items[l / 2:], key, allowequality))
-        if len(part1) >= l / 3 or len(part2) >= l / 3:
+        part1 = list(_non_dominated_front_merge_arr(items[:l // 2], key, allowequality))
+        part2 = list(_non_dominated_front_merge_arr(items[l // 2:], key, allowequality))
+        if len(part1) >= l // 3 or len(part2) >= l // 3:
             return _non_dominated_front_arr(part1 + part2, key, allowequality)
         else:
             return _non_dominated_front_merge_arr(part1 + part2, key, allowequality)
@@ -160,18 +265,28 @@ def _non_dominated_front_merge_arr(iterable, key=lambda x: x, allowequality=True
         return _non_dominated_front_arr(items, key, allowequality)
 
 
-non_dominated_front = _non_dominated_front_merge_arr
+def _fronts(items, ranks):
+    fronts = [set() for _ in range(ranks.max() + 1 if len(ranks) else 0)]
+    for item, rank in zip(items, ranks):
+        fronts[rank].add(item)
+    return fronts
+
+
+def _non_dominated_front_ranks(iterable, key=lambda x: x, allowequality=True):
+    items = list(set(iterable))
+    if not items:
+        return set()
+    ranks = non_dominated_ranks([key(i) for i in items], allowequality)
+    return set(items[i] for i in flatnonzero(ranks == 0))
+
+
+non_dominated_front = _non_dominated_front_ranks
 
 def non_dominated_sort(iterable, key=lambda x: x, allowequality=True):
     """Return a list that is sorted in a non-dominating fashion.
     Keys have to be n-tuple."""
-    items = set(iterable)
-    fronts = []
-    while items:
-        front = non_dominated_front(items, key, allowequality)
-        items -= front
-        fronts.append(front)
-    return fronts
+    items = list(set(iterable))
+    return _fronts(items, non_dominated_ranks([key(i) for i in items], allowequality))
     
 ''' added by JPQ for Constrained Multi-objective Optimization '''
 
@@ -238,39 +353,36 @@ def _const_non_dominated_front_arr(iterable, key=lambda x: x, allowequality=True
 
     return set([items[i] for i in res])
     
-const_non_dominated_front = _const_non_dominated_front_merge_arr
+def _const_ranks(items, key, allowequality):
+    """ The keys are triples: objectives, feasibility and constraint violations. """
+    fits = [key(i) for i in items]
+    return const_non_dominated_ranks([f[0] for f in fits], [f[1] for f in fits],
+                                     [sum(f[2]) for f in fits], allowequality)
+
+
+def _const_non_dominated_front_ranks(iterable, key=lambda x: x, allowequality=True):
+    items = list(set(iterable))
+    if not items:
+        return set()
+    ranks = _const_ranks(items, key, allowequality)
+    return set(items[i] for i in flatnonzero(ranks == 0))
+
+
+const_non_dominated_front = _const_non_dominated_front_ranks
 
 def const_non_dominated_sort(iterable, key=lambda x: x, allowequality=True):
     """Return a list that is sorted in a non-dominating fashion.
     Keys have to be n-tuple."""
-    
-    items = set(iterable)
-    
-    fronts = []
-    while items:
-        front = const_non_dominated_front(items, key, allowequality)
-        items -= front
-        fronts.append(front)
-    return fronts
+    items = list(set(iterable))
+    if not items:
+        return []
+    return _fronts(items, _const_ranks(items, key, allowequality))
 
 def const_crowding_distance(individuals, fitnesses):
     """ Crowding distance-measure for multiple objectives. """
-    distances = collections.defaultdict(lambda: 0)
     individuals = list(individuals)
-    # Infer the number of objectives by looking at the fitness of the first.
-    n_obj = len(fitnesses[individuals[0]][0])
-    
-    for i in range(n_obj):
-        individuals.sort(key=lambda x: fitnesses[x][0][i])
-        # normalization between 0 and 1.
-        normalization = float(fitnesses[individuals[0]][0][i] - fitnesses[individuals[-1]][0][i])
-        # Make sure the boundary points are always selected.
-        distances[individuals[0]] = 1e100
-        distances[individuals[-1]] = 1e100
-        tripled = list(zip(individuals, individuals[1:-1], individuals[2:]))
-        for pre, ind, post in tripled:
-            distances[ind] += (fitnesses[pre][0][i] - fitnesses[post][0][i]) / normalization
-    return distances
+    distances = crowding_distances([fitnesses[x][0] for x in individuals])
+    return collections.defaultdict(lambda: 0, zip(individuals, distances))
 
 def const_number_of_feasible_pop(iterable, key=lambda x: x, allowequality=True):
     """Return a subset of items from iterable which are not dominated by any
@@ -11,6 +11,10 @@ import operator
 
 from itertools import count
 from math import sqrt
+try:
+    from queue import Queue, Full
+except ImportError:
+    from Queue import Queue, Full
 from random import random, choice
 
 from scipy import where, array, exp, zeros, size, mat, median
@@ -273,6 +277,51 @@ def threaded(callback=lambda * args, **kwargs: None, daemonic=False):
     return innerDecorator
 
 
+def prefetch(iterable, size=1):
+    """Iterate over `iterable` in a background thread, which stays up to
+    `size` items ahead of the consumer.
+
+    Exceptions raised by the iterable are raised again in the consumer. If
+    the consumer stops early, the thread ends after its next item."""
+    items = Queue(size)
+    stop = threading.Event()
+    end = object()
+
+    def put(entry):
+        """Put the entry into the queue, unless the consumer stopped; return
+        whether it did."""
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((end, None))
+        except Exception as e:
+            put((end, e))
+
+    t = threading.Thread(target=produce)
+    t.daemon = True
+    t.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is end:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
 def garbagecollect(func):
     """Decorate a function to invoke the garbage collector after each execution.
     """